@@ -202,10 +202,22 @@ class DataField(ContextMixin, DynamicComputedField):
         :param instance: the model instance being accessed for its data
         """
         column = self._context_param("column")
-        intervalframe = getattr(instance, self.frame_key)
-        intervalframe = intervalframe.filter_by_datetime(
-            start=self.start, end_limit=self.end_limit
-        )
+        start, end_limit = self._context_params("start", "end_limit")
+        if (
+            (start or end_limit)
+            and self.frame_key == "meter_intervalframe"
+            and hasattr(instance, "get_meter_intervalframe")
+        ):
+            # Meters read only the requested range from file
+            intervalframe = instance.get_meter_intervalframe(
+                start=self.start if start else None,
+                end_limit=self.end_limit if end_limit else None,
+            )
+        else:
+            intervalframe = getattr(instance, self.frame_key)
+            intervalframe = intervalframe.filter_by_datetime(
+                start=self.start, end_limit=self.end_limit
+            )
 
         # resample the dataframe to the specified period, if one is provided
         if self.period:
@@ -1,11 +1,46 @@
+from collections import namedtuple, OrderedDict
+import json
+import numpy as np
 import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import s3fs
 from tempfile import mkstemp
+from threading import Lock
+import time
 from typing import List
+import uuid
 
 from django.http import FileResponse
 
+from navigader_core.load.dataframe import filter_dataframe_by_datetime
+
+from beo_datastore.libs.disk_cache import FrameDiskCache
+from beo_datastore.settings import (
+    FRAME_DISK_CACHE_DIRECTORY,
+    FRAME_DISK_CACHE_SIZE,
+    FRAME_VERSION_TTL,
+    PARQUET_CACHE_SIZE,
+)
+
+ParquetCacheInfo = namedtuple(
+    "ParquetCacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+_parquet_cache = OrderedDict()
+_parquet_cache_lock = Lock()
+_parquet_cache_stats = {"hits": 0, "misses": 0, "currsize": 0}
+# {path: (time of lookup, version)} of remote files, oldest lookup first
+_file_version_cache = OrderedDict()
+
+if FRAME_DISK_CACHE_DIRECTORY:
+    FRAME_DISK_CACHE = FrameDiskCache(
+        directory=FRAME_DISK_CACHE_DIRECTORY, max_size=FRAME_DISK_CACHE_SIZE
+    )
+else:
+    FRAME_DISK_CACHE = None
+
 
 def convert_columns_type(dataframe, type_):
     """
@@ -29,14 +64,481 @@ def read_csv(path: str, **kwargs):
     return read_file_with_cache_invalidation(path, pd.read_csv, **kwargs)
 
 
-def read_parquet(path: str, **kwargs):
+def read_parquet(path: str, start=None, end_limit=None, **kwargs):
     """
     Uses pandas to read a parquet file.
 
+    When start or end_limit is provided, only readings beginning on and
+    including start and ending on but excluding end_limit are returned. Row
+    groups whose index statistics fall outside of the range are not read, so
+    windows of files written by write_parquet() with a row_group_size are
+    read without decoding the whole file.
+
+    Decoded DataFrames are kept in a process-level LRU cache of up to
+    PARQUET_CACHE_SIZE bytes keyed by path and file version, so a file is
+    only read again once it has been rewritten. Versions of files stored on
+    S3 are reused for FRAME_VERSION_TTL seconds, so a file rewritten by
+    another process may be served from cache for that long. DataFrames are
+    returned as read-only views of the cached DataFrame; copy() before
+    writing values in place. Files stored on S3 are read through
+    FRAME_DISK_CACHE when FRAME_DISK_CACHE_DIRECTORY is set.
+
     :param path: path to the parquet file to read
+    :param start: datetime object
+    :param end_limit: datetime object
     :return: DataFrame
     """
-    return read_file_with_cache_invalidation(path, pd.read_parquet, **kwargs)
+    if start is None and end_limit is None:
+        return read_file_with_frame_cache(path, pd.read_parquet, **kwargs)
+
+    kwargs.update(start=start, end_limit=end_limit)
+    return read_file_with_frame_cache(path, _read_parquet_row_groups, **kwargs)
+
+
+def _read_parquet_row_groups(
+    path: str, start=None, end_limit=None, columns: List[str] = None
+):
+    start = pd.Timestamp.min if start is None else pd.to_datetime(start)
+    end_limit = (
+        pd.Timestamp.max if end_limit is None else pd.to_datetime(end_limit)
+    )
+
+    if path.startswith("s3://"):
+        source = s3fs.S3FileSystem(anon=False).open(path, "rb")
+    else:
+        source = open(path, "rb")
+
+    with source:
+        parquet_file = pq.ParquetFile(source)
+        row_groups = get_row_groups_in_range(parquet_file, start, end_limit)
+        if row_groups is None:
+            # no DatetimeIndex statistics
+            table = parquet_file.read(
+                columns=columns, use_pandas_metadata=True
+            )
+        else:
+            # read one row group for an empty DataFrame with all columns
+            table = pa.concat_tables(
+                [
+                    parquet_file.read_row_group(
+                        x, columns=columns, use_pandas_metadata=True
+                    )
+                    for x in row_groups or [0]
+                ]
+            )
+
+    dataframe = table.to_pandas()
+    if isinstance(dataframe.index, pd.DatetimeIndex):
+        dataframe = filter_dataframe_by_datetime(dataframe, start, end_limit)
+    return dataframe
+
+
+def get_row_groups_in_range(parquet_file, start, end_limit):
+    """
+    Return indices of the row groups of a parquet file written from a
+    DataFrame with a DatetimeIndex which may contain readings beginning on
+    and including start and ending on but excluding end_limit. None is
+    returned if the file has no index statistics to filter row groups by.
+
+    :param parquet_file: pyarrow.parquet.ParquetFile
+    :param start: pandas Timestamp
+    :param end_limit: pandas Timestamp
+    :return: list of row group indices
+    """
+    metadata = parquet_file.metadata
+    if metadata.num_row_groups == 0 or b"pandas" not in (
+        metadata.metadata or {}
+    ):
+        return None
+
+    index_columns = json.loads(metadata.metadata[b"pandas"])["index_columns"]
+    if len(index_columns) != 1 or not isinstance(index_columns[0], str):
+        return None
+
+    index_column = index_columns[0]
+    schema = parquet_file.schema.to_arrow_schema()
+    field_index = schema.get_field_index(index_column)
+    if field_index < 0:
+        return None
+    field = schema[field_index]
+    if not pa.types.is_timestamp(field.type):
+        return None
+
+    column = [
+        metadata.schema.column(i).name for i in range(metadata.num_columns)
+    ].index(index_column)
+
+    row_groups = []
+    for i in range(metadata.num_row_groups):
+        statistics = metadata.row_group(i).column(column).statistics
+        if statistics is None or not statistics.has_min_max:
+            row_groups.append(i)
+            continue
+
+        # older pyarrow versions return the stored integers
+        minimum, maximum = [
+            pd.Timestamp(x, unit=field.type.unit)
+            if isinstance(x, int)
+            else pd.Timestamp(x)
+            for x in [statistics.min, statistics.max]
+        ]
+        if minimum < end_limit and maximum >= start:
+            row_groups.append(i)
+
+    return row_groups
+
+
+def write_parquet(
+    dataframe: pd.DataFrame, path: str, row_group_size: int = None
+):
+    """
+    Writes a parquet file, through FRAME_DISK_CACHE for files stored on S3.
+
+    DataFrames with a DatetimeIndex are written in time order, so that with
+    a row_group_size each row group covers a separate period which
+    read_parquet() can skip.
+
+    :param dataframe: DataFrame
+    :param path: path to the parquet file to write
+    :param row_group_size: maximum number of rows per row group, None to
+        write a single row group
+    """
+    if (
+        isinstance(dataframe.index, pd.DatetimeIndex)
+        and not dataframe.index.is_monotonic_increasing
+    ):
+        dataframe = dataframe.sort_index()
+
+    write_file_with_disk_cache(
+        path, lambda x: dataframe.to_parquet(x, row_group_size=row_group_size)
+    )
+
+
+def read_arrow(
+    path: str, columns: List[str] = None, start=None, end_limit=None
+):
+    """
+    Reads an Arrow IPC (Feather V2) file written by write_arrow(). Local
+    files are memory-mapped, so no decompression or decoding takes place
+    and worker processes on the same host share the file's pages through
+    the page cache. Columns are still copied into the returned DataFrame by
+    Table.to_pandas(), which is cached as in read_parquet(). Readings are
+    filtered by start and end_limit after the file is read.
+
+    :param path: path to the Arrow IPC file to read
+    :param columns: columns to read, None to read all columns
+    :param start: datetime object
+    :param end_limit: datetime object
+    :return: DataFrame
+    """
+    return read_file_with_frame_cache(
+        path, _read_arrow, columns=columns, start=start, end_limit=end_limit
+    )
+
+
+def _read_arrow(
+    path: str, columns: List[str] = None, start=None, end_limit=None
+):
+    if path.startswith("s3://"):
+        with s3fs.S3FileSystem(anon=False).open(path, "rb") as f:
+            source = pa.BufferReader(f.read())
+    else:
+        source = pa.memory_map(path)
+
+    dataframe = pa.ipc.open_file(source).read_all().to_pandas()
+    if columns is not None:
+        dataframe = dataframe[columns]
+    if start is not None or end_limit is not None:
+        dataframe = filter_dataframe_by_datetime(
+            dataframe,
+            start=pd.Timestamp.min if start is None else start,
+            end_limit=pd.Timestamp.max if end_limit is None else end_limit,
+        )
+    return dataframe
+
+
+def write_arrow(dataframe: pd.DataFrame, path: str):
+    """
+    Writes an uncompressed Arrow IPC (Feather V2) file which can be
+    memory-mapped by read_arrow(), through FRAME_DISK_CACHE for files stored
+    on S3.
+
+    :param dataframe: DataFrame
+    :param path: path to the Arrow IPC file to write
+    """
+    write_file_with_disk_cache(path, lambda x: _write_arrow(dataframe, x))
+
+
+def _write_arrow(dataframe: pd.DataFrame, path: str):
+    table = pa.Table.from_pandas(dataframe)
+    if path.startswith("s3://"):
+        sink = s3fs.S3FileSystem(anon=False).open(path, "wb")
+    else:
+        sink = open(path, "wb")
+
+    with sink:
+        writer = pa.RecordBatchFileWriter(sink, table.schema)
+        writer.write_table(table)
+        writer.close()
+
+
+def read_file_with_frame_cache(path: str, read_fn, **kwargs):
+    """
+    Reads a file through the process-level DataFrame cache described in
+    read_parquet().
+
+    :param path: path to the file to read
+    :param read_fn: method to read the file
+    :return: DataFrame
+    """
+    if FRAME_DISK_CACHE is not None and FRAME_DISK_CACHE.handles(path):
+        info = get_remote_file_version(path, FRAME_DISK_CACHE.get_info)
+        version = info["ETag"]
+    elif path.startswith("s3://"):
+        info = None
+        version = get_remote_file_version(path, get_file_version)
+    else:
+        info = None
+        version = get_file_version(path)
+    key = (path, version, repr(sorted(kwargs.items())))
+
+    with _parquet_cache_lock:
+        dataframe = _parquet_cache.get(key)
+        if dataframe is not None:
+            _parquet_cache.move_to_end(key)
+            _parquet_cache_stats["hits"] += 1
+            return dataframe.copy(deep=False)
+        _parquet_cache_stats["misses"] += 1
+
+    if info is not None:
+        dataframe = read_file_with_disk_cache(path, info, read_fn, **kwargs)
+    else:
+        dataframe = read_file_with_cache_invalidation(path, read_fn, **kwargs)
+    set_read_only(dataframe)
+    size = dataframe.memory_usage(index=True, deep=True).sum()
+
+    with _parquet_cache_lock:
+        if size <= PARQUET_CACHE_SIZE and key not in _parquet_cache:
+            _parquet_cache[key] = dataframe
+            _parquet_cache_stats["currsize"] += size
+            while _parquet_cache_stats["currsize"] > PARQUET_CACHE_SIZE:
+                _, evicted = _parquet_cache.popitem(last=False)
+                _parquet_cache_stats["currsize"] -= evicted.memory_usage(
+                    index=True, deep=True
+                ).sum()
+
+    return dataframe.copy(deep=False)
+
+
+def read_file_with_disk_cache(path: str, info: dict, read_fn, **kwargs):
+    """
+    Reads a local copy of a file stored on S3 from FRAME_DISK_CACHE.
+
+    :param path: path to the file to read
+    :param info: FRAME_DISK_CACHE.get_info() result
+    :param read_fn: method to read the file
+    :return: DataFrame
+    """
+    try:
+        return read_fn(FRAME_DISK_CACHE.get(path, info), **kwargs)
+    except FileNotFoundError:
+        # evicted by another process before being read
+        return read_file_with_cache_invalidation(path, read_fn, **kwargs)
+
+
+def write_file_with_disk_cache(path: str, write_fn):
+    """
+    Writes a file, keeping a local copy in FRAME_DISK_CACHE if the file is
+    stored on S3. Local files are written to a temporary file which replaces
+    path once complete, so concurrent readers never see a partial file, as
+    with S3 uploads.
+
+    :param path: path to the file to write
+    :param write_fn: method writing the file to a path
+    """
+    forget_file_version(path)
+    if FRAME_DISK_CACHE is not None and FRAME_DISK_CACHE.handles(path):
+        FRAME_DISK_CACHE.save(path, write_fn)
+    elif path.startswith("s3://"):
+        write_fn(path)
+    else:
+        temp_path = os.path.join(
+            os.path.dirname(path),
+            ".tmp_{}{}".format(uuid.uuid4().hex, os.path.splitext(path)[1]),
+        )
+        try:
+            write_fn(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def file_exists(path: str) -> bool:
+    """
+    True if a file exists at path, locally or on S3.
+
+    :param path: path to the file
+    :return: bool
+    """
+    if path.startswith("s3://"):
+        s3 = s3fs.S3FileSystem(anon=False)
+        s3.invalidate_cache(path)
+        return s3.exists(path)
+    else:
+        return os.path.exists(path)
+
+
+def get_file_paths(directory: str, prefix: str, extension: str) -> List[str]:
+    """
+    Return paths of files in directory, locally or on S3, starting with
+    prefix and ending with extension.
+
+    :param directory: path to the directory
+    :param prefix: filename prefix
+    :param extension: filename extension including "."
+    :return: list of file paths
+    """
+    if directory.startswith("s3://"):
+        s3 = s3fs.S3FileSystem(anon=False)
+        s3.invalidate_cache(directory)
+        pattern = os.path.join(directory, "{}*{}".format(prefix, extension))
+        return ["s3://" + x for x in s3.glob(pattern)]
+    elif os.path.isdir(directory):
+        return [
+            os.path.join(directory, x)
+            for x in os.listdir(directory)
+            if x.startswith(prefix) and x.endswith(extension)
+        ]
+    else:
+        return []
+
+
+def delete_file(path: str):
+    """
+    Deletes the file at path, locally or on S3, if it exists.
+
+    :param path: path to the file
+    """
+    forget_file_version(path)
+    if path.startswith("s3://"):
+        s3 = s3fs.S3FileSystem(anon=False)
+        if s3.exists(path):
+            s3.rm(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def get_file_version(path: str):
+    """
+    Return a value which changes whenever the file at path is rewritten: the
+    ETag of S3 objects or the modification time and size of local files.
+
+    :param path: path to the file
+    :return: hashable file version
+    """
+    if path.startswith("s3://"):
+        s3 = s3fs.S3FileSystem(anon=False)
+        s3.invalidate_cache(path)
+        return s3.info(path)["ETag"]
+    else:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_remote_file_version(path: str, version_fn):
+    """
+    Return version_fn(path) for a file stored remotely. Results are reused
+    for FRAME_VERSION_TTL seconds, so repeated reads of a file do not each
+    request its version from S3. Files written or deleted by this process
+    are looked up again on their next read.
+
+    :param path: path to the file
+    :param version_fn: get_file_version() or FRAME_DISK_CACHE.get_info()
+    :return: result of version_fn
+    """
+    now = time.monotonic()
+    with _parquet_cache_lock:
+        # drop expired lookups, oldest first
+        while _file_version_cache:
+            oldest = next(iter(_file_version_cache.values()))
+            if now - oldest[0] < FRAME_VERSION_TTL:
+                break
+            _file_version_cache.popitem(last=False)
+        if path in _file_version_cache:
+            return _file_version_cache[path][1]
+
+    version = read_file_with_cache_invalidation(path, version_fn)
+    with _parquet_cache_lock:
+        _file_version_cache.pop(path, None)
+        _file_version_cache[path] = (now, version)
+    return version
+
+
+def forget_file_version(path: str = None):
+    """
+    Remove the version of a file stored remotely from the cache kept by
+    get_remote_file_version().
+
+    :param path: path to the file, None to remove all files
+    """
+    with _parquet_cache_lock:
+        if path is None:
+            _file_version_cache.clear()
+        else:
+            _file_version_cache.pop(path, None)
+
+
+def set_read_only(dataframe: pd.DataFrame):
+    """
+    Mark the arrays backing a DataFrame as read-only so that cached
+    DataFrames cannot be modified in place.
+
+    :param dataframe: pandas DataFrame
+    """
+    # DataFrame._data was renamed to DataFrame._mgr in pandas 1.1
+    if hasattr(dataframe, "_mgr"):
+        manager = dataframe._mgr
+    else:
+        manager = dataframe._data
+    for block in manager.blocks:
+        if isinstance(block.values, np.ndarray):
+            block.values.flags.writeable = False
+
+
+def parquet_cache_info():
+    """
+    Return hits, misses, maximum size and current size in bytes of the
+    read_parquet() and read_arrow() cache.
+
+    :return: ParquetCacheInfo
+    """
+    with _parquet_cache_lock:
+        return ParquetCacheInfo(
+            hits=_parquet_cache_stats["hits"],
+            misses=_parquet_cache_stats["misses"],
+            maxsize=PARQUET_CACHE_SIZE,
+            currsize=_parquet_cache_stats["currsize"],
+        )
+
+
+def clear_parquet_cache(path: str = None):
+    """
+    Remove DataFrames and file versions from the read_parquet() and
+    read_arrow() cache.
+
+    :param path: path of the file to remove, None to remove all files and
+        reset hit and miss counters
+    """
+    forget_file_version(path)
+    with _parquet_cache_lock:
+        for key in [x for x in _parquet_cache if path in (None, x[0])]:
+            dataframe = _parquet_cache.pop(key)
+            _parquet_cache_stats["currsize"] -= dataframe.memory_usage(
+                index=True, deep=True
+            ).sum()
+        if path is None:
+            _parquet_cache_stats.update(hits=0, misses=0, currsize=0)
 
 
 def read_file_with_cache_invalidation(path: str, read_fn, **kwargs):
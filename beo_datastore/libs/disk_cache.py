@@ -0,0 +1,237 @@
+import attr
+from contextlib import contextmanager
+import hashlib
+import os
+import s3fs
+import shutil
+import tempfile
+
+
+def get_file_md5sum(file_path, chunk_size=65536):
+    """
+    Return md5sum of a local file.
+
+    :param file_path: location of file
+    :return: md5sum
+    """
+    hasher = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for buf in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(buf)
+
+    return hasher.hexdigest()
+
+
+class LocalFileSystem(object):
+    """
+    A local directory with the subset of the s3fs.S3FileSystem interface used
+    by FrameDiskCache. ETags are md5sums of file contents, as with objects
+    uploaded to S3 in a single part. Stands in for S3 in tests.
+    """
+
+    def info(self, path):
+        return {
+            "ETag": '"{}"'.format(get_file_md5sum(path)),
+            "size": os.path.getsize(path),
+        }
+
+    def get(self, rpath, lpath):
+        shutil.copyfile(rpath, lpath)
+
+    def put(self, lpath, rpath):
+        os.makedirs(os.path.dirname(rpath), exist_ok=True)
+        shutil.copyfile(lpath, rpath)
+
+    def invalidate_cache(self, path=None):
+        pass
+
+
+@attr.s(frozen=True)
+class FrameDiskCache(object):
+    """
+    A local disk cache of frame files stored remotely (S3), so that files
+    read repeatedly by a host's workers are only downloaded once per version.
+
+    Files are keyed by remote path and ETag, so a rewritten file is
+    downloaded again on its next read. Downloads are verified against the
+    ETag (or size, for multipart uploads) before entering the cache and are
+    written atomically, so a cache directory can be shared by many
+    processes. Once the cache exceeds max_size bytes, least recently used
+    files are removed.
+    """
+
+    directory = attr.ib(type=str)
+    max_size = attr.ib(type=int)
+    filesystem = attr.ib(factory=lambda: s3fs.S3FileSystem(anon=False))
+    remote_prefix = attr.ib(type=str, default="s3://")
+
+    # prefix of files being downloaded or written
+    temp_prefix = ".tmp_"
+
+    def handles(self, path) -> bool:
+        """
+        True if path is stored remotely.
+        """
+        return path.startswith(self.remote_prefix)
+
+    def get_info(self, path) -> dict:
+        """
+        Return current ETag and size of the remote file at path.
+
+        :param path: remote path
+        :return: dict
+        """
+        self.filesystem.invalidate_cache(path)
+        return self.filesystem.info(path)
+
+    def get_cache_path(self, path, info) -> str:
+        """
+        Return location of the cached copy of a version of the remote file at
+        path. Copies of all versions of a file share a prefix.
+
+        :param path: remote path
+        :param info: result of get_info()
+        :return: file path
+        """
+        key = hashlib.sha256(path.encode()).hexdigest()
+        version = hashlib.sha256(info["ETag"].encode()).hexdigest()[:16]
+        return os.path.join(
+            self.directory,
+            key[:2],
+            "{}_{}{}".format(key, version, os.path.splitext(path)[1]),
+        )
+
+    @staticmethod
+    def verify(file_path, info) -> bool:
+        """
+        True if the local file at file_path matches the remote file described
+        by info. ETags of objects uploaded in multiple parts are not md5sums
+        of their contents, so only sizes are compared for those.
+
+        :param file_path: local path
+        :param info: result of get_info()
+        :return: bool
+        """
+        if os.path.getsize(file_path) != info["size"]:
+            return False
+
+        etag = info["ETag"].strip('"')
+        if "-" in etag:
+            return True
+        return get_file_md5sum(file_path) == etag
+
+    def get(self, path, info=None) -> str:
+        """
+        Return location of a local copy of the remote file at path,
+        downloading it on a cache miss. The remote path is returned if the
+        download fails verification.
+
+        :param path: remote path
+        :param info: result of get_info(), looked up if not provided
+        :return: file path
+        """
+        if info is None:
+            info = self.get_info(path)
+
+        cache_path = self.get_cache_path(path, info)
+        try:
+            # mark as recently used
+            os.utime(cache_path)
+            return cache_path
+        except FileNotFoundError:
+            pass
+
+        with self.temporary_file(cache_path) as temp_path:
+            self.filesystem.get(path, temp_path)
+            if not self.verify(temp_path, info):
+                return path
+            self.add(temp_path, cache_path)
+
+        return cache_path
+
+    def save(self, path, write_fn) -> None:
+        """
+        Write a file to the remote path through the cache, so the written
+        file does not need to be downloaded on its next read.
+
+        :param path: remote path
+        :param write_fn: function writing the file to a local path passed as
+            its only argument
+        """
+        with self.temporary_file(path) as temp_path:
+            write_fn(temp_path)
+            self.filesystem.put(temp_path, path)
+            info = self.get_info(path)
+            if self.verify(temp_path, info):
+                self.add(temp_path, self.get_cache_path(path, info))
+
+    def add(self, temp_path, cache_path) -> None:
+        """
+        Move a verified file into the cache, replacing other versions of the
+        same remote file, and evict least recently used files.
+
+        :param temp_path: local path of verified file
+        :param cache_path: result of get_cache_path()
+        """
+        if os.path.getsize(temp_path) > self.max_size:
+            return
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        prefix = os.path.basename(cache_path).split("_")[0]
+        for entry in os.scandir(os.path.dirname(cache_path)):
+            if entry.name.startswith(prefix + "_"):
+                self.remove(entry.path)
+        os.replace(temp_path, cache_path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least recently used files until the cache is within max_size.
+        """
+        entries = []
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.startswith(self.temp_prefix):
+                    continue
+                file_path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, file_path))
+
+        size = sum(x[1] for x in entries)
+        for _, file_size, file_path in sorted(entries):
+            if size <= self.max_size:
+                break
+            self.remove(file_path)
+            size -= file_size
+
+    @staticmethod
+    def remove(file_path) -> None:
+        """
+        Remove a cached file. Open copies remain readable and files removed
+        by another process are ignored.
+        """
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def temporary_file(self, path):
+        """
+        Yield a temporary location in the cache directory with the extension
+        of path, which is removed on exit unless moved into the cache.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            suffix=os.path.splitext(path)[1],
+            prefix=self.temp_prefix,
+            dir=self.directory,
+        )
+        os.close(fd)
+        try:
+            yield temp_path
+        finally:
+            self.remove(temp_path)
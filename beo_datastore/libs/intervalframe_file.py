@@ -10,8 +10,17 @@ from navigader_core.load.intervalframe import (
 )
 from navigader_core.cost.procurement import ProcurementRateIntervalFrame
 
-from beo_datastore.libs.dataframe import convert_columns_type, read_parquet
+from beo_datastore.libs.dataframe import (
+    convert_columns_type,
+    delete_file,
+    file_exists,
+    read_arrow,
+    read_parquet,
+    write_arrow,
+    write_parquet,
+)
 from beo_datastore.libs.utils import mkdir_p
+from beo_datastore.settings import FRAME_ROW_GROUP_SIZE
 
 
 class DataFrameFile(ValidationDataFrame):
@@ -21,8 +30,21 @@ class DataFrameFile(ValidationDataFrame):
 
     The following attributes must be set in a child class:
     -   file_directory
+
+    Files are stored as parquet unless a child class sets file_format to
+    "arrow", which stores uncompressed Arrow IPC files that are
+    memory-mapped on read. Existing files are converted to a child class's
+    file_format with scripts/convert_frame_files.py.
+
+    Parquet files are written in time order in row groups of up to
+    row_group_size rows, so that reads of a date range only decode the row
+    groups in range, see get_frame_from_file().
     """
 
+    # "parquet" or "arrow"
+    file_format = "parquet"
+    row_group_size = FRAME_ROW_GROUP_SIZE
+
     def __init__(self, dataframe, reference_object=None, *args, **kwargs):
         """
         :param reference_object: reference object DataFrame belongs to
@@ -37,14 +59,23 @@ class DataFrameFile(ValidationDataFrame):
         """
         mkdir_p(self.file_directory)
         if self.reference_object.id is not None:
-            self.dataframe.to_parquet(self.file_path)
+            self.write_frame_file(self.dataframe, self.file_path)
 
     def delete(self):
         """
         Deletes dataframe from disk.
         """
-        if os.path.exists(self.file_path):
-            os.remove(self.file_path)
+        delete_file(self.file_path)
+
+    @classmethod
+    def exists(cls, reference_object) -> bool:
+        """
+        True if a file is stored for reference_object.
+
+        :param reference_object: reference object DataFrame belongs to
+        :return: bool
+        """
+        return file_exists(cls.get_file_path(reference_object))
 
     @property
     def file_directory(self):
@@ -71,39 +102,105 @@ class DataFrameFile(ValidationDataFrame):
         return self.get_file_path(self.reference_object)
 
     @classmethod
-    def get_filename(cls, reference_object):
+    def get_filename(cls, reference_object, file_format=None):
         """
         Generate filename of parquet file in format
-        <class name>_<reference_object.id>.parquet.
+        <class name>_<reference_object.id>.<file_format>. Reference objects
+        whose frames are shared by many objects can set a frame_key attribute
+        to use in place of id.
         """
-        return "{}_{}.parquet".format(cls.__name__, reference_object.id)
+        key = getattr(reference_object, "frame_key", reference_object.id)
+        return "{}_{}.{}".format(
+            cls.__name__, key, file_format or cls.file_format
+        )
 
     @classmethod
-    def get_file_path(cls, reference_object):
+    def get_file_path(cls, reference_object, file_format=None):
         """
         Generate file_path of parquet file.
         """
         return os.path.join(
-            cls.file_directory, cls.get_filename(reference_object)
+            cls.file_directory, cls.get_filename(reference_object, file_format)
         )
 
+    @classmethod
+    def write_frame_file(cls, dataframe, file_path):
+        """
+        Write dataframe to file_path in cls.file_format.
+
+        :param dataframe: pandas DataFrame
+        :param file_path: location of file
+        """
+        if cls.file_format == "arrow":
+            write_arrow(dataframe, file_path)
+        else:
+            write_parquet(
+                dataframe, file_path, row_group_size=cls.row_group_size
+            )
+
+    @classmethod
+    def read_frame_file(cls, file_path, **kwargs):
+        """
+        Read pandas DataFrame from file_path in cls.file_format. Arrow files
+        which have not been converted from parquet yet are read from the
+        original parquet file.
+
+        :param file_path: location of file
+        :param kwargs: columns, start and end_limit, see read_parquet()
+        :return: pandas DataFrame
+        """
+        if cls.file_format != "arrow":
+            return read_parquet(file_path, **kwargs)
+
+        try:
+            return read_arrow(file_path, **kwargs)
+        except OSError:
+            return read_parquet(
+                os.path.splitext(file_path)[0] + ".parquet", **kwargs
+            )
+
     @classmethod
     def get_frame_from_file(
-        cls, reference_object, file_path=None, *args, **kwargs
+        cls,
+        reference_object,
+        file_path=None,
+        start=None,
+        end_limit=None,
+        columns=None,
+        *args,
+        **kwargs
     ):
         """
-        Return DataFrameFile based on reference_object.id if it exists.
+        Return DataFrameFile based on reference_object.id if it exists. When
+        provided, only readings beginning on and including start and ending on
+        but excluding end_limit, and only columns, are read.
+
+        The returned dataframe shares read-only data with the frame cache, so
+        modifying it in place raises a ValueError. Call dataframe.copy()
+        before modifying it.
 
         :param reference_object: reference object PowerIntervalFrameFile belongs to
         :param file_path: location of parquet file
+        :param start: datetime object
+        :param end_limit: datetime object
+        :param columns: list of column names
         :return: cls instance
         """
         if file_path is None:
             file_path = cls.get_file_path(reference_object)
 
+        read_kwargs = {
+            key: value
+            for key, value in [
+                ("start", start),
+                ("end_limit", end_limit),
+                ("columns", columns),
+            ]
+            if value is not None
+        }
         try:
             return cls(
-                dataframe=read_parquet(file_path),
+                dataframe=cls.read_frame_file(file_path, **read_kwargs),
                 reference_object=reference_object,
             )
         except OSError:
@@ -155,7 +252,7 @@ class Frame288File(ValidationFrame288, DataFrameFile):
         mkdir_p(self.file_directory)
         if self.reference_object.id is not None:
             dataframe = convert_columns_type(self.dataframe.copy(), str)
-            dataframe.to_parquet(self.file_path)
+            self.write_frame_file(dataframe, self.file_path)
 
     @classmethod
     def get_frame_from_file(
@@ -173,7 +270,7 @@ class Frame288File(ValidationFrame288, DataFrameFile):
             file_path = cls.get_file_path(reference_object)
 
         try:
-            dataframe = read_parquet(file_path)
+            dataframe = cls.read_frame_file(file_path)
             dataframe = convert_columns_type(dataframe, np.int64)
             return cls(dataframe=dataframe, reference_object=reference_object)
         except OSError:
@@ -196,4 +293,35 @@ class ArbitraryDataFrameFile(ArbitraryDataFrame, DataFrameFile):
         mkdir_p(self.file_directory)
         if self.reference_object.id is not None:
             dataframe = convert_columns_type(self.dataframe.copy(), str)
-            dataframe.to_parquet(self.file_path)
+            self.write_frame_file(dataframe, self.file_path)
+
+
+class MeterMatrixFrameFile(ArbitraryDataFrameFile):
+    """
+    Combines an ArbitraryDataFrame containing the readings of many meters,
+    one column per meter on a shared DatetimeIndex, with file-handling
+    capabilities of a DataFrameFile. Since parquet files are stored by
+    column, single meters can be read without decoding the whole file.
+    """
+
+    @classmethod
+    def get_columns_from_file(cls, reference_object, columns):
+        """
+        Return pandas DataFrame of the stored columns found in columns. An
+        empty DataFrame is returned if no file exists.
+
+        :param reference_object: reference object MeterMatrixFrameFile
+            belongs to
+        :param columns: list of column names
+        :return: pandas DataFrame
+        """
+        file_path = cls.get_file_path(reference_object)
+
+        try:
+            return cls.read_frame_file(file_path, columns=columns)
+        except (KeyError, ValueError):
+            # some columns are not stored
+            dataframe = cls.read_frame_file(file_path)
+            return dataframe[[x for x in columns if x in dataframe.columns]]
+        except OSError:
+            return cls.default_dataframe
@@ -1,13 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from functools import reduce
 
 from django.apps import apps
 from django.db import models, transaction
+from django.db.models import prefetch_related_objects
 from django.utils.functional import cached_property
 from django.utils.timezone import now
+import pandas as pd
 from polymorphic.models import PolymorphicModel
 
+from navigader_core.load.dataframe import filter_dataframe_by_datetime
+
 from beo_datastore.libs.views import dataframe_to_html
+from beo_datastore.settings import FRAME_PREFETCH_WORKERS
 
 
 def get_exact_many_to_many(model, m2m_field, ids):
@@ -297,6 +303,47 @@ class PolymorphicValidationModel(AutoReprMixin, PolymorphicModel):
         return self.polymorphic_ctype.model_class().__name__
 
 
+def prefetch_frames(objects, related=None, max_workers=None):
+    """
+    Read the frame files of many FrameFileMixin objects concurrently and
+    attach them to each object, so that group operations do not read one
+    file at a time on access to each object's frame. Objects with an attached
+    frame are skipped.
+
+    :param objects: QuerySet or list of FrameFileMixin objects, or of objects
+        whose related objects are FrameFileMixin objects
+    :param related: name of a related manager (ex. "channels") whose objects'
+        frames are read, prefetched with prefetch_related_objects()
+    :param max_workers: number of concurrent reads, defaults to
+        FRAME_PREFETCH_WORKERS
+    :return: list of objects
+    """
+    objects = list(objects)
+    if related:
+        prefetch_related_objects(objects, related)
+        frame_objects = [y for x in objects for y in getattr(x, related).all()]
+    else:
+        frame_objects = objects
+
+    frame_objects = [x for x in frame_objects if not x.has_frame]
+    if not frame_objects:
+        return objects
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers or FRAME_PREFETCH_WORKERS
+    ) as executor:
+        frames = executor.map(
+            lambda x: x.frame_file_class.get_frame_from_file(
+                reference_object=x
+            ),
+            frame_objects,
+        )
+        for frame_object, frame in zip(frame_objects, frames):
+            frame_object.frame = frame
+
+    return objects
+
+
 class FrameFileMixin(object):
     """
     A collection of methods for use with a Django model utilizing a dataframe
@@ -316,12 +363,20 @@ class FrameFileMixin(object):
             "frame_file_class must be set in {}.".format(self.__class__)
         )
 
+    @property
+    def has_frame(self):
+        """
+        True if a non-empty frame is attached to self.
+        """
+        return hasattr(self, "_frame") and not self._frame.dataframe.empty
+
     @property
     def frame(self):
         """
-        Retrieves frame from parquet file.
+        Retrieves frame from parquet file. Decoded files are shared across
+        instances through the read_parquet() cache.
         """
-        if not hasattr(self, "_frame") or self._frame.dataframe.empty:
+        if not self.has_frame:
             self._frame = self.frame_file_class.get_frame_from_file(
                 reference_object=self
             )
@@ -334,6 +389,47 @@ class FrameFileMixin(object):
         """
         self._frame = frame
 
+    def release_frame(self):
+        """
+        Drop the attached frame so that its memory can be freed. The frame is
+        read from file again on next access, so unsaved changes are lost.
+        """
+        self.__dict__.pop("_frame", None)
+
+    def get_frame(self, start=None, end_limit=None, columns=None):
+        """
+        Return frame containing only readings beginning on and including start
+        and ending on but excluding end_limit, and only columns. An attached
+        frame is filtered, otherwise only the readings in range are read from
+        file without attaching them to self.
+
+        :param start: datetime object, None for no lower bound
+        :param end_limit: datetime object, None for no upper bound
+        :param columns: list of column names, None for all columns
+        :return: DataFrameFile
+        """
+        if not self.has_frame:
+            return self.frame_file_class.get_frame_from_file(
+                reference_object=self,
+                start=start,
+                end_limit=end_limit,
+                columns=columns,
+            )
+
+        dataframe = self.frame.dataframe
+        if start is not None or end_limit is not None:
+            dataframe = filter_dataframe_by_datetime(
+                dataframe,
+                start=pd.Timestamp.min if start is None else start,
+                end_limit=pd.Timestamp.max if end_limit is None else end_limit,
+            )
+        if columns is not None:
+            dataframe = dataframe[columns]
+
+        return self.frame_file_class(
+            dataframe=dataframe, reference_object=self
+        )
+
     @property
     def filename(self):
         return self.frame_file_class.get_filename(reference_object=self)
@@ -207,9 +207,40 @@ MEDIA_ROOT = MEDIA_URL = os.path.join(
 AWS_MEDIA_BUCKET_NAME = os.environ.get("AWS_MEDIA_BUCKET_NAME", "")
 if AWS_MEDIA_BUCKET_NAME:
     DEFAULT_FILE_STORAGE = "beo_datastore.libs.storages.MediaStorage"
+# set METER_GROUP_MATRIX_STORAGE=1 to store all readings of a MeterGroup in a
+# single file on ingest
+METER_GROUP_MATRIX_STORAGE = int(
+    os.environ.get("METER_GROUP_MATRIX_STORAGE", default=0)
+)
+# local disk cache of frame files stored on S3, set
+# FRAME_DISK_CACHE_DIRECTORY to enable
+FRAME_DISK_CACHE_DIRECTORY = os.environ.get("FRAME_DISK_CACHE_DIRECTORY", "")
+FRAME_DISK_CACHE_SIZE = int(
+    os.environ.get("FRAME_DISK_CACHE_SIZE", default=10 * 1024 * 1024 * 1024)
+)
+# rows per parquet row group of frame files, 31 days of 15-minute readings
+# by default, see DataFrameFile.row_group_size
+FRAME_ROW_GROUP_SIZE = int(
+    os.environ.get("FRAME_ROW_GROUP_SIZE", default=31 * 96)
+)
+# maximum bytes of decoded frame files kept in memory per process, see
+# beo_datastore.libs.dataframe.read_parquet()
+PARQUET_CACHE_SIZE = int(
+    os.environ.get("PARQUET_CACHE_SIZE", default=256 * 1024 * 1024)
+)
+# seconds for which the version of a frame file stored on S3 is reused
+# before being requested again, 0 to request it on every read
+FRAME_VERSION_TTL = float(os.environ.get("FRAME_VERSION_TTL", default=30))
+# number of frame files read concurrently by prefetch_frames()
+FRAME_PREFETCH_WORKERS = int(
+    os.environ.get("FRAME_PREFETCH_WORKERS", default=16)
+)
 
 # Third-party APIs
 PVWATTS_API_KEY = os.environ.get("PVWATTS_API_KEY")
+# local PVWatts response cache, set PVWATTS_REPLAY=1 to never call the API
+PVWATTS_CACHE_DIRECTORY = os.environ.get("PVWATTS_CACHE_DIRECTORY", "")
+PVWATTS_REPLAY = int(os.environ.get("PVWATTS_REPLAY", default=0))
 
 # Override Swagger's 'Django Login' Button to use DRF login page
 LOGIN_URL = "rest_framework:login"
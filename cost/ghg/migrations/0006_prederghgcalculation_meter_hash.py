@@ -0,0 +1,24 @@
+# Generated by Django 2.2.7 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ghg", "0005_prederghgcalculation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prederghgcalculation",
+            name="meter_hash",
+            field=models.CharField(default="", max_length=128),
+        ),
+        migrations.AlterUniqueTogether(
+            name="prederghgcalculation",
+            unique_together={
+                ("meter", "meter_hash", "ghg_rate", "start", "end_limit")
+            },
+        ),
+    ]
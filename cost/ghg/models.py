@@ -1,4 +1,5 @@
 from functools import reduce
+import numpy as np
 import os
 import pandas as pd
 import re
@@ -9,10 +10,15 @@ from navigader_core.cost.controller import AggregateGHGCalculation
 
 from beo_datastore.libs.intervalframe_file import Frame288File
 from beo_datastore.libs.models import Frame288FileMixin, ValidationModel
+from beo_datastore.libs.utils import chunks
 from beo_datastore.settings import MEDIA_ROOT
 
-from cost.mixins import CostCalculationMixin, RateDataMixin
-from reference.reference_model.models import DERSimulation, RateUnit
+from cost.mixins import (
+    CostCalculationMixin,
+    PreDERCostCalculationMixin,
+    RateDataMixin,
+)
+from reference.reference_model.models import DERSimulation, Meter, RateUnit
 
 
 class GHGRateFrame288(Frame288File):
@@ -71,6 +77,37 @@ class GHGRate(Frame288FileMixin, RateDataMixin, ValidationModel):
         return self.frame288.dataframe
 
 
+class PreDERGHGCalculation(PreDERCostCalculationMixin, ValidationModel):
+    """
+    Pre-DER GHG emissions of a Meter, shared by all StoredGHGCalculations of
+    DERSimulations with the same pre_der_source.
+    """
+
+    meter = models.ForeignKey(
+        to=Meter,
+        related_name="pre_der_ghg_calculations",
+        on_delete=models.CASCADE,
+    )
+    ghg_rate = models.ForeignKey(
+        to=GHGRate,
+        related_name="pre_der_ghg_calculations",
+        on_delete=models.CASCADE,
+    )
+
+    # Required by PreDERCostCalculationMixin.
+    rate_field = "ghg_rate"
+
+    class Meta:
+        ordering = ["id"]
+        unique_together = (
+            "meter",
+            "meter_hash",
+            "ghg_rate",
+            "start",
+            "end_limit",
+        )
+
+
 class StoredGHGCalculation(CostCalculationMixin, ValidationModel):
     """
     Container for storing AggregateGHGCalculation.
@@ -106,42 +143,120 @@ class StoredGHGCalculation(CostCalculationMixin, ValidationModel):
             DERSimulation
         :return: StoredGHGCalculation QuerySet
         """
+        return cls.generate_many(
+            der_simulation_set=der_simulation_set,
+            ghg_rates=[ghg_rate],
+            stacked=stacked,
+        )
+
+    @classmethod
+    def generate_many(
+        cls, der_simulation_set, ghg_rates, stacked, batch_size=256
+    ):
+        """
+        Get or create StoredGHGCalculations for many DERSimulations and many
+        GHGRates at once. The post-DER total 288s of batch_size DERSimulations
+        are multiplied against all GHGRates at once, see
+        AggregateGHGCalculation.get_totals(), and all new
+        StoredGHGCalculations are created in a single insert. Pre-DER totals
+        are shared across DERSimulations through PreDERGHGCalculations.
+
+        :param der_simulation_set: QuerySet or set of DERSimulations
+        :param ghg_rates: QuerySet or list of GHGRates
+        :param stacked: True to used StackedDERSimulation, False to use
+            DERSimulation
+        :param batch_size: number of DERSimulations to calculate at once
+        :return: StoredGHGCalculation QuerySet
+        """
+        ghg_rates = list(ghg_rates)
         with transaction.atomic():
             # get existing GHG calculations
-            stored_ghg_calculations = cls.objects.filter(
-                der_simulation__in=der_simulation_set,
-                ghg_rate=ghg_rate,
-                stacked=stacked,
+            already_calculated = set(
+                cls.objects.filter(
+                    der_simulation__in=der_simulation_set,
+                    ghg_rate__in=ghg_rates,
+                    stacked=stacked,
+                ).values_list("der_simulation_id", "ghg_rate_id")
             )
 
             # create new GHG calculations
-            already_calculated = [
-                x.der_simulation for x in stored_ghg_calculations
+            new_der_simulations = [
+                x
+                for x in der_simulation_set
+                if any(
+                    (x.id, ghg_rate.id) not in already_calculated
+                    for ghg_rate in ghg_rates
+                )
             ]
+            ghg_frame288s = [x.frame288 for x in ghg_rates]
             objects = []
-            for der_simulation in der_simulation_set:
-                if der_simulation in already_calculated:
-                    continue
-                ghg_calculation = ghg_rate.calculate_cost(
-                    der_simulation=der_simulation, stacked=stacked
-                )
-                objects.append(
-                    cls(
-                        pre_DER_total=ghg_calculation.pre_DER_total,
-                        post_DER_total=ghg_calculation.post_DER_total,
-                        der_simulation=der_simulation,
-                        ghg_rate=ghg_rate,
-                        stacked=stacked,
-                    )
+            for batch in chunks(new_der_simulations, batch_size):
+                if stacked:
+                    simulations = [x.stacked_der_simulation for x in batch]
+                else:
+                    simulations = batch
+                post_DER_totals = AggregateGHGCalculation.get_totals(
+                    intervalframes=[
+                        x.post_der_intervalframe for x in simulations
+                    ],
+                    ghg_frame288s=ghg_frame288s,
                 )
+                pre_DER_totals = np.array(
+                    [
+                        cls.get_pre_DER_totals(simulations, ghg_rate)
+                        for ghg_rate in ghg_rates
+                    ]
+                ).T
+                for i, der_simulation in enumerate(batch):
+                    for j, ghg_rate in enumerate(ghg_rates):
+                        key = (der_simulation.id, ghg_rate.id)
+                        if key in already_calculated:
+                            continue
+                        objects.append(
+                            cls(
+                                pre_DER_total=pre_DER_totals[i, j],
+                                post_DER_total=post_DER_totals[i, j],
+                                der_simulation=der_simulation,
+                                ghg_rate=ghg_rate,
+                                stacked=stacked,
+                            )
+                        )
             cls.objects.bulk_create(objects)
 
             return cls.objects.filter(
                 der_simulation__in=der_simulation_set,
-                ghg_rate=ghg_rate,
+                ghg_rate__in=ghg_rates,
                 stacked=stacked,
             )
 
+    @staticmethod
+    def get_pre_DER_totals(simulations, ghg_rate):
+        """
+        Return pre-DER totals of many simulations. Only totals not already
+        stored as PreDERGHGCalculations are calculated.
+
+        :param simulations: list of DERSimulations or StackedDERSimulations
+        :param ghg_rate: GHGRate
+        :return: list of pre-DER totals
+        """
+        pre_der_simulations = {x.pre_der_source: x for x in simulations}
+
+        def calculate(pre_der_sources):
+            totals = AggregateGHGCalculation.get_totals(
+                intervalframes=[
+                    pre_der_simulations[x].pre_der_intervalframe
+                    for x in pre_der_sources
+                ],
+                ghg_frame288s=[ghg_rate.frame288],
+            )
+            return totals[:, 0]
+
+        return PreDERGHGCalculation.get_or_calculate(
+            rate=ghg_rate,
+            pre_der_sources=[x.pre_der_source for x in simulations],
+            calculate=calculate,
+        )
+
     @staticmethod
     def get_report(ghg_calculations):
         """
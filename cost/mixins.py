@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from django.db import models
 
 from reference.reference_model.models import DERSimulation
@@ -74,3 +76,88 @@ class CostCalculationMixin(models.Model):
             return self.der_simulation.stacked_der_simulation
         else:
             return self.der_simulation
+
+
+class PreDERCostCalculationMixin(models.Model):
+    """
+    Mixin for storing pre-DER cost totals. A pre-DER total depends only on a
+    Meter's readings over a date range and a rate, so it is calculated once
+    and shared by every DERSimulation and Scenario run on the same Meter.
+    Totals are stored along with the Meter's frame_hash, so that totals of
+    readings which have since been replaced, ex. by a re-ingest, are not
+    reused.
+
+    Inheriting models define a ForeignKey named "meter" and a ForeignKey to
+    their rate model named by rate_field.
+    """
+
+    meter_hash = models.CharField(max_length=128, default="")
+    start = models.DateTimeField()
+    end_limit = models.DateTimeField()
+    pre_DER_total = models.FloatField()
+
+    # name of ForeignKey to rate model
+    rate_field = None
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def get_or_calculate(cls, rate, pre_der_sources, calculate):
+        """
+        Return the pre-DER totals of many (Meter, start, end_limit) sources,
+        see DERSimulation.pre_der_source. Totals which are not yet stored for
+        the Meter's current frame_hash are calculated all at once and stored.
+
+        :param rate: rate model instance
+        :param pre_der_sources: list of (Meter, start, end_limit) tuples
+        :param calculate: function taking a list of unstored
+            (Meter, start, end_limit) tuples and returning their pre-DER
+            totals in the same order
+        :return: list of pre-DER totals in order of pre_der_sources
+        """
+        meter_hashes = {
+            meter: meter.frame_hash
+            for meter in {x[0] for x in pre_der_sources}
+        }
+
+        def get_key(pre_der_source):
+            meter, start, end_limit = pre_der_source
+            return (meter.id, meter_hashes[meter], start, end_limit)
+
+        stored = cls.objects.filter(
+            meter__in=meter_hashes.keys(),
+            meter_hash__in=set(meter_hashes.values()),
+            start__in={x[1] for x in pre_der_sources},
+            end_limit__in={x[2] for x in pre_der_sources},
+            **{cls.rate_field: rate}
+        ).values_list(
+            "meter_id", "meter_hash", "start", "end_limit", "pre_DER_total"
+        )
+        totals = {x[:4]: x[4] for x in stored}
+
+        missing = [
+            x
+            for x in OrderedDict.fromkeys(pre_der_sources)
+            if get_key(x) not in totals
+        ]
+        if missing:
+            objects = []
+            for (meter, start, end_limit), pre_DER_total in zip(
+                missing, calculate(missing)
+            ):
+                totals[get_key((meter, start, end_limit))] = pre_DER_total
+                objects.append(
+                    cls(
+                        meter=meter,
+                        meter_hash=meter_hashes[meter],
+                        start=start,
+                        end_limit=end_limit,
+                        pre_DER_total=pre_DER_total,
+                        **{cls.rate_field: rate}
+                    )
+                )
+            # other workers may store the same totals concurrently
+            cls.objects.bulk_create(objects, ignore_conflicts=True)
+
+        return [totals[get_key(x)] for x in pre_der_sources]
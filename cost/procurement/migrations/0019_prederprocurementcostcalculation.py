@@ -0,0 +1,54 @@
+# Generated by Django 2.2.7 on 2026-10-18 21:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reference_model", "0013_dersimulation_fingerprint"),
+        ("procurement", "0018_auto_20201221_0314"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PreDERProcurementCostCalculation",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("end_limit", models.DateTimeField()),
+                ("pre_DER_total", models.FloatField()),
+                (
+                    "caiso_rate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pre_der_procurement_calculations",
+                        to="procurement.CAISORate",
+                    ),
+                ),
+                (
+                    "meter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pre_der_procurement_calculations",
+                        to="reference_model.Meter",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+                "unique_together": {
+                    ("meter", "caiso_rate", "start", "end_limit")
+                },
+            },
+        ),
+    ]
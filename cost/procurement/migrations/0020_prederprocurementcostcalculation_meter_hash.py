@@ -0,0 +1,24 @@
+# Generated by Django 2.2.7 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("procurement", "0019_prederprocurementcostcalculation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prederprocurementcostcalculation",
+            name="meter_hash",
+            field=models.CharField(default="", max_length=128),
+        ),
+        migrations.AlterUniqueTogether(
+            name="prederprocurementcostcalculation",
+            unique_together={
+                ("meter", "meter_hash", "caiso_rate", "start", "end_limit")
+            },
+        ),
+    ]
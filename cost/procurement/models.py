@@ -1,3 +1,4 @@
+from collections import OrderedDict
 import os
 import uuid
 from datetime import datetime, timedelta
@@ -26,17 +27,27 @@ from beo_datastore.libs.plot_intervalframe import (
     plot_frame288,
     plot_intervalframe,
 )
+from beo_datastore.libs.utils import chunks
 from beo_datastore.settings import MEDIA_ROOT
-from cost.mixins import CostCalculationMixin, RateDataMixin
+from cost.mixins import (
+    CostCalculationMixin,
+    PreDERCostCalculationMixin,
+    RateDataMixin,
+)
 from navigader_core.cost.controller import (
     AggregateProcurementCostCalculation,
     AggregateResourceAdequacyCalculation,
+    SystemProfilePeaks,
 )
 from navigader_core.cost.procurement import ProcurementRateIntervalFrame
 from navigader_core.load.dataframe import get_dataframe_period
 from navigader_core.load.intervalframe import ValidationFrame288
 from reference.auth_user.models import LoadServingEntity
-from reference.reference_model.models import DERSimulation
+from reference.reference_model.models import DERSimulation, Meter
+
+# number of SystemProfilePeaks kept in memory per process
+SYSTEM_PROFILE_PEAKS_CACHE_SIZE = 8
+_system_profile_peaks_cache = OrderedDict()
 
 
 class SystemProfile(
@@ -102,6 +113,28 @@ class SystemProfile(
         """
         return self.name.replace(" ", "")
 
+    @property
+    def system_profile_peaks(self):
+        """
+        SystemProfilePeaks of self.intervalframe, computed once per process
+        and version of self.
+        """
+        cache_key = (self.id, self.updated_at)
+        if cache_key in _system_profile_peaks_cache:
+            _system_profile_peaks_cache.move_to_end(cache_key)
+            return _system_profile_peaks_cache[cache_key]
+
+        system_profile_peaks = SystemProfilePeaks(
+            intervalframe=self.intervalframe
+        )
+        _system_profile_peaks_cache[cache_key] = system_profile_peaks
+        while (
+            len(_system_profile_peaks_cache) > SYSTEM_PROFILE_PEAKS_CACHE_SIZE
+        ):
+            _system_profile_peaks_cache.popitem(last=False)
+
+        return system_profile_peaks
+
     @property
     def average_frame288_html_plot(self):
         """
@@ -173,17 +206,22 @@ class StoredResourceAdequacyCalculation(CostCalculationMixin, ValidationModel):
         return self.post_der_total_cost - self.pre_der_total_cost
 
     @classmethod
-    def generate(cls, der_simulation_set, system_profile, stacked):
+    def generate(
+        cls, der_simulation_set, system_profile, stacked, batch_size=32
+    ):
         """
         Get or create many StoredResourceAdequacyCalculations at once.
         Pre-existing StoredResourceAdequacyCalculations are retrieved and
-        non-existing StoredResourceAdequacyCalculations are created.
+        non-existing StoredResourceAdequacyCalculations are created. Post-DER
+        monthly peaks are computed batch_size DERSimulations at a time against
+        the SystemProfile's precomputed SystemProfilePeaks.
 
         :param der_simulation_set: QuerySet or set of
             DERSimulations
         :param system_profile: SystemProfile
         :param stacked: True to used StackedDERSimulation, False to use
             DERSimulation
+        :param batch_size: number of DERSimulations to calculate at once
         :return: StoredResourceAdequacyCalculation QuerySet
         """
         with transaction.atomic():
@@ -198,22 +236,33 @@ class StoredResourceAdequacyCalculation(CostCalculationMixin, ValidationModel):
             already_calculated = [
                 x.der_simulation for x in stored_ra_calculations
             ]
+            new_der_simulations = [
+                x for x in der_simulation_set if x not in already_calculated
+            ]
+            system_peaks = system_profile.system_profile_peaks
+            pre_DER_total = system_peaks.monthly_peaks.sum()
             objects = []
-            for der_simulation in der_simulation_set:
-                if der_simulation in already_calculated:
-                    continue
-                ra_calculation = system_profile.calculate_cost(
-                    der_simulation=der_simulation, stacked=stacked
+            for batch in chunks(new_der_simulations, batch_size):
+                if stacked:
+                    der_intervalframes = [
+                        x.stacked_der_simulation.der_intervalframe
+                        for x in batch
+                    ]
+                else:
+                    der_intervalframes = [x.der_intervalframe for x in batch]
+                monthly_peaks = system_peaks.get_post_DER_monthly_peaks(
+                    der_intervalframes
                 )
-                objects.append(
-                    cls(
-                        pre_DER_total=ra_calculation.pre_DER_total,
-                        post_DER_total=ra_calculation.post_DER_total,
-                        der_simulation=der_simulation,
-                        system_profile=system_profile,
-                        stacked=stacked,
+                for der_simulation, peaks in zip(batch, monthly_peaks):
+                    objects.append(
+                        cls(
+                            pre_DER_total=pre_DER_total,
+                            post_DER_total=peaks.sum(),
+                            der_simulation=der_simulation,
+                            system_profile=system_profile,
+                            stacked=stacked,
+                        )
                     )
-                )
             cls.objects.bulk_create(objects)
 
             return cls.objects.filter(
@@ -559,6 +608,40 @@ class CAISORate(
         return plot_intervalframe(self.intervalframe, to_html=True)
 
 
+class PreDERProcurementCostCalculation(
+    PreDERCostCalculationMixin, ValidationModel
+):
+    """
+    Pre-DER procurement cost of a Meter, shared by all
+    StoredProcurementCostCalculations of DERSimulations with the same
+    pre_der_source.
+    """
+
+    meter = models.ForeignKey(
+        to=Meter,
+        related_name="pre_der_procurement_calculations",
+        on_delete=models.CASCADE,
+    )
+    caiso_rate = models.ForeignKey(
+        to=CAISORate,
+        related_name="pre_der_procurement_calculations",
+        on_delete=models.CASCADE,
+    )
+
+    # Required by PreDERCostCalculationMixin.
+    rate_field = "caiso_rate"
+
+    class Meta:
+        ordering = ["id"]
+        unique_together = (
+            "meter",
+            "meter_hash",
+            "caiso_rate",
+            "start",
+            "end_limit",
+        )
+
+
 class StoredProcurementCostCalculation(CostCalculationMixin, ValidationModel):
     """
     Container for storing AggregateProcurementCostCalculation.
@@ -586,16 +669,22 @@ class StoredProcurementCostCalculation(CostCalculationMixin, ValidationModel):
         return self.caiso_rate.intervalframe
 
     @classmethod
-    def generate(cls, der_simulation_set, caiso_rate, stacked):
+    def generate(cls, der_simulation_set, caiso_rate, stacked, batch_size=32):
         """
         Get or create many StoredProcurementCostCalculations at once.
         Pre-existing StoredProcurementCostCalculations are retrieved and
-        non-existing StoredProcurementCostCalculations are created.
+        non-existing StoredProcurementCostCalculations are created. Post-DER
+        costs are computed batch_size DERSimulations at a time against the
+        CAISORate's rates, see
+        ProcurementRateIntervalFrame.get_procurement_costs(). Pre-DER costs
+        are shared across DERSimulations through
+        PreDERProcurementCostCalculations.
 
         :param der_simulation_set: QuerySet or set of DERSimulations
         :param caiso_rate: CAISORate
         :param stacked: True to used StackedDERSimulation, False to use
             DERSimulation
+        :param batch_size: number of DERSimulations to calculate at once
         :return: StoredProcurementCostCalculation QuerySet
         """
         with transaction.atomic():
@@ -610,22 +699,34 @@ class StoredProcurementCostCalculation(CostCalculationMixin, ValidationModel):
             already_calculated = [
                 x.der_simulation for x in stored_procurement_calculations
             ]
+            new_der_simulations = [
+                x for x in der_simulation_set if x not in already_calculated
+            ]
+            rate_intervalframe = caiso_rate.rate_data
             objects = []
-            for der_simulation in der_simulation_set:
-                if der_simulation in already_calculated:
-                    continue
-                cost_calulation = caiso_rate.calculate_cost(
-                    der_simulation=der_simulation, stacked=stacked
+            for batch in chunks(new_der_simulations, batch_size):
+                if stacked:
+                    simulations = [x.stacked_der_simulation for x in batch]
+                else:
+                    simulations = batch
+                post_DER_totals = rate_intervalframe.get_procurement_costs(
+                    [x.post_der_intervalframe for x in simulations]
                 )
-                objects.append(
-                    cls(
-                        pre_DER_total=cost_calulation.pre_DER_total,
-                        post_DER_total=cost_calulation.post_DER_total,
-                        der_simulation=der_simulation,
-                        caiso_rate=caiso_rate,
-                        stacked=stacked,
-                    )
+                pre_DER_totals = cls.get_pre_DER_totals(
+                    simulations, caiso_rate
                 )
+                for der_simulation, pre_DER_total, post_DER_total in zip(
+                    batch, pre_DER_totals, post_DER_totals
+                ):
+                    objects.append(
+                        cls(
+                            pre_DER_total=pre_DER_total,
+                            post_DER_total=post_DER_total,
+                            der_simulation=der_simulation,
+                            caiso_rate=caiso_rate,
+                            stacked=stacked,
+                        )
+                    )
             cls.objects.bulk_create(objects)
 
             return cls.objects.filter(
@@ -634,6 +735,32 @@ class StoredProcurementCostCalculation(CostCalculationMixin, ValidationModel):
                 stacked=stacked,
             )
 
+    @staticmethod
+    def get_pre_DER_totals(simulations, caiso_rate):
+        """
+        Return pre-DER totals of many simulations. Only totals not already
+        stored as PreDERProcurementCostCalculations are calculated.
+
+        :param simulations: list of DERSimulations or StackedDERSimulations
+        :param caiso_rate: CAISORate
+        :return: list of pre-DER totals
+        """
+        pre_der_simulations = {x.pre_der_source: x for x in simulations}
+
+        def calculate(pre_der_sources):
+            return caiso_rate.rate_data.get_procurement_costs(
+                [
+                    pre_der_simulations[x].pre_der_intervalframe
+                    for x in pre_der_sources
+                ]
+            )
+
+        return PreDERProcurementCostCalculation.get_or_calculate(
+            rate=caiso_rate,
+            pre_der_sources=[x.pre_der_source for x in simulations],
+            calculate=calculate,
+        )
+
     @staticmethod
     def get_report(procurement_calculations):
         """
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.7 on 2026-10-18 21:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reference_model", "0013_dersimulation_fingerprint"),
+        ("study", "0007_auto_20201221_0314"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScenarioMeterProgress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("stages", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "meter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scenario_progress",
+                        to="reference_model.Meter",
+                    ),
+                ),
+                (
+                    "scenario",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="meter_progress",
+                        to="study.Scenario",
+                    ),
+                ),
+            ],
+            options={"unique_together": {("scenario", "meter")}},
+        ),
+    ]
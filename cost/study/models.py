@@ -7,7 +7,8 @@ import pandas as pd
 import re
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.db.models.functions import Coalesce
 from django.utils.functional import cached_property
 
@@ -17,7 +18,11 @@ from navigader_core.load.dataframe import add_interval_dataframe
 from navigader_core.load.intervalframe import PowerIntervalFrame
 
 from beo_datastore.libs.intervalframe_file import PowerIntervalFrameFile
-from beo_datastore.libs.models import IntervalFrameFileMixin, nested_getattr
+from beo_datastore.libs.models import (
+    IntervalFrameFileMixin,
+    nested_getattr,
+    prefetch_frames,
+)
 from beo_datastore.libs.views import dataframe_to_html
 from beo_datastore.settings import MEDIA_ROOT
 
@@ -830,75 +835,141 @@ class Scenario(IntervalFrameFileMixin, MeterGroup):
                 )
             )
 
-    def run_single_meter_simulation_and_cost(self, meter):
+    @property
+    def expected_stages(self):
         """
-        Run a single Meter's DERSimulation and cost calculations.
+        Bitmask of ScenarioMeterProgress stages each meter needs to complete
+        based on the assigned cost functions.
         """
-        der_simulation_set = self.der_simulation_class.generate(
-            der_configuration=self.der_configuration,
-            der_strategy=self.der_strategy,
-            start=self.start,
-            end_limit=self.end_limit,
-            meter_set={meter},
-        )
+        stages = ScenarioMeterProgress.SIMULATION
+        for cost_function, stage in ScenarioMeterProgress.COST_STAGES.items():
+            if getattr(self, cost_function):
+                stages |= stage
+        return stages
 
-        if self.rate_plan:
-            StoredBillCalculation.generate(
-                der_simulation_set=der_simulation_set,
-                rate_plan=self.rate_plan,
-                stacked=self.stacked,
+    @property
+    def incomplete_meters(self):
+        """
+        QuerySet of meters in self.meter_group with at least one expected
+        stage that has not been checkpointed.
+        """
+        expected_stages = self.expected_stages
+        completed_meter_ids = (
+            self.meter_progress.annotate(
+                completed_stages=F("stages").bitand(expected_stages)
             )
+            .filter(completed_stages=expected_stages)
+            .values("meter_id")
+        )
+        return self.meter_group.meters.exclude(id__in=completed_meter_ids)
 
-        if self.ghg_rate:
-            StoredGHGCalculation.generate(
-                der_simulation_set=der_simulation_set,
-                ghg_rate=self.ghg_rate,
-                stacked=self.stacked,
-            )
+    def reset_progress(self, stages):
+        """
+        Clear checkpointed stages for all meters, i.e. when a cost function
+        is reassigned.
 
-        if self.system_profile:
-            StoredResourceAdequacyCalculation.generate(
-                der_simulation_set=der_simulation_set,
-                system_profile=self.system_profile,
-                stacked=self.stacked,
-            )
+        :param stages: bitmask of ScenarioMeterProgress stages
+        """
+        self.meter_progress.update(stages=F("stages").bitand(~stages))
 
-        if self.procurement_rate:
-            StoredProcurementCostCalculation.generate(
-                der_simulation_set=der_simulation_set,
-                caiso_rate=self.procurement_rate,
-                stacked=self.stacked,
+    def run_single_meter_simulation_and_cost(self, meter):
+        """
+        Run a single Meter's DERSimulation and cost calculations. Each stage
+        is checkpointed in ScenarioMeterProgress once completed, so that an
+        interrupted run resumes by skipping completed stages.
+
+        The DERSimulations (and their StackedDERSimulations) are loaded once
+        and shared by all cost calculations, so their pre-DER, DER and
+        post-DER PowerIntervalFrames and the frame288s and resampled frames
+        cached on those frames are computed once. Each stage's cost
+        calculations are persisted in one transaction with its checkpoint.
+        """
+        progress, _ = ScenarioMeterProgress.objects.get_or_create(
+            scenario=self, meter=meter
+        )
+        if progress.is_completed(self.expected_stages):
+            return
+
+        if progress.is_completed(ScenarioMeterProgress.SIMULATION):
+            der_simulation_set = self.der_simulations.filter(meter=meter)
+        else:
+            der_simulation_set = self.der_simulation_class.generate(
+                der_configuration=self.der_configuration,
+                der_strategy=self.der_strategy,
+                start=self.start,
+                end_limit=self.end_limit,
+                meter_set={meter},
             )
+            progress.checkpoint(ScenarioMeterProgress.SIMULATION)
+
+        cost_calculations = [
+            (
+                StoredBillCalculation,
+                {"rate_plan": self.rate_plan},
+                ScenarioMeterProgress.BILL,
+            ),
+            (
+                StoredGHGCalculation,
+                {"ghg_rate": self.ghg_rate},
+                ScenarioMeterProgress.GHG,
+            ),
+            (
+                StoredResourceAdequacyCalculation,
+                {"system_profile": self.system_profile},
+                ScenarioMeterProgress.RESOURCE_ADEQUACY,
+            ),
+            (
+                StoredProcurementCostCalculation,
+                {"caiso_rate": self.procurement_rate},
+                ScenarioMeterProgress.PROCUREMENT,
+            ),
+        ]
+
+        # share DERSimulation instances (and their cached frames) across
+        # cost calculations
+        der_simulations = list(der_simulation_set)
+        for cost_model, cost_function, stage in cost_calculations:
+            if not all(cost_function.values()) or progress.is_completed(
+                stage
+            ):
+                continue
+            with transaction.atomic():
+                cost_model.generate(
+                    der_simulation_set=der_simulations,
+                    stacked=self.stacked,
+                    **cost_function
+                )
+                progress.checkpoint(stage)
 
     def run(self):
         """
         Run related DERSimulations, StoredBillCalculations and
-        StoredGHGCalculations.
+        StoredGHGCalculations. Meters with all stages checkpointed are
+        skipped.
 
         Note: Meters and GHGRates need to be added to object prior
         to optimization.
-
-        :param multiprocess: True to multiprocess
         """
-        for meter in self.meter_group.meters.all():
+        for meter in self.incomplete_meters:
             self.run_single_meter_simulation_and_cost(meter=meter)
 
     def get_aggregate_der_intervalframe(self):
         """
         Return dynamically calculated PowerIntervalFrame representing aggregate
-        readings of DERSimulations within a Scenario.
+        readings of DERSimulations within a Scenario. DERSimulation frames are
+        prefetched unless stacked, where stored stacks are usually read
+        instead.
         """
         if self.stacked:
             frame_attr = "stacked_der_simulation.der_intervalframe"
+            der_simulations = self.der_simulations.all()
         else:
             frame_attr = "der_intervalframe"
+            der_simulations = prefetch_frames(self.der_simulations.all())
 
         return reduce(
             lambda x, y: x + y,
-            (
-                nested_getattr(x, frame_attr)
-                for x in self.der_simulations.all()
-            ),
+            (nested_getattr(x, frame_attr) for x in der_simulations),
             PowerIntervalFrame(),
         )
 
@@ -924,6 +995,10 @@ class Scenario(IntervalFrameFileMixin, MeterGroup):
           "ghg_rate", "procurement_rate" and "system_profile". No key is
           required
         """
+        previous_cost_functions = {
+            field: getattr(self, "{}_id".format(field))
+            for field in ScenarioMeterProgress.COST_STAGES.keys()
+        }
         updated_fields = []
 
         if "rate_plan" in cost_functions:
@@ -973,3 +1048,69 @@ class Scenario(IntervalFrameFileMixin, MeterGroup):
 
         # save the above changes
         self.save_thread_safe(*updated_fields)
+
+        # previously checkpointed cost calculations used other cost functions
+        self.reset_progress(
+            reduce(
+                lambda x, y: x | y,
+                (
+                    ScenarioMeterProgress.COST_STAGES[x]
+                    for x in updated_fields
+                    if getattr(self, "{}_id".format(x))
+                    != previous_cost_functions[x]
+                ),
+                0,
+            )
+        )
+
+
+class ScenarioMeterProgress(models.Model):
+    """
+    Checkpoint of the stages a Meter has completed within a Scenario, stored
+    as a bitmask of the class-level stage flags.
+    """
+
+    SIMULATION = 1
+    BILL = 2
+    GHG = 4
+    RESOURCE_ADEQUACY = 8
+    PROCUREMENT = 16
+
+    # Scenario cost-function field to stage
+    COST_STAGES = {
+        "rate_plan": BILL,
+        "ghg_rate": GHG,
+        "system_profile": RESOURCE_ADEQUACY,
+        "procurement_rate": PROCUREMENT,
+    }
+
+    scenario = models.ForeignKey(
+        to=Scenario, related_name="meter_progress", on_delete=models.CASCADE
+    )
+    meter = models.ForeignKey(
+        to=Meter, related_name="scenario_progress", on_delete=models.CASCADE
+    )
+    stages = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("scenario", "meter")
+
+    def is_completed(self, stages):
+        """
+        True if all stages have been checkpointed.
+
+        :param stages: bitmask of stages
+        """
+        return self.stages & stages == stages
+
+    def checkpoint(self, stage):
+        """
+        Mark stage as completed. The bitmask is updated in the database
+        so that checkpoints from concurrent tasks are not overwritten.
+
+        :param stage: stage flag
+        """
+        ScenarioMeterProgress.objects.filter(id=self.id).update(
+            stages=F("stages").bitor(stage)
+        )
+        self.stages |= stage
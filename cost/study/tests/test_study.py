@@ -1,5 +1,6 @@
 from datetime import datetime
 import numpy as np
+import os
 from pandas.testing import assert_frame_equal
 from unittest import mock
 
@@ -11,6 +12,7 @@ from navigader_core.der.solar import (
     SolarPV as pySolarPV,
     SolarPVStrategy as pySolarPVStrategy,
 )
+from navigader_core.load.intervalframe import PowerIntervalFrame
 from navigader_core.tests.mock_response import mocked_pvwatts_requests_get
 
 from beo_datastore.libs.fixtures import (
@@ -18,20 +20,35 @@ from beo_datastore.libs.fixtures import (
     load_intervalframe_files,
 )
 
-from cost.ghg.models import GHGRate
-from cost.procurement.models import CAISORate, SystemProfile
-from cost.study.models import Scenario
+from cost.ghg.models import (
+    GHGRate,
+    PreDERGHGCalculation,
+    StoredGHGCalculation,
+)
+from cost.procurement.models import (
+    CAISORate,
+    StoredProcurementCostCalculation,
+    StoredResourceAdequacyCalculation,
+    SystemProfile,
+)
+from cost.study.models import Scenario, ScenarioMeterProgress
 from cost.tasks import run_scenario
-from cost.utility_rate.models import RatePlan
+from cost.utility_rate.models import RatePlan, StoredBillCalculation
 from der.simulation.models import (
     BatteryConfiguration,
     SolarPVConfiguration,
     SolarPVStrategy,
+    StoredBatterySimulation,
 )
 from der.simulation.scripts.generate_der_strategy import (
     generate_ra_reduction_battery_strategy,
 )
 from load.customer.models import CustomerPopulation, OriginFile
+from reference.reference_model.models import (
+    StackedDERSimulation,
+    StackedDERSimulationFrame,
+    StackedDERSimulationNetFrame,
+)
 
 
 # SolarPV Configuration
@@ -204,6 +221,132 @@ class TestScenario(TestCase):
         # report columns all exist
         self.assertEqual(set(scenario.report.columns), SCENARIO_REPORT_COLUMNS)
 
+        # all stages are checkpointed and completed meters are not re-run
+        self.assertFalse(scenario.incomplete_meters.exists())
+        for progress in scenario.meter_progress.all():
+            self.assertTrue(progress.is_completed(scenario.expected_stages))
+        with mock.patch.object(
+            StoredBatterySimulation, "generate"
+        ) as mock_generate:
+            run_scenario(scenario.id)
+            mock_generate.assert_not_called()
+
+        # reassigned cost functions are re-run
+        scenario.assign_cost_functions({"ghg_rate": GHGRate.objects.last().id})
+        self.assertEqual(
+            scenario.incomplete_meters.count(),
+            scenario.meter_group.meters.count(),
+        )
+        progress = scenario.meter_progress.first()
+        self.assertFalse(progress.is_completed(ScenarioMeterProgress.GHG))
+        self.assertTrue(progress.is_completed(ScenarioMeterProgress.BILL))
+
+    def test_scenario_resume(self):
+        """
+        Interrupted runs only re-run stages that were not checkpointed.
+        """
+        scenario = self.create_and_run_scenario(
+            meter_group=self.customer_population.customer_clusters.first(),
+            der_configuration=self.battery_configuration,
+            der_strategy=self.battery_strategy,
+            stacked=False,
+        )
+        meter_count = scenario.meter_group.meters.count()
+
+        # meters without progress have not been run
+        progress = scenario.meter_progress.first()
+        meter = progress.meter
+        progress.delete()
+        self.assertEqual(list(scenario.incomplete_meters), [meter])
+
+        # reassigning the same cost function keeps checkpoints
+        scenario.assign_cost_functions({"ghg_rate": scenario.ghg_rate.id})
+        self.assertEqual(scenario.incomplete_meters.count(), 1)
+
+        # interrupt all meters after the bill stage
+        scenario.meter_progress.update(
+            stages=ScenarioMeterProgress.SIMULATION
+            | ScenarioMeterProgress.BILL
+        )
+        with mock.patch.object(
+            StoredBillCalculation, "generate"
+        ) as mock_bill, mock.patch.object(
+            StoredGHGCalculation, "generate"
+        ) as mock_ghg, mock.patch.object(
+            StoredResourceAdequacyCalculation, "generate"
+        ) as mock_ra, mock.patch.object(
+            StoredProcurementCostCalculation, "generate"
+        ) as mock_procurement:
+            run_scenario(scenario.id)
+
+        # the meter without progress runs every stage, others resume
+        self.assertEqual(mock_bill.call_count, 1)
+        for mock_generate in [mock_ghg, mock_ra, mock_procurement]:
+            self.assertEqual(mock_generate.call_count, meter_count)
+        self.assertFalse(scenario.incomplete_meters.exists())
+
+        # stages completed before a failing stage stay checkpointed
+        progress = scenario.meter_progress.first()
+        progress.stages = ScenarioMeterProgress.SIMULATION
+        progress.save()
+        with mock.patch.object(
+            StoredGHGCalculation, "generate", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                scenario.run_single_meter_simulation_and_cost(progress.meter)
+        progress.refresh_from_db()
+        self.assertTrue(progress.is_completed(ScenarioMeterProgress.BILL))
+        self.assertFalse(progress.is_completed(ScenarioMeterProgress.GHG))
+
+    def test_pre_der_totals_after_reingest(self):
+        """
+        Stored pre-DER totals are not reused once a Meter's readings have
+        been ingested again with different values.
+        """
+        scenario = self.create_and_run_scenario(
+            meter_group=self.customer_population.customer_clusters.first(),
+            der_configuration=self.battery_configuration,
+            der_strategy=self.battery_strategy,
+            stacked=False,
+        )
+        der_simulation = scenario.der_simulations.first()
+        (pre_DER_total,) = StoredGHGCalculation.get_pre_DER_totals(
+            [der_simulation], scenario.ghg_rate
+        )
+
+        # re-ingest the meter's import channel with doubled readings
+        meter = der_simulation.meter
+        channel = meter.import_channel
+        intervalframe = PowerIntervalFrame(
+            dataframe=channel.intervalframe.dataframe * 2
+        )
+        channel.intervalframe = intervalframe
+        channel.save()
+        meter.import_hash = hash(intervalframe)
+        meter.save()
+
+        der_simulation = scenario.der_simulations.get(id=der_simulation.id)
+        (reingested_total,) = StoredGHGCalculation.get_pre_DER_totals(
+            [der_simulation], scenario.ghg_rate
+        )
+        self.assertNotAlmostEqual(reingested_total, pre_DER_total)
+        self.assertEqual(
+            PreDERGHGCalculation.objects.filter(
+                meter=meter, ghg_rate=scenario.ghg_rate
+            ).count(),
+            2,
+        )
+
+        # the new total matches a total calculated from scratch
+        PreDERGHGCalculation.objects.filter(meter=meter).delete()
+        der_simulation = scenario.der_simulations.get(id=der_simulation.id)
+        self.assertAlmostEqual(
+            StoredGHGCalculation.get_pre_DER_totals(
+                [der_simulation], scenario.ghg_rate
+            )[0],
+            reingested_total,
+        )
+
     @mock.patch("requests.get", side_effect=mocked_pvwatts_requests_get)
     def test_stacked_scenario(self, mock_get):
         solar_scenario = self.create_and_run_scenario(
@@ -240,6 +383,26 @@ class TestScenario(TestCase):
                 set(scenario.report.columns), SCENARIO_REPORT_COLUMNS
             )
 
+        # pre-DER costs are calculated once per meter and shared by
+        # solar_scenario and stacked_scenario
+        meters = self.meter_group.meters.all()
+        self.assertEqual(
+            PreDERGHGCalculation.objects.filter(meter__in=meters).count(),
+            meters.count(),
+        )
+        self.assertEqual(
+            sorted(
+                solar_scenario.ghg_calculations.values_list(
+                    "pre_DER_total", flat=True
+                )
+            ),
+            sorted(
+                stacked_scenario.ghg_calculations.values_list(
+                    "pre_DER_total", flat=True
+                )
+            ),
+        )
+
         # check stacked_scenario against solar_scenario and battery_scenario
         self.assertEqual(
             stacked_scenario.pre_der_intervalframe,
@@ -300,3 +463,38 @@ class TestScenario(TestCase):
             stacked_scenario.report_summary.index == "RADelta"
         ]["0"].values[0]
         self.assertAlmostEqual(ra_delta, agg_ra_calculation.net_impact, 6)
+
+        # stacked intervalframes are stored once materialized and reused
+        for der_simulation in battery_scenario.der_simulations:
+            stacked_der_simulation = der_simulation.stacked_der_simulation
+            self.assertTrue(
+                os.path.exists(
+                    StackedDERSimulationFrame.get_file_path(
+                        stacked_der_simulation
+                    )
+                )
+            )
+            stored_der_simulation = StackedDERSimulation(
+                der_simulations=stacked_der_simulation.der_simulations
+            )
+            self.assertAlmostEqual(
+                stored_der_simulation.post_der_intervalframe.total,
+                der_simulation.post_der_intervalframe.total,
+            )
+
+        # stored stacks are deleted along with any component DERSimulation
+        der_simulation = battery_scenario.der_simulations.first()
+        stacked_der_simulation = der_simulation.stacked_der_simulation
+        self.assertEqual(len(stacked_der_simulation.der_simulations), 2)
+        file_paths = [
+            frame_file_class.get_file_path(stacked_der_simulation)
+            for frame_file_class in [
+                StackedDERSimulationFrame,
+                StackedDERSimulationNetFrame,
+            ]
+        ]
+        for file_path in file_paths:
+            self.assertTrue(os.path.exists(file_path))
+        der_simulation.delete()
+        for file_path in file_paths:
+            self.assertFalse(os.path.exists(file_path))
@@ -20,7 +20,8 @@ logger = get_task_logger(__name__)
 @app.task(soft_time_limit=1800, max_retries=3)
 def run_scenario(scenario_id):
     """
-    Perform a run() operation on a Scenario.
+    Perform a run() operation on a Scenario. Only meters with stages that have
+    not been checkpointed are dispatched.
     """
     scenario = Scenario.objects.get(id=scenario_id)
 
@@ -28,11 +29,16 @@ def run_scenario(scenario_id):
     scenario.locked_unlocked_at = now()
     scenario.save_thread_safe("locked_unlocked_at")
 
-    for meter in scenario.meter_group.meters.all():
+    meter_ids = list(scenario.incomplete_meters.values_list("id", flat=True))
+    for meter_id in meter_ids:
         run_simulation_and_cost.delay(
-            scenario_id=scenario.id, meter_id=meter.id
+            scenario_id=scenario.id, meter_id=meter_id
         )
 
+    # all meters completed before an interruption
+    if not meter_ids:
+        generate_intervalframe_and_reports.delay(scenario.id)
+
 
 @app.task(soft_time_limit=120, max_retries=3)
 def run_simulation_and_cost(scenario_id, meter_id):
@@ -83,6 +89,8 @@ def rerun_incomplete_scenarios(older_than_minutes: int):
         - scenario.locked_unlocked_at timestamp is older_than_minutes, which
           specifies that the scenario has not completed in older_than_minutes.
 
+    Stages checkpointed in ScenarioMeterProgress are not re-run.
+
     This is meant as a celery periodic task:
         - see: APP_URL/admin/django_celery_beat/periodictask/
 
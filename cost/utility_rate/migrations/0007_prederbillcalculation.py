@@ -0,0 +1,54 @@
+# Generated by Django 2.2.7 on 2026-10-18 21:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reference_model", "0013_dersimulation_fingerprint"),
+        ("utility_rate", "0006_auto_20201217_1540"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PreDERBillCalculation",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("end_limit", models.DateTimeField()),
+                ("pre_DER_total", models.FloatField()),
+                (
+                    "meter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pre_der_bill_calculations",
+                        to="reference_model.Meter",
+                    ),
+                ),
+                (
+                    "rate_plan",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pre_der_bill_calculations",
+                        to="utility_rate.RatePlan",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+                "unique_together": {
+                    ("meter", "rate_plan", "start", "end_limit")
+                },
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.7 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("utility_rate", "0007_prederbillcalculation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="prederbillcalculation",
+            name="meter_hash",
+            field=models.CharField(default="", max_length=128),
+        ),
+        migrations.AlterUniqueTogether(
+            name="prederbillcalculation",
+            unique_together={
+                ("meter", "meter_hash", "rate_plan", "start", "end_limit")
+            },
+        ),
+    ]
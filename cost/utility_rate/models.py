@@ -14,8 +14,12 @@ from navigader_core.cost.controller import AggregateBillCalculation
 from beo_datastore.libs.models import ValidationModel, TimeStampMixin
 from beo_datastore.libs.views import dataframe_to_html
 
-from cost.mixins import CostCalculationMixin, RateDataMixin
-from reference.reference_model.models import DERSimulation
+from cost.mixins import (
+    CostCalculationMixin,
+    PreDERCostCalculationMixin,
+    RateDataMixin,
+)
+from reference.reference_model.models import DERSimulation, Meter
 from reference.auth_user.models import LoadServingEntity
 
 
@@ -262,6 +266,37 @@ class RateCollection(ValidationModel):
         )
 
 
+class PreDERBillCalculation(PreDERCostCalculationMixin, ValidationModel):
+    """
+    Pre-DER bill total of a Meter for a single billing period, shared by all
+    StoredBillCalculations of DERSimulations covering the same readings.
+    """
+
+    meter = models.ForeignKey(
+        to=Meter,
+        related_name="pre_der_bill_calculations",
+        on_delete=models.CASCADE,
+    )
+    rate_plan = models.ForeignKey(
+        to=RatePlan,
+        related_name="pre_der_bill_calculations",
+        on_delete=models.CASCADE,
+    )
+
+    # Required by PreDERCostCalculationMixin.
+    rate_field = "rate_plan"
+
+    class Meta:
+        ordering = ["id"]
+        unique_together = (
+            "meter",
+            "meter_hash",
+            "rate_plan",
+            "start",
+            "end_limit",
+        )
+
+
 class StoredBillCalculation(CostCalculationMixin, ValidationModel):
     """
     Container for storing AggregateBillCalculation.
@@ -342,7 +377,8 @@ class StoredBillCalculation(CostCalculationMixin, ValidationModel):
 
         Billing date ranges are created automatically from the first to last
         day of every month found in a DERSimulation, which are used
-        to created BillComparisons.
+        to created BillComparisons. Pre-DER bills are shared across
+        DERSimulations through PreDERBillCalculations.
 
         :param der_simulation: DERSimulation
         :param rate_plan: RatePlan
@@ -357,8 +393,14 @@ class StoredBillCalculation(CostCalculationMixin, ValidationModel):
             agg_bill_calculation = rate_plan.calculate_cost(
                 der_simulation=der_simulation, stacked=stacked
             )
+            pre_DER_totals = cls.get_pre_DER_totals(
+                der_simulation=der_simulation,
+                rate_plan=rate_plan,
+                stacked=stacked,
+                date_ranges=agg_bill_calculation.date_ranges,
+            )
             bill_collection, new = cls.objects.get_or_create(
-                pre_DER_total=agg_bill_calculation.pre_DER_total,
+                pre_DER_total=sum(pre_DER_totals),
                 post_DER_total=agg_bill_calculation.post_DER_total,
                 der_simulation=der_simulation,
                 rate_plan=rate_plan,
@@ -367,10 +409,9 @@ class StoredBillCalculation(CostCalculationMixin, ValidationModel):
 
             if new:
                 objects = []
-                for start, end_limit in agg_bill_calculation.date_ranges:
-                    pre_der_total = agg_bill_calculation.pre_bills[
-                        der_simulation.id
-                    ][start].total
+                for (start, end_limit), pre_der_total in zip(
+                    agg_bill_calculation.date_ranges, pre_DER_totals
+                ):
                     post_der_total = agg_bill_calculation.post_bills[
                         der_simulation.id
                     ][start].total
@@ -387,6 +428,47 @@ class StoredBillCalculation(CostCalculationMixin, ValidationModel):
 
             return bill_collection, new
 
+    @staticmethod
+    def get_pre_DER_totals(der_simulation, rate_plan, stacked, date_ranges):
+        """
+        Return pre-DER bill totals of a DERSimulation for each billing date
+        range. Only bills not already stored as PreDERBillCalculations are
+        calculated.
+
+        :param der_simulation: DERSimulation
+        :param rate_plan: RatePlan
+        :param stacked: True to used StackedDERSimulation, False to use
+            DERSimulation
+        :param date_ranges: list of (start, end_limit) billing date ranges
+        :return: list of pre-DER bill totals
+        """
+        if stacked:
+            simulation = der_simulation.stacked_der_simulation
+        else:
+            simulation = der_simulation
+
+        # a bill only depends on the readings within its billing date range
+        meter, start, end_limit = simulation.pre_der_source
+        billing_date_ranges = {
+            (meter, max(start, x[0]), min(end_limit, x[1])): x
+            for x in date_ranges
+        }
+
+        def calculate(pre_der_sources):
+            bills = rate_plan.openei_rate_plan.generate_many_bills(
+                intervalframe=simulation.pre_der_intervalframe,
+                date_ranges=[billing_date_ranges[x] for x in pre_der_sources],
+            )
+            return [
+                bills[billing_date_ranges[x][0]].total for x in pre_der_sources
+            ]
+
+        return PreDERBillCalculation.get_or_calculate(
+            rate=rate_plan,
+            pre_der_sources=list(billing_date_ranges.keys()),
+            calculate=calculate,
+        )
+
     @classmethod
     def generate(cls, der_simulation_set, rate_plan, stacked):
         """
@@ -1,6 +1,6 @@
 import os
 from datetime import timedelta
-from typing import Set, Tuple
+from typing import List, Set, Tuple
 
 import attr
 from django.core.validators import MaxValueValidator, MinValueValidator
@@ -27,7 +27,13 @@ from beo_datastore.libs.plot_intervalframe import (
     plot_frame288_monthly_comparison,
     plot_intervalframe,
 )
-from beo_datastore.settings import MEDIA_ROOT, PVWATTS_API_KEY
+from beo_datastore.libs.utils import chunks
+from beo_datastore.settings import (
+    MEDIA_ROOT,
+    PVWATTS_API_KEY,
+    PVWATTS_CACHE_DIRECTORY,
+    PVWATTS_REPLAY,
+)
 from navigader_core.der.battery import (
     Battery as pyBattery,
     BatteryIntervalFrame,
@@ -51,6 +57,7 @@ from navigader_core.der.schedule_utils import (
     optimize_battery_schedule,
 )
 from navigader_core.der.solar import (
+    PVWattsResponseStore,
     SolarPV as pySolarPV,
     SolarPVSimulationBuilder,
     SolarPVStrategy as pySolarPVStrategy,
@@ -606,6 +613,14 @@ class EVSESimulation(DERSimulation):
         return EVSESimulationBuilder(der=der, der_strategy=der_strategy)
 
 
+if PVWATTS_CACHE_DIRECTORY:
+    PVWATTS_RESPONSE_STORE = PVWattsResponseStore(
+        directory=PVWATTS_CACHE_DIRECTORY, replay=bool(PVWATTS_REPLAY)
+    )
+else:
+    PVWATTS_RESPONSE_STORE = None
+
+
 class SolarPVConfiguration(DERConfiguration):
     """
     Container for storing SolarPV configurations.
@@ -640,7 +655,11 @@ class SolarPVConfiguration(DERConfiguration):
         creation, and can subsequently be called again if the original API call
         fails.
         """
-        der = pySolarPV(api_key=PVWATTS_API_KEY, **self.parameters)
+        der = pySolarPV(
+            api_key=PVWATTS_API_KEY,
+            response_store=PVWATTS_RESPONSE_STORE,
+            **self.parameters
+        )
         self.stored_response = der.pvwatts_response
         self.save()
 
@@ -705,6 +724,7 @@ class SolarPVConfiguration(DERConfiguration):
                 module_type=0,
                 tilt=tilt,
                 timeframe="hourly",
+                response_store=PVWATTS_RESPONSE_STORE,
             ),
         )
 
@@ -791,6 +811,60 @@ class SolarPVSimulation(DERSimulation):
     ) -> SolarPVSimulationBuilder:
         return SolarPVSimulationBuilder(der=der, der_strategy=der_strategy)
 
+    @classmethod
+    def create_simulations(
+        cls,
+        der_configuration: SolarPVConfiguration,
+        der_strategy: SolarPVStrategy,
+        meters: List[Meter],
+        start,
+        end_limit,
+        multiprocess=False,
+        batch_size=32,
+        fingerprints: dict = None,
+    ) -> None:
+        """
+        Run and store SolarPVSimulations for meters in batches using
+        SolarPVSimulationBuilder.run_batch_simulations(), which sizes every
+        meter in a batch in one vector operation rather than running each
+        meter through the builder. Only each meter's readings within start
+        and end_limit are read, and they are released once the batch is
+        stored.
+
+        :param der_configuration: SolarPVConfiguration
+        :param der_strategy: SolarPVStrategy
+        :param meters: list of Meters without stored simulations
+        :param start: datetime
+        :param end_limit: datetime
+        :param multiprocess: unused, batches are vectorized
+        :param batch_size: number of meters to load and simulate at once
+        :param fingerprints: dict with {Meter: fingerprint} pairs
+        """
+        builder = cls.get_simulation_builder(
+            der=der_configuration.der, der_strategy=der_strategy.der_strategy
+        )
+
+        for batch in chunks(meters, batch_size):
+            intervalframe_dict = {
+                meter: meter.get_meter_intervalframe(
+                    start=start, end_limit=end_limit
+                ).power_intervalframe
+                for meter in batch
+            }
+
+            cls.create_from_batch_simulations(
+                der_configuration=der_configuration,
+                der_strategy=der_strategy,
+                start=start,
+                end_limit=end_limit,
+                batch_simulations=builder.run_batch_simulations(
+                    intervalframe_dict=intervalframe_dict
+                ),
+                fingerprints=fingerprints,
+            )
+            for meter in batch:
+                meter.release_meter_frames()
+
 
 class FuelSwitchingConfiguration(DERConfiguration):
     """
@@ -882,3 +956,63 @@ class FuelSwitchingSimulation(DERSimulation):
     @classmethod
     def get_intervalframes(cls, meters: Set[Meter]):
         return {meter: meter.energy_container for meter in meters}
+
+    @classmethod
+    def get_meter_hash(cls, meter: Meter) -> str:
+        """
+        Hash of the meter's electricity and gas readings.
+        """
+        return "{}:{}".format(meter.frame_hash, meter.gas_hash)
+
+    @classmethod
+    def create_simulations(
+        cls,
+        der_configuration: FuelSwitchingConfiguration,
+        der_strategy: FuelSwitchingStrategy,
+        meters: List[Meter],
+        start,
+        end_limit,
+        multiprocess=False,
+        batch_size=32,
+        fingerprints: dict = None,
+    ) -> None:
+        """
+        Run and store FuelSwitchingSimulations for meters in batches using
+        FuelSwitchingSimulationBuilder.run_batch_simulations(), which applies
+        one normalized TMY3 profile per year to all of a batch's gas meters at
+        once rather than running each meter through the builder.
+
+        :param der_configuration: FuelSwitchingConfiguration
+        :param der_strategy: FuelSwitchingStrategy
+        :param meters: list of Meters without stored simulations
+        :param start: datetime
+        :param end_limit: datetime
+        :param multiprocess: unused, batches are vectorized
+        :param batch_size: number of meters to load and simulate at once
+        :param fingerprints: dict with {Meter: fingerprint} pairs
+        """
+        builder = cls.get_simulation_builder(
+            der=der_configuration.der, der_strategy=der_strategy.der_strategy
+        )
+
+        for batch in chunks(meters, batch_size):
+            intervalframe_dict = {
+                meter: energy_container.filter_by_datetime(
+                    start, end_limit
+                ).power_intervalframe
+                for meter, energy_container in cls.get_intervalframes(
+                    meters=set(batch)
+                ).items()
+            }
+            cls.create_from_batch_simulations(
+                der_configuration=der_configuration,
+                der_strategy=der_strategy,
+                start=start,
+                end_limit=end_limit,
+                batch_simulations=builder.run_batch_simulations(
+                    intervalframe_dict=intervalframe_dict
+                ),
+                fingerprints=fingerprints,
+            )
+            for meter in batch:
+                meter.release_meter_frames()
@@ -92,6 +92,44 @@ class TestSolarPV(APITestCase):
         self.assertEqual(SolarPVStrategy.objects.count(), 1)
         self.assertEqual(SolarPVSimulation.objects.count(), 1)
 
+    @mock.patch("requests.get", side_effect=mocked_pvwatts_requests_get)
+    def test_solar_simulation_deduplication(self, mock_get):
+        """
+        Test simulations of identical inputs share a single stored frame.
+        """
+        meter = CustomerMeter.objects.first()
+        configuration, _ = SolarPVConfiguration.get_or_create_from_object(
+            solar_pv=self.solar_pv
+        )
+        copied_configuration = SolarPVConfiguration.objects.create(
+            name="copy",
+            parameters=configuration.parameters,
+            stored_response=configuration.stored_response,
+        )
+        strategy, _ = SolarPVStrategy.get_or_create_from_object(
+            solar_pv_strategy=self.solar_pv_strategy
+        )
+
+        for der_configuration in [configuration, copied_configuration]:
+            SolarPVSimulation.generate(
+                der_configuration=der_configuration,
+                der_strategy=strategy,
+                start=meter.intervalframe.start_datetime,
+                end_limit=meter.intervalframe.end_limit_datetime,
+                meter_set={meter},
+            )
+
+        simulation, copied_simulation = SolarPVSimulation.objects.all()
+        self.assertIsNotNone(simulation.fingerprint)
+        self.assertEqual(simulation.fingerprint, copied_simulation.fingerprint)
+        self.assertEqual(simulation.file_path, copied_simulation.file_path)
+        self.assertEqual(
+            simulation.post_DER_total, copied_simulation.post_DER_total
+        )
+        self.assertEqual(
+            simulation.der_intervalframe, copied_simulation.der_intervalframe
+        )
+
     @mock.patch("requests.get", side_effect=mocked_pvwatts_requests_get)
     def test_solar_api_simulation(self, mock_get):
         """
@@ -92,6 +92,13 @@ class OriginFile(IntervalFrameFileMixin, MeterGroup):
             self.expected_meter_count == self.meters.count()
         ) and not self.meter_intervalframe.dataframe.empty
 
+    @property
+    def meters_ingested(self):
+        """
+        True if all meters have been ingested.
+        """
+        return self.expected_meter_count == self.meters.count()
+
     @property
     def has_gas(self):
         """
@@ -305,7 +312,7 @@ class OriginFile(IntervalFrameFileMixin, MeterGroup):
             if self.meters.count() == self.expected_meter_count:
                 self.intervalframe = reduce(
                     lambda x, y: x + y,
-                    (x.meter_intervalframe for x in self.meters.all()),
+                    self.get_meter_intervalframes().values(),
                     PowerIntervalFrame(),
                 )
                 self.save_frame()
@@ -647,6 +654,9 @@ class CustomerMeter(Meter):
         GasUsage, on_delete=models.PROTECT, blank=True, null=True
     )
 
+    # Used by Meter.prefetch_meter_frames().
+    frame_relation = "channels"
+
     class Meta:
         unique_together = (
             "sa_id",
@@ -667,20 +677,41 @@ class CustomerMeter(Meter):
     def meter_intervalframe(self):
         return self.intervalframe
 
+    def release_meter_frames(self):
+        """
+        Also drop the cached gas readings.
+        """
+        super().release_meter_frames()
+        if CustomerMeter.gas_usage.is_cached(self) and self.gas_usage:
+            self.gas_usage.release_frame()
+
+    @property
+    def frame_hash(self) -> str:
+        """
+        Use stored import and export channel hashes when available.
+        """
+        if self.import_hash is None or self.export_hash is None:
+            return super().frame_hash
+        return "{}:{}".format(self.import_hash, self.export_hash)
+
     @property
     def gas_intervalframe(self) -> GasIntervalFrame:
         if self.gas_usage:
             return self.gas_usage.intervalframe
 
+    @property
+    def gas_hash(self) -> str:
+        return str(self.gas_usage.usage_hash) if self.gas_usage else ""
+
     @property
     def has_gas(self):
         return bool(self.gas_usage)
 
-    def build_aggregate_metrics(self):
+    def build_aggregate_metrics(self, overwrite=False):
         """
         Computes the total_therms field
         """
-        super().build_aggregate_metrics()
+        super().build_aggregate_metrics(overwrite=overwrite)
         if self.has_gas:
             self.total_therms = self.gas_usage.intervalframe.total
             self.save(update_fields=["total_therms"])
@@ -700,12 +731,34 @@ class CustomerMeter(Meter):
 
         :return: PowerIntervalFrame
         """
+        if self._attached_meter_intervalframe is not None:
+            return self._attached_meter_intervalframe
         return reduce(
             lambda a, b: a + b,
             [x.intervalframe for x in self.channels.all()],
             PowerIntervalFrame(),
         )
 
+    def get_meter_intervalframe(self, start=None, end_limit=None):
+        """
+        Return the sum of the import and export channel intervalframes,
+        reading only the readings in range from file.
+
+        :param start: datetime object, None for no lower bound
+        :param end_limit: datetime object, None for no upper bound
+        :return: PowerIntervalFrame
+        """
+        if self._attached_meter_intervalframe is not None:
+            return super().get_meter_intervalframe(start, end_limit)
+        return reduce(
+            lambda a, b: a + b,
+            [
+                x.get_frame(start=start, end_limit=end_limit)
+                for x in self.channels.all()
+            ],
+            PowerIntervalFrame(),
+        )
+
     @property
     def import_channel(self):
         try:
@@ -764,7 +817,13 @@ class CustomerMeter(Meter):
             ]:
                 meter.get_or_create_channel(export, dataframe)
 
-            meter.build_aggregate_metrics()
+            meter.build_aggregate_metrics(overwrite=not created)
+
+            if not created:
+                # readings of re-ingested meters are stored again
+                for meter_group in meter.meter_groups.all():
+                    meter_group.delete_meter_matrix()
+
             return meter, created
 
     def get_or_create_channel(self, export, dataframe, data_unit_name="kw"):
@@ -958,7 +1017,7 @@ class CustomerPopulation(ValidationModel):
                 cluster.owners.add(owner)
 
         clustering = KMeansLoadClustering(
-            objects=self.meter_group.meters.all(),
+            objects=list(self.meter_group.get_meter_intervalframes().keys()),
             frame288_type=self.frame288_type,
             number_of_clusters=self.number_of_clusters,
             normalize=self.normalize,
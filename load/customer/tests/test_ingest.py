@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 import ntpath
 import os
+from unittest import mock
 
 from django.test import TestCase
 
@@ -14,6 +15,7 @@ from beo_datastore.settings import BASE_DIR
 from load.customer.models import CustomerMeter, OriginFile
 from load.tasks import ingest_origin_file, ingest_meters
 from reference.auth_user.models import LoadServingEntity
+from reference.reference_model.models import MeterGroupMatrixFrame
 
 
 MIDNIGHT_2018 = datetime(2018, 1, 1, 0, 0)
@@ -243,3 +245,65 @@ class TestItem17Ingest(TestCase):
         self.ingest_origin_file_meters(origin_file.id)
 
         self.assertEqual(meter_count, origin_file.meters.count())
+
+    def test_meter_matrix(self):
+        """
+        Test that Meter readings read from a MeterGroup's consolidated
+        storage match readings read from each Meter.
+        """
+        file = os.path.join(
+            BASE_DIR, "load/customer/tests/files/15_min_kw.csv"
+        )
+        origin_file = self.create_origin_file(file)
+        self.ingest_origin_file_meters(origin_file.id)
+        origin_file.build_meter_matrix()
+        self.assertTrue(MeterGroupMatrixFrame.exists(origin_file))
+
+        origin_file = OriginFile.objects.get(id=origin_file.id)
+        with mock.patch(
+            "reference.reference_model.models.METER_GROUP_MATRIX_STORAGE", 1
+        ):
+            meter_intervalframes = origin_file.get_meter_intervalframes()
+        self.assertEqual(len(meter_intervalframes), origin_file.meter_count)
+        for meter, intervalframe in meter_intervalframes.items():
+            self.assertIs(meter.meter_intervalframe, intervalframe)
+            expected = CustomerMeter.objects.get(id=meter.id).intervalframe
+            self.assertTrue(intervalframe.dataframe.equals(expected.dataframe))
+
+        # single meters are read from consolidated storage
+        meter = CustomerMeter.objects.last()
+        expected = meter.intervalframe
+        with mock.patch(
+            "reference.reference_model.models.METER_GROUP_MATRIX_STORAGE", 1
+        ):
+            (intervalframe,) = origin_file.get_meter_intervalframes(
+                meters=[meter]
+            ).values()
+        self.assertTrue(intervalframe.dataframe.equals(expected.dataframe))
+
+        # consolidated storage is deleted when meters are re-ingested
+        ingest_meters(
+            origin_file.id, origin_file.db_get_sa_ids()[:1], overwrite=True
+        )
+        self.assertFalse(MeterGroupMatrixFrame.exists(origin_file))
+
+    def test_prefetch_meter_frames(self):
+        """
+        Test that Meter readings prefetched concurrently match readings read
+        from each Meter.
+        """
+        file = os.path.join(
+            BASE_DIR, "load/customer/tests/files/15_min_kw.csv"
+        )
+        origin_file = self.create_origin_file(file)
+        self.ingest_origin_file_meters(origin_file.id)
+
+        meters = list(origin_file.meters.all())
+        CustomerMeter.prefetch_meter_frames(meters)
+        for meter in meters:
+            channels = meter.channels.all()
+            self.assertTrue(all(x.has_frame for x in channels))
+            expected = CustomerMeter.objects.get(id=meter.id).intervalframe
+            self.assertTrue(
+                meter.intervalframe.dataframe.equals(expected.dataframe)
+            )
@@ -1,3 +1,11 @@
+from datetime import datetime
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
 from django.test import TestCase
 
 from navigader_core.load.intervalframe import (
@@ -5,12 +13,22 @@ from navigader_core.load.intervalframe import (
     PowerIntervalFrame,
 )
 
+from beo_datastore.libs.dataframe import (
+    clear_parquet_cache,
+    get_row_groups_in_range,
+    parquet_cache_info,
+    read_parquet,
+    write_parquet,
+)
+from beo_datastore.libs.disk_cache import FrameDiskCache, LocalFileSystem
 from beo_datastore.libs.fixtures import (
     flush_intervalframe_files,
     load_intervalframe_files,
 )
+from beo_datastore.libs.intervalframe_file import PowerIntervalFrameFile
 
 from load.customer.models import Channel
+from scripts.convert_frame_files import convert_frame_files
 
 
 class TestIntervalFrame(TestCase):
@@ -76,6 +94,33 @@ class TestDataFrameFile(TestCase):
             )
         )
 
+    def test_read_intervalframe_range(self):
+        """
+        Test that reading a date range of a PowerIntervalFrameFile matches
+        filtering the whole file and skips row groups out of range.
+        """
+        channel = Channel.objects.first()
+        index = channel.intervalframe.dataframe.index
+        with mock.patch.object(
+            type(channel.intervalframe), "row_group_size", len(index) // 10
+        ):
+            channel.intervalframe.save()
+        start, end_limit = index[len(index) // 3], index[2 * len(index) // 3]
+        expected = channel.intervalframe.filter_by_datetime(start, end_limit)
+
+        parquet_file = pq.ParquetFile(channel.intervalframe.file_path)
+        row_groups = get_row_groups_in_range(
+            parquet_file, pd.Timestamp(start), pd.Timestamp(end_limit)
+        )
+        self.assertGreater(parquet_file.metadata.num_row_groups, 1)
+        self.assertTrue(row_groups)
+        self.assertLess(len(row_groups), parquet_file.metadata.num_row_groups)
+
+        channel = Channel.objects.get(id=channel.id)
+        intervalframe = channel.get_frame(start=start, end_limit=end_limit)
+        self.assertFalse(channel.has_frame)
+        self.assertTrue(intervalframe.dataframe.equals(expected.dataframe))
+
     def test_delete_288_frame(self):
         """
         Test the creation of default 288 frames after PowerIntervalFrameFile is
@@ -86,3 +131,324 @@ class TestDataFrameFile(TestCase):
         channel = Channel.objects.first()
         self.assertTrue(channel.intervalframe.dataframe.empty)
         self.assertFalse(channel.intervalframe.count_frame288.dataframe.empty)
+
+
+class ArrowFrameFile(PowerIntervalFrameFile):
+    """
+    PowerIntervalFrameFile stored as an Arrow IPC file.
+    """
+
+    file_directory = None
+    file_format = "arrow"
+
+
+class TestArrowFrameFile(TestCase):
+    def setUp(self):
+        """
+        Store ArrowFrameFiles in a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_directory = mock.patch.object(
+            ArrowFrameFile, "file_directory", self.directory.name
+        )
+        self.file_directory.start()
+        self.reference_object = SimpleNamespace(id=1)
+        self.dataframe = pd.DataFrame(
+            {"kw": [float(x) for x in range(96)]},
+            index=pd.date_range(datetime(2020, 1, 1), periods=96, freq="15T"),
+        )
+        clear_parquet_cache()
+
+    def tearDown(self):
+        clear_parquet_cache()
+        self.file_directory.stop()
+        self.directory.cleanup()
+
+    def read_frame(self, **kwargs):
+        return ArrowFrameFile.get_frame_from_file(
+            reference_object=self.reference_object, **kwargs
+        ).dataframe
+
+    def test_arrow_round_trip(self):
+        """
+        Test that frames are stored as Arrow IPC files and read back,
+        including date ranges.
+        """
+        ArrowFrameFile(
+            dataframe=self.dataframe, reference_object=self.reference_object
+        ).save()
+        self.assertEqual(
+            os.listdir(self.directory.name), ["ArrowFrameFile_1.arrow"]
+        )
+
+        self.assertTrue(self.read_frame().equals(self.dataframe))
+        start, end_limit = datetime(2020, 1, 1, 6), datetime(2020, 1, 1, 12)
+        index = self.dataframe.index
+        self.assertTrue(
+            self.read_frame(start=start, end_limit=end_limit).equals(
+                self.dataframe[(index >= start) & (index < end_limit)]
+            )
+        )
+
+    def test_parquet_fallback(self):
+        """
+        Test that frames which have not been converted to Arrow IPC files are
+        read from the original parquet file.
+        """
+        write_parquet(
+            self.dataframe,
+            ArrowFrameFile.get_file_path(self.reference_object, "parquet"),
+        )
+
+        self.assertTrue(self.read_frame().equals(self.dataframe))
+
+    def test_read_only(self):
+        """
+        Test that frames read from a DataFrameFile cannot be modified in place
+        and that copies of them can.
+        """
+        ArrowFrameFile(
+            dataframe=self.dataframe, reference_object=self.reference_object
+        ).save()
+
+        dataframe = self.read_frame()
+        with self.assertRaises(ValueError):
+            dataframe["kw"].values[0] = -1
+        copied_dataframe = dataframe.copy()
+        copied_dataframe["kw"].values[0] = -1
+
+        self.assertEqual(copied_dataframe["kw"].iloc[0], -1)
+        self.assertTrue(self.read_frame().equals(self.dataframe))
+
+    def test_convert_frame_files(self):
+        """
+        Test that stored parquet files are converted to Arrow IPC files.
+        """
+        write_parquet(
+            self.dataframe,
+            ArrowFrameFile.get_file_path(self.reference_object, "parquet"),
+        )
+
+        with mock.patch("builtins.print"):
+            convert_frame_files(ArrowFrameFile)
+
+        self.assertEqual(
+            os.listdir(self.directory.name), ["ArrowFrameFile_1.arrow"]
+        )
+        self.assertTrue(self.read_frame().equals(self.dataframe))
+
+
+class CountingFileSystem(LocalFileSystem):
+    """
+    LocalFileSystem standing in for S3 which counts downloads.
+    """
+
+    def __init__(self):
+        self.downloads = 0
+        self.lookups = 0
+
+    def info(self, path):
+        self.lookups += 1
+        return super().info(path)
+
+    def get(self, rpath, lpath):
+        self.downloads += 1
+        super().get(rpath, lpath)
+
+
+class TestFrameDiskCache(TestCase):
+    def setUp(self):
+        """
+        Create a FrameDiskCache in front of a local directory standing in for
+        S3.
+        """
+        self.remote_directory = tempfile.TemporaryDirectory()
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.filesystem = CountingFileSystem()
+        self.cache = self.get_cache(max_size=1024 * 1024)
+        self.dataframe = pd.DataFrame(
+            {"kw": range(96)},
+            index=pd.date_range(datetime(2020, 1, 1), periods=96, freq="15T"),
+        )
+        clear_parquet_cache()
+
+    def tearDown(self):
+        clear_parquet_cache()
+        self.remote_directory.cleanup()
+        self.cache_directory.cleanup()
+
+    def get_cache(self, max_size):
+        return FrameDiskCache(
+            directory=self.cache_directory.name,
+            max_size=max_size,
+            filesystem=self.filesystem,
+            remote_prefix=self.remote_directory.name,
+        )
+
+    def get_remote_path(self, name):
+        return os.path.join(self.remote_directory.name, name)
+
+    def get_cached_files(self):
+        return [
+            filename
+            for _, _, filenames in os.walk(self.cache_directory.name)
+            for filename in filenames
+        ]
+
+    def test_read_through_cache(self):
+        """
+        Test that remote files are downloaded once per version.
+        """
+        path = self.get_remote_path("frame.parquet")
+        self.dataframe.to_parquet(path)
+
+        with mock.patch(
+            "beo_datastore.libs.dataframe.FRAME_DISK_CACHE", self.cache
+        ), mock.patch("beo_datastore.libs.dataframe.FRAME_VERSION_TTL", 0):
+            for _ in range(2):
+                clear_parquet_cache()
+                self.assertTrue(read_parquet(path).equals(self.dataframe))
+            self.assertEqual(self.filesystem.downloads, 1)
+
+            # rewritten files are downloaded again and replace older copies
+            (self.dataframe * 2).to_parquet(path)
+            self.assertTrue(read_parquet(path).equals(self.dataframe * 2))
+            self.assertEqual(self.filesystem.downloads, 2)
+            self.assertEqual(len(self.get_cached_files()), 1)
+
+    def test_version_ttl(self):
+        """
+        Test that remote file versions are reused within FRAME_VERSION_TTL
+        and looked up again once the file is written.
+        """
+        path = self.get_remote_path("frame.parquet")
+        self.dataframe.to_parquet(path)
+
+        with mock.patch(
+            "beo_datastore.libs.dataframe.FRAME_DISK_CACHE", self.cache
+        ):
+            for _ in range(3):
+                self.assertTrue(read_parquet(path).equals(self.dataframe))
+            self.assertEqual(self.filesystem.lookups, 1)
+
+            # written files are looked up again on their next read
+            write_parquet(self.dataframe * 2, path)
+            lookups = self.filesystem.lookups
+            self.assertTrue(read_parquet(path).equals(self.dataframe * 2))
+            self.assertEqual(self.filesystem.lookups, lookups + 1)
+
+    def test_write_through_cache(self):
+        """
+        Test that written files are read without being downloaded.
+        """
+        path = self.get_remote_path("frame.parquet")
+
+        with mock.patch(
+            "beo_datastore.libs.dataframe.FRAME_DISK_CACHE", self.cache
+        ):
+            write_parquet(self.dataframe, path)
+            self.assertTrue(os.path.exists(path))
+            self.assertTrue(read_parquet(path).equals(self.dataframe))
+            self.assertEqual(self.filesystem.downloads, 0)
+
+    def test_verification(self):
+        """
+        Test that downloads which do not match the remote file are not
+        cached.
+        """
+        path = self.get_remote_path("frame.parquet")
+        self.dataframe.to_parquet(path)
+        info = self.cache.get_info(path)
+        info["ETag"] = '"{}"'.format("0" * 32)
+
+        self.assertEqual(self.cache.get(path, info), path)
+        self.assertEqual(self.get_cached_files(), [])
+
+    def test_eviction(self):
+        """
+        Test that least recently used files are evicted beyond max_size.
+        """
+        paths = [self.get_remote_path(x) for x in ["a.parquet", "b.parquet"]]
+        for path in paths:
+            self.dataframe.to_parquet(path)
+        cache = self.get_cache(max_size=os.path.getsize(paths[0]))
+
+        first_copy = cache.get(paths[0])
+        os.utime(first_copy, (0, 0))
+        cache.get(paths[1])
+        self.assertFalse(os.path.exists(first_copy))
+        self.assertEqual(len(self.get_cached_files()), 1)
+
+
+class TestParquetCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dataframe = pd.DataFrame(
+            {"kw": range(96)},
+            index=pd.date_range(datetime(2020, 1, 1), periods=96, freq="15T"),
+        )
+        clear_parquet_cache()
+
+    def tearDown(self):
+        clear_parquet_cache()
+        self.directory.cleanup()
+
+    def get_path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_hits_and_misses(self):
+        """
+        Test that files are decoded once per version.
+        """
+        path = self.get_path("frame.parquet")
+        write_parquet(self.dataframe, path)
+
+        for _ in range(3):
+            self.assertTrue(read_parquet(path).equals(self.dataframe))
+        info = parquet_cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+        # rewritten files are decoded again
+        write_parquet(self.dataframe * 2, path)
+        self.assertTrue(read_parquet(path).equals(self.dataframe * 2))
+        info = parquet_cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+    def test_read_only(self):
+        """
+        Test that cached DataFrames cannot be modified in place through
+        returned DataFrames.
+        """
+        path = self.get_path("frame.parquet")
+        write_parquet(self.dataframe, path)
+
+        dataframe = read_parquet(path)
+        with self.assertRaises(ValueError):
+            dataframe["kw"].values[0] = -1
+        copied_dataframe = dataframe.copy()
+        copied_dataframe["kw"].values[0] = -1
+
+        self.assertTrue(read_parquet(path).equals(self.dataframe))
+
+    def test_eviction(self):
+        """
+        Test that least recently read DataFrames are evicted beyond
+        PARQUET_CACHE_SIZE.
+        """
+        paths = [self.get_path(x) for x in ["a.parquet", "b.parquet"]]
+        for path in paths:
+            write_parquet(self.dataframe, path)
+        size = self.dataframe.memory_usage(index=True, deep=True).sum()
+
+        with mock.patch(
+            "beo_datastore.libs.dataframe.PARQUET_CACHE_SIZE", size
+        ):
+            for path in paths + paths[1:]:
+                read_parquet(path)
+            info = parquet_cache_info()
+            self.assertEqual((info.hits, info.misses), (1, 2))
+            self.assertEqual(info.currsize, size)
+
+            # first file was evicted by the second
+            read_parquet(paths[0])
+            self.assertEqual(parquet_cache_info().misses, 3)
@@ -180,3 +180,11 @@ class ReferenceMeter(IntervalFrameFileMixin, Meter):
     @property
     def meter_intervalframe(self):
         return self.intervalframe
+
+    def release_meter_frames(self):
+        """
+        Also drop the cached ReferenceMeterIntervalFrame.
+        """
+        super().release_meter_frames()
+        for attribute in ["_intervalframe", "intervalframe_from_file"]:
+            self.__dict__.pop(attribute, None)
@@ -8,7 +8,7 @@ from django.utils.timezone import now
 
 from beo_datastore.celery import app
 from beo_datastore.libs.utils import chunks
-from beo_datastore.settings import ADMINS, APP_URL
+from beo_datastore.settings import ADMINS, APP_URL, METER_GROUP_MATRIX_STORAGE
 
 from load.customer.models import CustomerMeter, CustomerPopulation, OriginFile
 from load.libs.ingest import reformat_item_17, get_gas_dataframe
@@ -134,13 +134,37 @@ def ingest_meters(origin_file_id, sa_ids, overwrite=False):
     if origin_file.has_completed:
         origin_file.mark_complete()
 
+    if METER_GROUP_MATRIX_STORAGE and origin_file.meters_ingested:
+        build_meter_group_matrix.delay(origin_file.id)
+
+
+@app.task(soft_time_limit=1800, max_retries=3)
+def build_meter_group_matrix(meter_group_id, overwrite=False):
+    """
+    Consolidate the readings of all Meters of a MeterGroup into a single
+    file once all Meters have been ingested, see
+    MeterGroup.build_meter_matrix().
+
+    :param meter_group_id: MeterGroup id
+    :param overwrite: True to rebuild an existing file
+    """
+    if MeterGroup.is_locked(meter_group_id):
+        # do nothing if job is running
+        return
+
+    meter_group = MeterGroup.objects.get(id=meter_group_id)
+    meter_group.build_meter_matrix(overwrite=overwrite)
+
 
 @app.task(soft_time_limit=1800, max_retries=3)
 def aggregate_meter_group_intervalframes(
     meter_group_id, in_db=True, overwrite=False
 ):
     """
-    Aggregate all Meter data associated with a MeterGroup.
+    Aggregate all Meter data associated with a MeterGroup. If
+    METER_GROUP_MATRIX_STORAGE is set and all Meters have been ingested, Meter
+    data is first consolidated into a single file, see
+    MeterGroup.build_meter_matrix().
 
     :param meter_group_id: MeterGroup id
     :param in_db: If True, attempt in database aggregation.
@@ -153,6 +177,8 @@ def aggregate_meter_group_intervalframes(
         return
 
     meter_group = MeterGroup.objects.get(id=meter_group_id)
+    if METER_GROUP_MATRIX_STORAGE:
+        meter_group.build_meter_matrix()
 
     if in_db and isinstance(meter_group, OriginFile) and meter_group.db_exists:
         meter_group.db_aggregate_meter_intervalframes()
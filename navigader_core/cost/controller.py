@@ -2,6 +2,7 @@ from abc import ABC
 import attr
 from cached_property import cached_property
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from typing import Any, Dict, List, Tuple
 
@@ -262,6 +263,174 @@ class AggregateGHGCalculation(DERCostCalculation):
         """
         return cls(agg_simulation=agg_simulation, rate_data=rate_data)
 
+    @staticmethod
+    def get_totals(
+        intervalframes: List[PowerIntervalFrame],
+        ghg_frame288s: List[ValidationFrame288],
+    ) -> np.ndarray:
+        """
+        Return total tons of CO2 of each PowerIntervalFrame under each GHG
+        ValidationFrame288, computed as a single (intervalframes x 288) @
+        (288 x ghg_frame288s) product. Frame288s are aligned by month and hour
+        before multiplying, see ValidationFrame288.flattened_values.
+
+        :param intervalframes: list of PowerIntervalFrames
+        :param ghg_frame288s: list of GHG ValidationFrame288s
+        :return: len(intervalframes) x len(ghg_frame288s) array
+        """
+        total_288s = np.array(
+            [x.total_frame288.flattened_values for x in intervalframes]
+        ).reshape(len(intervalframes), 288)
+        ghg_288s = np.array(
+            [x.flattened_values for x in ghg_frame288s]
+        ).reshape(len(ghg_frame288s), 288)
+
+        return np.nan_to_num(total_288s) @ np.nan_to_num(ghg_288s.T)
+
+
+@attr.s(frozen=True)
+class SystemProfilePeaks(object):
+    """
+    A system profile's readings placed on a regular one-year grid with its
+    monthly peaks precomputed. Resource adequacy calculations reduce to
+    array operations on DER readings placed on the same grid.
+    """
+
+    intervalframe = attr.ib(type=PowerIntervalFrame)
+
+    @cached_property
+    def year(self) -> int:
+        years = set(self.intervalframe.dataframe.index.year)
+        if len(years) != 1:
+            raise AttributeError(
+                "Unique year not detected in {}.".format(years)
+            )
+        else:
+            return years.pop()
+
+    @cached_property
+    def period(self) -> timedelta:
+        return self.intervalframe.period
+
+    @cached_property
+    def values(self) -> np.ndarray:
+        """
+        System profile readings (kW) on the grid at self.period.
+        """
+        return self.get_grid_values(self.intervalframe, self.period)
+
+    @cached_property
+    def monthly_peaks(self) -> np.ndarray:
+        """
+        Array of the 12 monthly system peaks (kW).
+        """
+        return self.get_monthly_peaks(self.values, self.period)
+
+    def get_month_positions(self, period: timedelta) -> np.ndarray:
+        """
+        Return grid positions of the first interval of each month.
+
+        :param period: grid period
+        :return: array of 12 positions
+        """
+        start = pd.Timestamp(self.year, 1, 1)
+        month_starts = pd.date_range(start, periods=12, freq="MS")
+        return np.asarray((month_starts - start) // period, dtype=int)
+
+    def get_grid_values(
+        self, intervalframe: PowerIntervalFrame, period: timedelta
+    ) -> np.ndarray:
+        """
+        Place a PowerIntervalFrame's readings on a one-year grid at period
+        beginning on January 1st of self.year. Readings are shifted to
+        self.year and repeated when their period is longer than the grid's.
+        Intervals without readings are NaN.
+
+        :param intervalframe: PowerIntervalFrame
+        :param period: grid period
+        :return: array
+        """
+        start = pd.Timestamp(self.year, 1, 1)
+        size = (pd.Timestamp(self.year + 1, 1, 1) - start) // period
+        values = np.full(size, np.nan)
+
+        dataframe = intervalframe.dataframe
+        if dataframe.empty:
+            return values
+
+        # shift index year to align with system profile
+        index = dataframe.index
+        timestamps = index.asi8.copy()
+        for year in set(index.year) - {self.year}:
+            mask = index.year == year
+            timestamps[mask] = (
+                index[mask] + pd.DateOffset(years=self.year - year)
+            ).asi8
+
+        repeat = max(intervalframe.period // period, 1)
+        positions = (timestamps - start.value) // pd.Timedelta(period).value
+        positions = (positions[:, None] + np.arange(repeat)).ravel()
+        readings = np.repeat(dataframe["kw"].values, repeat)
+        in_grid = (positions >= 0) & (positions < size)
+        values[positions[in_grid]] = readings[in_grid]
+
+        return values
+
+    def get_monthly_peaks(
+        self, values: np.ndarray, period: timedelta
+    ) -> np.ndarray:
+        """
+        Return the maximum of each month of grid values. Months without
+        readings have a peak of 0.
+
+        :param values: array or 2-D array with grid values in each row
+        :param period: grid period
+        :return: array or 2-D array with 12 monthly peaks in each row
+        """
+        peaks = np.fmax.reduceat(
+            values, self.get_month_positions(period), axis=-1
+        )
+        return np.nan_to_num(peaks)
+
+    def get_post_DER_monthly_peaks(
+        self, der_intervalframes: List[PowerIntervalFrame]
+    ) -> np.ndarray:
+        """
+        Return monthly system peaks after adding each DER PowerIntervalFrame
+        to the system profile, computed at the shortest period of all
+        PowerIntervalFrames. DER readings are shifted to the system profile's
+        year.
+
+        :param der_intervalframes: list of PowerIntervalFrames
+        :return: len(der_intervalframes) x 12 array
+        """
+        for intervalframe in der_intervalframes:
+            if (
+                intervalframe.end_limit_timestamp
+                - intervalframe.start_timestamp
+            ) > timedelta(days=366):
+                raise RuntimeError(
+                    "PowerIntervalFrame must be one year or less."
+                )
+
+        period = min(
+            [self.period]
+            + [x.period for x in der_intervalframes if x.period > timedelta(0)]
+        )
+        system_values = np.repeat(self.values, self.period // period)
+        der_values = np.array(
+            [self.get_grid_values(x, period) for x in der_intervalframes]
+        ).reshape(len(der_intervalframes), len(system_values))
+
+        # intervals missing from either frame only contain the other frame
+        post_der_values = np.where(
+            np.isnan(der_values),
+            system_values,
+            np.nan_to_num(system_values) + der_values,
+        )
+
+        return self.get_monthly_peaks(post_der_values, period)
+
 
 @attr.s(frozen=True)
 class AggregateResourceAdequacyCalculation(DERCostCalculation):
@@ -279,22 +448,19 @@ class AggregateResourceAdequacyCalculation(DERCostCalculation):
         return self.rate_data
 
     @cached_property
+    def system_profile_peaks(self) -> SystemProfilePeaks:
+        return SystemProfilePeaks(intervalframe=self.rate_data)
+
+    @property
     def system_profile_year(self) -> int:
-        years = set(self.system_profile_intervalframe.dataframe.index.year)
-        if len(years) != 1:
-            raise AttributeError(
-                "Unique year not detected in {}.".format(years)
-            )
-        else:
-            return years.pop()
+        return self.system_profile_peaks.year
 
     @cached_property
     def pre_DER_total(self) -> float:
         """
         Return sum of all monthly system peaks pre-DER (kW).
         """
-        system_peaks = self.pre_DER_system_intervalframe.maximum_frame288
-        return system_peaks.dataframe.max().sum()
+        return self.system_profile_peaks.monthly_peaks.sum()
 
     @cached_property
     def pre_DER_total_cost(self) -> float:
@@ -308,8 +474,9 @@ class AggregateResourceAdequacyCalculation(DERCostCalculation):
         """
         Return sum of all monthly system peaks post-DER. (kW)
         """
-        system_peaks = self.post_DER_system_intervalframe.maximum_frame288
-        return system_peaks.dataframe.max().sum()
+        return self.system_profile_peaks.get_post_DER_monthly_peaks(
+            [self.agg_simulation.der_intervalframe]
+        ).sum()
 
     @cached_property
     def post_DER_total_cost(self) -> float:
@@ -352,13 +519,15 @@ class AggregateResourceAdequacyCalculation(DERCostCalculation):
         ) > timedelta(days=366):
             raise RuntimeError("PowerIntervalFrame must be one year or less.")
 
-        # shift BatteryIntervalFrame year to align with SystemProfile
-        updated_index = intervalframe.dataframe.index.map(
+        # shift a copy of the DER dataframe's year to align with SystemProfile
+        dataframe = intervalframe.dataframe.copy()
+        dataframe.index = dataframe.index.map(
             lambda t: t.replace(year=self.system_profile_year)
         )
-        intervalframe.dataframe.index = updated_index
 
-        return self.system_profile_intervalframe + intervalframe
+        return self.system_profile_intervalframe + PowerIntervalFrame(
+            dataframe=dataframe
+        )
 
     @classmethod
     def create(
@@ -391,16 +560,18 @@ class AggregateProcurementCostCalculation(DERCostCalculation):
         """
         Total procurement costs pre-DER.
         """
-        return self.pre_DER_procurement_cost_intervalframe.dataframe["$"].sum()
+        return self.procurement_rate_intervalframe.get_procurement_costs(
+            [self.agg_simulation.pre_der_intervalframe]
+        )[0]
 
     @cached_property
     def post_DER_total(self) -> float:
         """
         Total procurement costs post-DER.
         """
-        return self.post_DER_procurement_cost_intervalframe.dataframe[
-            "$"
-        ].sum()
+        return self.procurement_rate_intervalframe.get_procurement_costs(
+            [self.agg_simulation.post_der_intervalframe]
+        )[0]
 
     @cached_property
     def pre_DER_procurement_cost_intervalframe(
@@ -410,25 +581,13 @@ class AggregateProcurementCostCalculation(DERCostCalculation):
         ProcurementCostIntervalFrame with pre-DER costs on an
         interval-by-interval basis.
 
-        Interval readings will be converted to EnergyIntervalFrame for proper
-        calculation.
+        Interval readings will be resampled to the procurement rate period and
+        converted to EnergyIntervalFrame for proper calculation.
         """
-        pre_der_intervalframe = (
-            self.agg_simulation.pre_der_intervalframe.energy_intervalframe
-        )
-
-        df = pd.concat(
-            [
-                pre_der_intervalframe.dataframe,
-                self.procurement_rate_intervalframe.dataframe,
-            ],
-            axis=1,
-            join="inner",
+        rate_intervalframe = self.procurement_rate_intervalframe
+        return rate_intervalframe.get_procurement_cost_intervalframe(
+            self.agg_simulation.pre_der_intervalframe
         )
-        df["$"] = df["kwh"] * df["$/kwh"]
-        df = df.drop(columns=["$/kwh"])
-
-        return ProcurementCostIntervalFrame(dataframe=df)
 
     @cached_property
     def post_DER_procurement_cost_intervalframe(
@@ -438,25 +597,13 @@ class AggregateProcurementCostCalculation(DERCostCalculation):
         ProcurementCostIntervalFrame with post-DER costs on an
         interval-by-interval basis.
 
-        Interval readings will be converted to EnergyIntervalFrame for proper
-        calculation.
+        Interval readings will be resampled to the procurement rate period and
+        converted to EnergyIntervalFrame for proper calculation.
         """
-        post_der_intervalframe = (
-            self.agg_simulation.post_der_intervalframe.energy_intervalframe
-        )
-
-        df = pd.concat(
-            [
-                post_der_intervalframe.dataframe,
-                self.procurement_rate_intervalframe.dataframe,
-            ],
-            axis=1,
-            join="inner",
+        rate_intervalframe = self.procurement_rate_intervalframe
+        return rate_intervalframe.get_procurement_cost_intervalframe(
+            self.agg_simulation.post_der_intervalframe
         )
-        df["$"] = df["kwh"] * df["$/kwh"]
-        df = df.drop(columns=["$/kwh"])
-
-        return ProcurementCostIntervalFrame(dataframe=df)
 
     @classmethod
     def create(
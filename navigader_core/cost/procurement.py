@@ -81,8 +81,10 @@ class ProcurementRateIntervalFrame(
             )
 
         # resample to match period of self
-        power_intervalframe = intervalframe.power_intervalframe.resample_intervalframe(
-            self.period
+        power_intervalframe = (
+            intervalframe.power_intervalframe.get_resampled_intervalframe(
+                self.period
+            )
         )
 
         # create dataframe with "kwh" and "$" columns
@@ -99,6 +101,44 @@ class ProcurementRateIntervalFrame(
 
         return ProcurementCostIntervalFrame(dataframe=dataframe)
 
+    def get_procurement_costs(self, intervalframes):
+        """
+        Return the total procurement cost of each
+        EnergyIntervalFrame/PowerIntervalFrame. Readings are resampled to
+        match period of self, see get_resampled_intervalframe(), and placed
+        on the intervals of self, so that all costs are computed as a single
+        (intervalframes x intervals) @ (intervals) product.
+
+        :param intervalframes: list of EnergyIntervalFrames and/or
+            PowerIntervalFrames
+        :return: array of costs ($)
+        """
+        kwh = np.zeros((len(intervalframes), len(self.dataframe)))
+        if self.period == timedelta(0):
+            return kwh.sum(axis=1)
+
+        for i, intervalframe in enumerate(intervalframes):
+            if intervalframe.period == timedelta(0):
+                continue
+
+            # resample to match period of self
+            power_intervalframe = intervalframe.power_intervalframe
+            if power_intervalframe.period != self.period:
+                power_intervalframe = (
+                    power_intervalframe.get_resampled_intervalframe(
+                        self.period
+                    )
+                )
+            dataframe = power_intervalframe.energy_intervalframe.dataframe
+
+            positions = self.dataframe.index.get_indexer(dataframe.index)
+            in_rates = positions >= 0
+            kwh[i, positions[in_rates]] = dataframe["kwh"].values[in_rates]
+
+        return np.nan_to_num(kwh) @ np.nan_to_num(
+            self.dataframe["$/kwh"].values.astype(float)
+        )
+
 
 class ProcurementCostIntervalFrame(
     ValidationIntervalFrame, ProcurementFrame288Mixin
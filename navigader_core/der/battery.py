@@ -189,8 +189,25 @@ class BatteryStrategy(DERStrategy):
         """
         return self.discharge_schedule.dataframe[month][hour]
 
+    def compile_time_grid(self, time_grid: pd.DatetimeIndex) -> dict:
+        """
+        Return charge and discharge thresholds at each interval of time_grid.
+        """
+        return {
+            "charge_threshold": self.charge_schedule.get_calendar_values(
+                time_grid
+            ),
+            "discharge_threshold": self.discharge_schedule.get_calendar_values(
+                time_grid
+            ),
+        }
+
     def get_target_power(
-        self, timestamp: datetime, meter_reading: float
+        self,
+        timestamp: datetime,
+        meter_reading: float,
+        charge_threshold: float = None,
+        discharge_threshold: float = None,
     ) -> float:
         """
         Based on a given timestamp and meter_reading, return the target power
@@ -203,13 +220,18 @@ class BatteryStrategy(DERStrategy):
 
         Note: Power level is rounded to nearest kw to increase hits in
         generate_battery_operations()'s lru_cache.
+
+        Thresholds from compile() can be passed in to skip the schedule
+        lookups.
         """
-        charge_threshold = self.get_charge_threshold(
-            month=timestamp.month, hour=timestamp.hour
-        )
-        discharge_threshold = self.get_discharge_threshold(
-            month=timestamp.month, hour=timestamp.hour
-        )
+        if charge_threshold is None:
+            charge_threshold = self.get_charge_threshold(
+                month=timestamp.month, hour=timestamp.hour
+            )
+        if discharge_threshold is None:
+            discharge_threshold = self.get_discharge_threshold(
+                month=timestamp.month, hour=timestamp.hour
+            )
 
         if meter_reading < charge_threshold:  # charge battery
             try:
@@ -276,6 +298,8 @@ class BatterySimulationBuilder(DERSimulationSequenceBuilder):
     der = attr.ib(type=Battery)
     der_strategy = attr.ib(type=BatteryStrategy)
 
+    noop_state_columns = ("charge",)
+
     def get_der_intervalframe(self) -> DataFrameQueue:
         return BatteryIntervalFrame()
 
@@ -297,9 +321,14 @@ class BatterySimulationBuilder(DERSimulationSequenceBuilder):
         interval_load: float,
         duration: timedelta,
         der_intervalframe: BatteryIntervalFrame,
+        charge_threshold: float = None,
+        discharge_threshold: float = None,
     ) -> OrderedDict:
         power_level = self.der_strategy.get_target_power(
-            timestamp=interval_start, meter_reading=interval_load
+            timestamp=interval_start,
+            meter_reading=interval_load,
+            charge_threshold=charge_threshold,
+            discharge_threshold=discharge_threshold,
         )
 
         charging = power_level >= 0
@@ -1,15 +1,22 @@
 from abc import ABC, abstractmethod
+import atexit
 import attr
 from cached_property import cached_property
 from collections import OrderedDict
 from datetime import datetime, timedelta
 from django.core.exceptions import ValidationError
 from functools import reduce
-from multiprocessing import Pool
+import hashlib
+import json
+from math import ceil
+from multiprocessing import Pool, cpu_count
+import numpy as np
 import pandas as pd
 from typing import Any
 
+from navigader_core.load.dataframe import get_time_grid_key
 from navigader_core.load.intervalframe import (
+    EnergyContainer,
     PowerIntervalFrame,
     ValidationIntervalFrame,
 )
@@ -41,7 +48,42 @@ class DERStrategy(ABC, ValidationErrorMixin):
     describes how the DER is used, typically on an hour-by-hour basis.
     """
 
-    pass
+    # number of compiled time grids to keep per strategy
+    compiled_time_grid_limit = 16
+
+    def compile(self, time_grid: pd.DatetimeIndex) -> dict:
+        """
+        Return a dict of per-interval strategy arrays aligned with time_grid,
+        ex. {"charge_threshold": array, ...}. Results are memoized per time
+        grid so that many meters sharing the same timestamps only compile a
+        strategy once.
+
+        :param time_grid: pandas DatetimeIndex
+        :return: dict of read-only numpy arrays
+        """
+        compiled_time_grids = self.__dict__.setdefault(
+            "_compiled_time_grids", OrderedDict()
+        )
+        key = get_time_grid_key(time_grid)
+        if key not in compiled_time_grids:
+            compiled = self.compile_time_grid(pd.DatetimeIndex(time_grid))
+            for array in compiled.values():
+                array.setflags(write=False)
+            compiled_time_grids[key] = compiled
+            while len(compiled_time_grids) > self.compiled_time_grid_limit:
+                compiled_time_grids.popitem(last=False)
+
+        return compiled_time_grids[key]
+
+    def compile_time_grid(self, time_grid: pd.DatetimeIndex) -> dict:
+        """
+        Compute per-interval strategy arrays for time_grid. Strategies with
+        month-hour schedules should override this method, see compile().
+
+        :param time_grid: pandas DatetimeIndex
+        :return: dict of numpy arrays
+        """
+        return {}
 
 
 class DataFrameQueue(ABC, PowerIntervalFrame):
@@ -261,6 +303,10 @@ class DERSimulationBuilder(ABC):
     der = attr.ib(type=DER)
     der_strategy = attr.ib(type=DERStrategy)
 
+    # increment when changes to simulation code change DERProducts so that
+    # fingerprints of previous simulations are not reused
+    version = 1
+
     @abstractmethod
     def run_simulation(self, intervalframe: PowerIntervalFrame) -> DERProduct:
         """
@@ -271,6 +317,65 @@ class DERSimulationBuilder(ABC):
         """
         pass
 
+    @staticmethod
+    def _get_fingerprint_value(value):
+        """
+        Return JSON-serializable equivalent of values found in DERs and
+        DERStrategies. Frames are represented by their hash.
+        """
+        if hasattr(value, "dataframe"):
+            return int(pd.util.hash_pandas_object(value.dataframe).sum())
+        elif isinstance(value, (datetime, pd.Timestamp)):
+            return value.isoformat()
+        elif isinstance(value, timedelta):
+            return value.total_seconds()
+        elif isinstance(value, np.generic):
+            return value.item()
+
+        raise TypeError(
+            "Cannot fingerprint {} object.".format(value.__class__.__name__)
+        )
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        Fingerprint of the simulation code version and DER and DERStrategy
+        parameters. Attributes excluded from equality (ex. response caches)
+        are ignored.
+        """
+
+        def is_parameter(attribute, value):
+            return attribute.eq
+
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    self.__class__.__name__,
+                    self.version,
+                    attr.asdict(self.der, filter=is_parameter),
+                    attr.asdict(self.der_strategy, filter=is_parameter),
+                ],
+                sort_keys=True,
+                default=self._get_fingerprint_value,
+            ).encode()
+        ).hexdigest()
+
+    def get_fingerprint(self, *inputs) -> str:
+        """
+        Return a fingerprint of self.fingerprint and simulation inputs (ex.
+        intervalframe hash and timeframe). Equal fingerprints indicate equal
+        DERProducts.
+
+        :param inputs: JSON-serializable simulation inputs
+        :return: sha256 hex digest
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [self.fingerprint, inputs],
+                default=self._get_fingerprint_value,
+            ).encode()
+        ).hexdigest()
+
 
 @attr.s(frozen=True)
 class DERSimulationSequenceBuilder(DERSimulationBuilder):
@@ -280,6 +385,10 @@ class DERSimulationSequenceBuilder(DERSimulationBuilder):
     interval-by-interval basis.
     """
 
+    # no-op columns that carry the DER's state forward from the preceding
+    # operation, e.g. a battery's charge
+    noop_state_columns = ()
+
     @abstractmethod
     def get_der_intervalframe(self) -> DataFrameQueue:
         """
@@ -304,6 +413,40 @@ class DERSimulationSequenceBuilder(DERSimulationBuilder):
         """
         pass
 
+    def fill_noops(
+        self,
+        der_intervalframe: DataFrameQueue,
+        time_grid: pd.DatetimeIndex,
+        noops: np.ndarray,
+    ) -> None:
+        """
+        Insert no-ops into der_intervalframe at every interval of time_grid
+        where noops is True in a single array operation. A single no-op from
+        get_noop() is broadcast across those intervals and its
+        noop_state_columns are carried forward from the preceding operation.
+
+        :param der_intervalframe: DataFrameQueue with committed operations
+        :param time_grid: pandas DatetimeIndex
+        :param noops: boolean mask over time_grid
+        """
+        noop = self.get_noop(
+            interval_start=time_grid[0],
+            der_intervalframe=self.get_der_intervalframe(),
+        )
+        noop.pop("start", None)
+        dataframe = der_intervalframe.dataframe
+        dataframe = dataframe.reindex(
+            index=pd.DatetimeIndex(time_grid.to_numpy()),
+            columns=list(dataframe.columns)
+            + [x for x in noop.keys() if x not in dataframe.columns],
+        )
+        for column, value in noop.items():
+            if column in self.noop_state_columns:
+                dataframe[column] = dataframe[column].ffill().fillna(value)
+            else:
+                dataframe.loc[noops, column] = value
+        der_intervalframe.dataframe = dataframe
+
     @abstractmethod
     def operate_der(
         self,
@@ -311,6 +454,7 @@ class DERSimulationSequenceBuilder(DERSimulationBuilder):
         interval_load: float,
         duration: timedelta,
         der_intervalframe: DataFrameQueue,
+        **strategy_values
     ) -> OrderedDict:
         """
         Generate a DER operation over a given interval based off of current DER
@@ -322,6 +466,8 @@ class DERSimulationSequenceBuilder(DERSimulationBuilder):
           interval
         :param duration: the length of the interval
         :param der_intervalframe: DataFrameQueue holding DER state
+        :param strategy_values: the interval's values from
+          der_strategy.compile()
         """
         pass
 
@@ -337,11 +483,37 @@ class DERSimulationSequenceBuilder(DERSimulationBuilder):
         """
         return pre_der_intervalframe + der_intervalframe
 
+    @staticmethod
+    def get_time_grid(
+        intervalframe: PowerIntervalFrame,
+    ) -> (pd.DatetimeIndex, np.ndarray):
+        """
+        Return a complete time grid from the first to the last interval of
+        intervalframe at its period along with a mask that is True for
+        intervals missing from intervalframe.
+
+        :param intervalframe: PowerIntervalFrame
+        :return: (time grid, missing-data mask)
+        """
+        index = intervalframe.dataframe.index
+        period = intervalframe.period
+
+        if index.empty or not period:
+            time_grid = index
+        else:
+            time_grid = pd.date_range(
+                start=index.min(), end=index.max(), freq=period
+            ).union(index)
+
+        return time_grid, ~time_grid.isin(index)
+
     def run_simulation(self, intervalframe: PowerIntervalFrame) -> DERProduct:
         """
-        Runs a DER simulation given a pre-DER intervalframe. Each row of the
-        pre-DER intervalframe is iterated over and the state of the DER/load
-        is modified according to DER-specific logic.
+        Runs a DER simulation given a pre-DER intervalframe. The pre-DER
+        intervalframe is reindexed to a complete time grid and each interval
+        is iterated over, modifying the state of the DER/load according to
+        DER-specific logic. Intervals missing from the pre-DER intervalframe
+        are skipped and filled with no-ops afterwards, see fill_noops().
 
         :param intervalframe: the pre-DER intervalframe
         """
@@ -349,39 +521,29 @@ class DERSimulationSequenceBuilder(DERSimulationBuilder):
         der_intervalframe = self.get_der_intervalframe()
         interval_duration = intervalframe.period
 
-        for index, row in intervalframe.dataframe.iterrows():
-            interval_start = index
-            next_timestamp = (
-                der_intervalframe.latest_interval_timestamp + interval_duration
-            )
-
-            # fill gaps with no-ops
-            while interval_start - next_timestamp > timedelta():
-                noop = self.get_noop(
-                    interval_start=next_timestamp,
-                    der_intervalframe=der_intervalframe,
-                )
-                der_intervalframe.append_operation(noop)
-                next_timestamp += interval_duration
-
-            if not interval_duration:
-                # if the interval duration is 0, return a no-op
-                operation = self.get_noop(
-                    interval_start=interval_start,
-                    der_intervalframe=der_intervalframe,
-                )
-            else:
-                # otherwise get the next DER operation
-                operation = self.operate_der(
-                    interval_start=interval_start,
-                    interval_load=row.kw,
+        time_grid, missing = self.get_time_grid(intervalframe)
+        kw = intervalframe.dataframe.kw
+        interval_loads = (
+            kw[~kw.index.duplicated()].reindex(time_grid).to_numpy()
+        )
+        strategy_arrays = self.der_strategy.compile(time_grid)
+
+        # gaps and intervals with a duration of 0 are no-ops
+        noops = missing | (not interval_duration)
+        for i in np.flatnonzero(~noops):
+            der_intervalframe.append_operation(
+                self.operate_der(
+                    interval_start=time_grid[i],
+                    interval_load=interval_loads[i],
                     duration=interval_duration,
                     der_intervalframe=der_intervalframe,
+                    **{k: v[i] for k, v in strategy_arrays.items()}
                 )
-
-            der_intervalframe.append_operation(operation)
+            )
 
         der_intervalframe.commit_operations()
+        if noops.any():
+            self.fill_noops(der_intervalframe, time_grid, noops)
         pre_der_intervalframe = self.get_pre_der_intervalframe(intervalframe)
         return DERProduct(
             der=self.der,
@@ -394,6 +556,217 @@ class DERSimulationSequenceBuilder(DERSimulationBuilder):
         )
 
 
+def pack_intervalframe(intervalframe: Any) -> tuple:
+    """
+    Pack a ValidationIntervalFrame (or EnergyContainer) into a tuple of numpy
+    arrays, which is much cheaper to send between processes than a pickled
+    pandas DataFrame. Other objects are passed through as-is.
+
+    :param intervalframe: ValidationIntervalFrame, EnergyContainer or object
+    :return: tuple
+    """
+    if isinstance(intervalframe, EnergyContainer):
+        return (
+            EnergyContainer,
+            pack_intervalframe(intervalframe.kw),
+            pack_intervalframe(intervalframe.gas),
+        )
+    elif isinstance(intervalframe, ValidationIntervalFrame):
+        dataframe = intervalframe.dataframe
+        return (
+            intervalframe.__class__,
+            dataframe.index.asi8,
+            dataframe.index.name,
+            {k: v.to_numpy() for k, v in dataframe.items()},
+        )
+    else:
+        return (None, intervalframe)
+
+
+def unpack_intervalframe(packed_intervalframe: tuple) -> Any:
+    """
+    Inverse of pack_intervalframe().
+
+    :param packed_intervalframe: tuple
+    :return: ValidationIntervalFrame, EnergyContainer or object
+    """
+    frame_class = packed_intervalframe[0]
+    if frame_class is None:
+        return packed_intervalframe[1]
+    elif frame_class is EnergyContainer:
+        return EnergyContainer(
+            kw=unpack_intervalframe(packed_intervalframe[1]),
+            gas=unpack_intervalframe(packed_intervalframe[2]),
+        )
+    else:
+        _, index, index_name, columns = packed_intervalframe
+        dataframe = pd.DataFrame(
+            columns, index=pd.DatetimeIndex(index, name=index_name)
+        )
+        if dataframe.empty:
+            return frame_class()
+        return frame_class(dataframe=dataframe)
+
+
+# builder shipped to each worker process once by DERSimulationExecutor
+_worker_builder = None
+
+
+def _initialize_simulation_worker(builder: DERSimulationBuilder) -> None:
+    global _worker_builder
+    _worker_builder = builder
+
+
+def _run_simulation_worker(packed_intervalframe: tuple) -> tuple:
+    """
+    Run a single simulation with the worker's builder and return the packed
+    pre-DER, DER and post-DER intervalframes.
+    """
+    der_product = _worker_builder.run_simulation(
+        intervalframe=unpack_intervalframe(packed_intervalframe)
+    )
+    return (
+        pack_intervalframe(der_product.pre_der_intervalframe),
+        pack_intervalframe(der_product.der_intervalframe),
+        pack_intervalframe(der_product.post_der_intervalframe),
+    )
+
+
+class DERSimulationExecutor:
+    """
+    A long-lived process pool for running many simulations with a single
+    DERSimulationBuilder. The builder is sent to each worker process once when
+    the pool starts, intervalframes are dispatched in chunks as packed numpy
+    arrays and results are returned the same way.
+
+    Use get_simulation_executor() to share an executor between calls.
+    """
+
+    def __init__(
+        self,
+        builder: DERSimulationBuilder,
+        processes: int = None,
+        chunksize: int = None,
+    ):
+        """
+        :param builder: DERSimulationBuilder
+        :param processes: number of worker processes (default: cpu count)
+        :param chunksize: intervalframes per task (default: split work into
+            roughly four chunks per process)
+        """
+        self.builder = builder
+        self.fingerprint = builder.fingerprint
+        self.processes = processes or cpu_count()
+        self.chunksize = chunksize
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def pool(self) -> Pool:
+        if self._pool is None:
+            self._pool = Pool(
+                processes=self.processes,
+                initializer=_initialize_simulation_worker,
+                initargs=(self.builder,),
+            )
+        return self._pool
+
+    def get_chunksize(self, count: int) -> int:
+        """
+        Return the number of intervalframes to send per task.
+        """
+        if self.chunksize:
+            return self.chunksize
+        return max(1, ceil(count / (self.processes * 4)))
+
+    def run_simulations(self, intervalframes: list) -> list:
+        """
+        Run a simulation on each intervalframe and return DERProducts in the
+        same order.
+
+        :param intervalframes: list of ValidationIntervalFrames
+        :return: list of DERProducts
+        """
+        results = self.pool.map(
+            _run_simulation_worker,
+            [pack_intervalframe(x) for x in intervalframes],
+            chunksize=self.get_chunksize(len(intervalframes)),
+        )
+
+        return [
+            DERProduct(
+                der=self.builder.der,
+                der_strategy=self.builder.der_strategy,
+                pre_der_intervalframe=unpack_intervalframe(pre),
+                der_intervalframe=unpack_intervalframe(der),
+                post_der_intervalframe=unpack_intervalframe(post),
+            )
+            for (pre, der, post) in results
+        ]
+
+    def close(self) -> None:
+        """
+        Shut down worker processes.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+_simulation_executor = None
+
+
+def get_simulation_executor(
+    builder: DERSimulationBuilder, processes: int = None, chunksize: int = None
+) -> DERSimulationExecutor:
+    """
+    Return the process-wide DERSimulationExecutor for builder. The running
+    executor is reused as long as the builder's fingerprint and settings are
+    unchanged, otherwise it is closed and replaced. The executor is shut down
+    when the interpreter exits, see close_simulation_executor().
+
+    :param builder: DERSimulationBuilder
+    :param processes: number of worker processes (default: cpu count)
+    :param chunksize: intervalframes per task
+    :return: DERSimulationExecutor
+    """
+    global _simulation_executor
+
+    executor = _simulation_executor
+    if (
+        executor is None
+        or executor.fingerprint != builder.fingerprint
+        or executor.processes != (processes or cpu_count())
+        or executor.chunksize != chunksize
+    ):
+        if executor is not None:
+            executor.close()
+        executor = DERSimulationExecutor(
+            builder=builder, processes=processes, chunksize=chunksize
+        )
+        _simulation_executor = executor
+
+    return executor
+
+
+@atexit.register
+def close_simulation_executor() -> None:
+    """
+    Shut down the process-wide DERSimulationExecutor, if any.
+    """
+    global _simulation_executor
+
+    if _simulation_executor is not None:
+        _simulation_executor.close()
+        _simulation_executor = None
+
+
 @attr.s(frozen=True)
 class DERSimulationDirector:
     """
@@ -422,6 +795,7 @@ class DERSimulationDirector:
         start: datetime = pd.Timestamp.min,
         end_limit: datetime = pd.Timestamp.max,
         multiprocess: bool = False,
+        executor: DERSimulationExecutor = None,
     ) -> AggregateDERProduct:
         """
         Create a single AggregateDERProduct from many ValidationIntervalFrames.
@@ -430,7 +804,10 @@ class DERSimulationDirector:
             pairs
         :param start: simulation starting time
         :param end_limit: simulation end limit time
-        :param multiprocess: True to multiprocess
+        :param multiprocess: True to multiprocess using the shared
+            DERSimulationExecutor
+        :param executor: DERSimulationExecutor to run simulations with
+            (overrides multiprocess)
         """
 
         intervalframe_ids = list(intervalframe_dict.keys())
@@ -439,11 +816,11 @@ class DERSimulationDirector:
             for x in intervalframe_dict.values()
         ]
 
-        if multiprocess:
-            with Pool() as pool:
-                der_simulations = pool.starmap(
-                    self.builder.run_simulation, zip(intervalframes)
-                )
+        if multiprocess and executor is None:
+            executor = get_simulation_executor(builder=self.builder)
+
+        if executor is not None:
+            der_simulations = executor.run_simulations(intervalframes)
         else:
             der_simulations = []
             for intervalframe in intervalframes:
@@ -140,8 +140,24 @@ class EVSEStrategy(DERStrategy):
         """
         return self.drive_schedule.dataframe.sum().median()
 
+    def compile_time_grid(self, time_grid: pd.DatetimeIndex) -> dict:
+        """
+        Return charge thresholds and miles driven per EV at each interval of
+        time_grid.
+        """
+        return {
+            "charge_threshold": self.charge_schedule.get_calendar_values(
+                time_grid
+            ),
+            "drive_miles": self.drive_schedule.get_calendar_values(time_grid),
+        }
+
     def get_target_power(
-        self, month: int, hour: int, meter_reading: float
+        self,
+        month: int,
+        hour: int,
+        meter_reading: float,
+        charge_threshold: float = None,
     ) -> float:
         """
         Return the upper limit for a battery operation based on this strategy.
@@ -152,7 +168,8 @@ class EVSEStrategy(DERStrategy):
         Note: Power level is rounded to nearest kw to increase hits in
         generate_battery_operations()'s lru_cache.
         """
-        charge_threshold = self.charge_schedule.dataframe[month][hour]
+        if charge_threshold is None:
+            charge_threshold = self.charge_schedule.dataframe[month][hour]
 
         # get upper limit from strategy
         if meter_reading < charge_threshold:  # charge battery
@@ -192,6 +209,8 @@ class EVSESimulationBuilder(DERSimulationSequenceBuilder):
     der = attr.ib(type=EVSE)
     der_strategy = attr.ib(type=EVSEStrategy)
 
+    noop_state_columns = ("charge",)
+
     def get_der_intervalframe(self) -> DataFrameQueue:
         return EVSEIntervalFrame()
 
@@ -236,6 +255,7 @@ class EVSESimulationBuilder(DERSimulationSequenceBuilder):
         meter_reading: float,
         duration: timedelta,
         current_charge: float,
+        charge_threshold: float = None,
     ) -> float:
         """
         Return the power level for next battery operation. This is the minimum
@@ -249,7 +269,10 @@ class EVSESimulationBuilder(DERSimulationSequenceBuilder):
                 ev_total_capacity=self.ev_total_capacity,
             ),
             self.der_strategy.get_target_power(
-                month=month, hour=hour, meter_reading=meter_reading
+                month=month,
+                hour=hour,
+                meter_reading=meter_reading,
+                charge_threshold=charge_threshold,
             ),
         )
 
@@ -264,16 +287,23 @@ class EVSESimulationBuilder(DERSimulationSequenceBuilder):
             return power
 
     def get_drive_distance(
-        self, month: int, hour: int, duration: timedelta
+        self,
+        month: int,
+        hour: int,
+        duration: timedelta,
+        drive_miles: float = None,
     ) -> float:
         """
         Return total miles driven at a given month-hour over a duration based
         on the strategy's drive miles and number of EVs.
         """
+        if drive_miles is None:
+            drive_miles = self.der_strategy.drive_schedule.dataframe[month][
+                hour
+            ]
+
         distance = (
-            self.der_strategy.drive_schedule.dataframe[month][hour]
-            * self.der.ev_count
-            * (duration / timedelta(hours=1))
+            drive_miles * self.der.ev_count * (duration / timedelta(hours=1))
         )
 
         if distance < 0:
@@ -336,6 +366,8 @@ class EVSESimulationBuilder(DERSimulationSequenceBuilder):
         interval_start: datetime,
         interval_load: float,
         duration: timedelta,
+        charge_threshold: float = None,
+        drive_miles: float = None,
     ) -> OrderedDict:
         """
         Generate EVSE operation based off of EVSE state. EVSE state is an
@@ -358,7 +390,10 @@ class EVSESimulationBuilder(DERSimulationSequenceBuilder):
 
         # miles driven by all EVs during duration
         distance = self.get_drive_distance(
-            month=month, hour=hour, duration=duration
+            month=month,
+            hour=hour,
+            duration=duration,
+            drive_miles=drive_miles,
         )
         # power level to charge EV batteries
         kw = self.get_target_power(
@@ -367,6 +402,7 @@ class EVSESimulationBuilder(DERSimulationSequenceBuilder):
             meter_reading=interval_load,
             duration=duration,
             current_charge=latest_charge,
+            charge_threshold=charge_threshold,
         )
         # kw to drive EV
         ev_kw = self.get_ev_kw(
@@ -1,6 +1,9 @@
 import attr
 from cached_property import cached_property
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
+from typing import Iterator, List, Tuple
 
 from navigader_core.der.builder import (
     DER,
@@ -39,6 +42,25 @@ class FuelSwitching(DER):
         renamed = gas_frame.dataframe.rename(columns={"therms": "kwh"})
         return renamed * KWH_PER_THERM / HEAT_PUMP_COEFFICIENT_OF_PERFORMANCE
 
+    @property
+    def gas_types(self) -> List[str]:
+        """
+        Gas-type curves included by the configuration, i.e. "space_heating"
+        and/or "water_heating".
+        """
+        gas_types = [
+            gas_type
+            for gas_type in ("space_heating", "water_heating")
+            if getattr(self, gas_type)
+        ]
+        if not gas_types:
+            raise Exception(
+                "FuelSwitching configuration must have one or both of "
+                "`space_heating` and `water_heating` attributes set to `True`"
+            )
+
+        return gas_types
+
     def combine_customer_kwh_curves(self, dataframe: pd.DataFrame):
         """
         Combines the customer's 8760 kWh curves into a single curve, using the
@@ -46,17 +68,7 @@ class FuelSwitching(DER):
 
         :param dataframe: the customer's kWh hourly curves
         """
-        if self.space_heating and self.water_heating:
-            kwh = dataframe.space_heating + dataframe.water_heating
-        elif self.space_heating:
-            kwh = dataframe.space_heating
-        elif self.water_heating:
-            kwh = dataframe.water_heating
-        else:
-            raise Exception(
-                "FuelSwitching configuration must have one or both of "
-                "`space_heating` and `water_heating` attributes set to `True`"
-            )
+        kwh = sum(dataframe[gas_type] for gas_type in self.gas_types)
 
         kwh.name = "kw"
         return kwh.to_frame()
@@ -91,12 +103,11 @@ class FuelSwitchingStrategy(DERStrategy):
           - "water_heating": the total gas used for water heating on each day
         """
         gas_df = self.tmy3_file.gas_dataframe
-        totals = [
-            gas_df[gas_df.index.dayofyear == timestamp.dayofyear].sum()
-            for timestamp in self.date_index
-        ]
+        totals = gas_df.groupby(gas_df.index.dayofyear).sum()
 
-        return pd.DataFrame(totals, index=self.date_index)
+        day_totals = totals.reindex(self.date_index.dayofyear, fill_value=0)
+        day_totals.index = self.date_index
+        return day_totals
 
     def get_day_totals(self, timestamp: pd.Timestamp):
         """
@@ -115,27 +126,16 @@ class FuelSwitchingStrategy(DERStrategy):
         exception is when no gas is used during a given day for space- or water-
         heating, in which case both columns are set to 0.
         """
-        percentages = []
-
-        for timestamp in self.date_index:
-            day_totals = self.get_day_totals(timestamp)
-            total_gas = day_totals.space_heating + day_totals.water_heating
+        day_totals = self.day_totals
+        total_gas = day_totals.space_heating + day_totals.water_heating
 
-            if total_gas == 0:
-                percent_space_heating = 0
-                percent_water_heating = 0
-            else:
-                percent_space_heating = day_totals.space_heating / total_gas
-                percent_water_heating = day_totals.water_heating / total_gas
-
-            percentages.append((percent_space_heating, percent_water_heating))
-
-        return pd.DataFrame(
-            percentages,
-            index=self.date_index,
-            columns=("space_heating", "water_heating"),
+        # set both percentages to 0 on days without space- or water-heating
+        percentages = day_totals[["space_heating", "water_heating"]].div(
+            total_gas.where(total_gas != 0), axis=0
         )
 
+        return percentages.fillna(0)
+
     def gas_type_percentages(self, intervalframe: GasIntervalFrame):
         """
         Returns the gas_type_percentages dataframe aligned to an intervalframe's
@@ -153,27 +153,48 @@ class FuelSwitchingStrategy(DERStrategy):
             2. Divide all hourly values by the sums
         """
         gas_df = self.tmy3_file.gas_dataframe.copy()
-
-        def divide_if_not_zero(mask, column: str, sums):
-            """
-            Handles dividing the gas dataframe by a daily sum value if the value
-            is non-zero, and sets the the dataframe to 0 if the sum is 0.
-            """
-            sum_for_column = getattr(sums, column)
-            if sum_for_column == 0:
-                gas_df.loc[mask, column] = 0
-            else:
-                gas_df.loc[mask, column] /= sum_for_column
-
-        for timestamp in self.date_index:
-            day_mask = gas_df.index.dayofyear == timestamp.dayofyear
-            day_sum = self.get_day_totals(timestamp)
-            divide_if_not_zero(day_mask, "total", day_sum)
-            divide_if_not_zero(day_mask, "space_heating", day_sum)
-            divide_if_not_zero(day_mask, "water_heating", day_sum)
+        columns = ["total", "space_heating", "water_heating"]
+
+        # broadcast each day's sums to that day's intervals, dividing only by
+        # non-zero sums and setting intervals with a zero sum to 0
+        day_sums = (
+            gas_df[columns]
+            .groupby(gas_df.index.dayofyear)
+            .transform("sum")
+            .to_numpy()
+        )
+        values = gas_df[columns].to_numpy(dtype=float)
+        gas_df[columns] = np.divide(
+            values,
+            day_sums,
+            out=np.zeros_like(values),
+            where=(day_sums != 0),
+        )
 
         return gas_df
 
+    def get_year_profile(self, year: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Returns copies of the normalized TMY3 curves and gas-type percentages
+        aligned to a year. Profiles are memoized per year so that all gas
+        meters in a climate zone and year share a single profile.
+
+        :param year: year to align profiles to
+        :return: (normalized TMY3 dataframe, gas-type percentages dataframe)
+        """
+        year_profiles = self.__dict__.setdefault("_year_profiles", {})
+        if year not in year_profiles:
+            year_profiles[year] = (
+                set_dataframe_year(
+                    self._normalized_tmy3, year, in_place=False
+                ),
+                set_dataframe_year(
+                    self._gas_type_percentages, year, in_place=False
+                ),
+            )
+
+        return year_profiles[year]
+
     def normalized_tmy3(self, intervalframe: GasIntervalFrame):
         """
         Returns the normalized_curves dataframe aligned to an intervalframe's
@@ -222,6 +243,70 @@ class FuelSwitchingSimulationBuilder(DERSimulationBuilder):
             post_der_intervalframe=intervalframe.kw + der_intervalframe,
         )
 
+    def run_batch_simulations(
+        self, intervalframe_dict: dict
+    ) -> Iterator[Tuple[object, float, float, PowerIntervalFrame]]:
+        """
+        Lazily yield (id, pre-DER total, post-DER total, DER intervalframe)
+        for many EnergyContainers without running run_simulation() per
+        container. Gas meters are grouped by year, each group sharing one
+        normalized TMY3 profile, and all of a group's DER intervalframes are
+        computed at once from a meters x days matrix of kWh equivalents.
+
+        :param intervalframe_dict: dict with {id: EnergyContainer} pairs
+        """
+        gas_types = self.der.gas_types
+        keys_by_year = OrderedDict()
+        for key, energy_container in intervalframe_dict.items():
+            year = energy_container.gas.year_mode
+            keys_by_year.setdefault(year, []).append(key)
+
+        for year, keys in keys_by_year.items():
+            tmy3_normalized, percentages = self.der_strategy.get_year_profile(
+                year
+            )
+            tmy3_days = tmy3_normalized.index.dayofyear - 1
+
+            # meters x days-of-year matrix of daily kWh equivalents, only
+            # including days found in the gas-type percentages
+            customer_kwh_daily = np.full((len(keys), 366), np.nan)
+            for i, key in enumerate(keys):
+                therms = intervalframe_dict[key].gas.dataframe.therms
+                therms = therms[therms.index.isin(percentages.index)]
+                days = therms.index.dayofyear - 1
+                customer_kwh_daily[i, days] = therms.to_numpy()
+            customer_kwh_daily *= (
+                KWH_PER_THERM / HEAT_PUMP_COEFFICIENT_OF_PERFORMANCE
+            )
+
+            der_values = 0
+            for gas_type in gas_types:
+                gas_type_percentages = np.full(366, np.nan)
+                gas_type_percentages[
+                    percentages.index.dayofyear - 1
+                ] = percentages[gas_type]
+                customer_kwh_by_gas_type = (
+                    customer_kwh_daily * gas_type_percentages
+                )
+                der_values = der_values + (
+                    tmy3_normalized[gas_type].to_numpy()
+                    * customer_kwh_by_gas_type[:, tmy3_days]
+                )
+
+            for i, key in enumerate(keys):
+                kw_intervalframe = intervalframe_dict[key].kw
+                der_intervalframe = PowerIntervalFrame(
+                    pd.DataFrame(
+                        {"kw": der_values[i]}, index=tmy3_normalized.index
+                    )
+                )
+                yield (
+                    key,
+                    kw_intervalframe.total,
+                    (kw_intervalframe + der_intervalframe).total,
+                    der_intervalframe,
+                )
+
     def convert_customer_therms_to_kwh(self, gas_frame: GasIntervalFrame):
         """
         Returns a customer's gas usage data converted to its kWh equivalents
@@ -248,15 +333,19 @@ class FuelSwitchingSimulationBuilder(DERSimulationBuilder):
         Returns the customer's 8760 kWh curves broken down by gas type, given
         the normalized TMY3 data and the customer's daily kWh equivalents.
         Multiply hourly normalized gas curves by daily kWh equivalents by
-        appending an index to the curves equal to the day of the year, setting
-        the kWh equivalents index to its day of the year, multiply using those
-        indices and then drop the appended index and irrelevant columns
+        broadcasting the kWh equivalents to the curves' intervals by day of the
+        year and dropping irrelevant columns
         """
-        tmy3_daily_index = tmy3_normalized.index.dayofyear
-        tmy3_n = tmy3_normalized.set_index(tmy3_daily_index, append=True)
+        columns = ["space_heating", "water_heating"]
+        customer_kwh_daily = customer_kwh_daily.copy()
         customer_kwh_daily.index = customer_kwh_daily.index.dayofyear
-        return (
-            tmy3_n.mul(customer_kwh_daily, level=1)
-            .reset_index(drop=True, level=1)
-            .filter(items=("space_heating", "water_heating"))
+        customer_kwh_daily = customer_kwh_daily.reindex(
+            tmy3_normalized.index.dayofyear
+        )
+
+        return pd.DataFrame(
+            tmy3_normalized[columns].to_numpy()
+            * customer_kwh_daily[columns].to_numpy(),
+            index=tmy3_normalized.index,
+            columns=columns,
         )
@@ -1,7 +1,9 @@
+from collections import OrderedDict
 from datetime import timedelta
+from functools import partial
 from itertools import repeat
-from math import ceil
-from multiprocessing import Pool
+from math import ceil, sqrt
+from multiprocessing import Pool, cpu_count
 import numpy as np
 from typing import List
 
@@ -14,6 +16,11 @@ from navigader_core.load.dataframe import get_unique_values
 from navigader_core.load.intervalframe import ValidationFrame288
 
 
+# number of optimized peak shaving schedules to keep in memory
+OPTIMIZED_SCHEDULE_CACHE_SIZE = 128
+_optimized_schedule_cache = OrderedDict()
+
+
 def create_fixed_schedule(month_matrix: List[float]) -> ValidationFrame288:
     """
     Creates a 288 schedule in which each month has the same schedule
@@ -128,6 +135,31 @@ class PeakShavingScheduleOptimizer(object):
     at what power thresholds in order to maximally shave peak load.
     """
 
+    @classmethod
+    def _get_month_intervalframe(
+        cls, load_intervalframe, month, warmup=timedelta(0)
+    ):
+        """
+        Return load_intervalframe sliced to a single month along with the
+        warmup period leading into each occurrence of that month, which lets
+        a simulation build up an initial charge before the month begins.
+
+        :param load_intervalframe: PowerIntervalFrame
+        :param month: integer
+        :param warmup: timedelta
+        :return: PowerIntervalFrame
+        """
+        dataframe = load_intervalframe.dataframe
+        in_month = dataframe.index.month == month
+
+        if warmup > timedelta(0):
+            month_periods = dataframe.index[in_month].to_period("M").unique()
+            warmup_periods = (dataframe.index + warmup).to_period("M")
+            in_warmup = warmup_periods.isin(month_periods) & ~in_month
+            in_month = in_month | in_warmup
+
+        return load_intervalframe.__class__(dataframe=dataframe[in_month])
+
     @classmethod
     def _get_peak_power(
         cls,
@@ -136,6 +168,7 @@ class PeakShavingScheduleOptimizer(object):
         month,
         charge_threshold,
         discharge_threshold,
+        warmup=timedelta(0),
     ):
         """
         Simulate battery operations on a single month and return resulting peak
@@ -148,9 +181,12 @@ class PeakShavingScheduleOptimizer(object):
         :param month: integer
         :param charge_threshold: integer
         :param discharge_threshold: integer
+        :param warmup: time to simulate before the month begins
         :return: (discharge threshold, resulting peak load)
         """
-        load_intervalframe = load_intervalframe.filter_by_months({month})
+        load_intervalframe = cls._get_month_intervalframe(
+            load_intervalframe, month, warmup
+        )
 
         der_strategy = BatteryStrategy(
             charge_schedule=ValidationFrame288.convert_matrix_to_frame288(
@@ -185,6 +221,7 @@ class PeakShavingScheduleOptimizer(object):
         charge_threshold,
         number_of_checks=None,
         multiprocess=False,
+        warmup=timedelta(0),
     ):
         """
         Based on a given month and given charge threshold, find best discharge
@@ -196,9 +233,12 @@ class PeakShavingScheduleOptimizer(object):
         :param charge_threshold: fixed level to charge below (int)
         :param number_of_checks: number of discharge thresholds to try (int)
         :param multiprocess: True to multiprocess
+        :param warmup: time to simulate before the month begins
         :return: (discharge threshold, peak load)
         """
-        intervalframe = load_intervalframe.filter_by_months({month})
+        intervalframe = cls._get_month_intervalframe(
+            load_intervalframe, month, warmup
+        )
         max_load = intervalframe.maximum_frame288.dataframe[month].max()
 
         # OPTIMIZE: Can fewer thresholds be checked?
@@ -220,6 +260,7 @@ class PeakShavingScheduleOptimizer(object):
                         repeat(month),
                         repeat(charge_threshold),
                         discharge_thresholds,
+                        repeat(warmup),
                     ),
                 )
         else:
@@ -232,6 +273,7 @@ class PeakShavingScheduleOptimizer(object):
                         month,
                         charge_threshold,
                         discharge_threshold,
+                        warmup,
                     )
                 )
 
@@ -247,132 +289,368 @@ class PeakShavingScheduleOptimizer(object):
         )
 
     @classmethod
-    def optimize_schedules_with_exports(
-        cls, battery, load_intervalframe, multiprocess=False
+    def _search_discharge_threshold(
+        cls,
+        battery,
+        load_intervalframe,
+        month,
+        charge_threshold,
+        tolerance=4,
+        warmup=timedelta(0),
     ):
         """
-        Creates optimal monthly charge and discharge schedules to shave peak
-        loads based on charging using meter energy exports only.
+        Based on a given month and given charge threshold, find best discharge
+        threshold for peak shaving using a golden-section search.
+
+        Lowering the discharge threshold lowers the resulting peak load until
+        the battery no longer has enough energy to hold the threshold, after
+        which the resulting peak load rises again. The search narrows in on
+        the bottom of that curve over the same 1kw threshold increments as
+        _optimize_discharge_threshold() until the remaining interval is no
+        wider than tolerance, then checks every threshold left in the
+        interval. The resulting peak load is not guaranteed to be unimodal, so
+        the best of every threshold simulated along the way, including both
+        ends of the initial interval, is returned. Only the given month is
+        simulated.
 
         :param battery: Battery
         :param load_intervalframe: PowerIntervalFrame
-        :param multiprocess: True to multiprocess
-        :return: (charge schedule, discharge schedule)
-            (ValidationFrame288, ValidationFrame288)
+        :param month: integer
+        :param charge_threshold: fixed level to charge below (int)
+        :param tolerance: kw width at which to stop searching (int)
+        :param warmup: time to simulate before the month begins
+        :return: (discharge threshold, peak load)
         """
-        # run optimization on smaller dataset for speed
-        load_intervalframe = load_intervalframe.downsample_intervalframe(
-            timedelta(hours=1), np.mean
+        if tolerance < 1:
+            raise ValueError("tolerance must be 1 or greater.")
+
+        intervalframe = cls._get_month_intervalframe(
+            load_intervalframe, month, warmup
         )
+        max_load = intervalframe.maximum_frame288.dataframe[month].max()
+
+        results = {}
+
+        def get_peak_power(discharge_threshold):
+            if discharge_threshold not in results:
+                _, results[discharge_threshold] = cls._get_peak_power(
+                    battery,
+                    intervalframe,
+                    month,
+                    charge_threshold,
+                    discharge_threshold,
+                    warmup,
+                )
+            return results[discharge_threshold]
+
+        # same discharge thresholds as _optimize_discharge_threshold()
+        lower = int(max_load - max(int(battery.rating), 1))
+        upper = int(max_load - 1)
+        ratio = (sqrt(5) - 1) / 2
+
+        # endpoints are never probed by the search itself
+        get_peak_power(lower)
+        get_peak_power(upper)
+
+        while upper - lower > tolerance:
+            left = upper - round(ratio * (upper - lower))
+            right = lower + round(ratio * (upper - lower))
+            if left >= right:
+                break
+            if get_peak_power(left) < get_peak_power(right):
+                upper = right
+            else:
+                lower = left
+
+        for discharge_threshold in range(lower, upper + 1):
+            get_peak_power(discharge_threshold)
 
-        results = {"charge_threshold": {}, "discharge_threshold": {}}
-        for month in set(load_intervalframe.dataframe.index.month):
-            results["charge_threshold"][month] = 0
-            (
-                results["discharge_threshold"][month],
-                _,
-            ) = cls._optimize_discharge_threshold(
+        # return highest threshold with lowest resulting peak
+        return min(results.items(), key=lambda x: (x[1], -x[0]))
+
+    @classmethod
+    def _find_discharge_threshold(
+        cls,
+        battery,
+        load_intervalframe,
+        month,
+        charge_threshold,
+        tolerance=4,
+        multiprocess=False,
+        warmup=timedelta(0),
+    ):
+        """
+        Find best discharge threshold using _search_discharge_threshold() or,
+        when tolerance is None, brute force _optimize_discharge_threshold().
+
+        :return: (discharge threshold, peak load)
+        """
+        if tolerance is None:
+            return cls._optimize_discharge_threshold(
                 battery=battery,
                 load_intervalframe=load_intervalframe,
                 month=month,
-                charge_threshold=0,
+                charge_threshold=charge_threshold,
                 multiprocess=multiprocess,
+                warmup=warmup,
+            )
+        else:
+            return cls._search_discharge_threshold(
+                battery=battery,
+                load_intervalframe=load_intervalframe,
+                month=month,
+                charge_threshold=charge_threshold,
+                tolerance=tolerance,
+                warmup=warmup,
             )
 
-        return (
-            ValidationFrame288.convert_matrix_to_frame288(
-                [
-                    [results["charge_threshold"].get(month, 0)] * 24
-                    for month in range(1, 13)
-                ]
-            ),
-            ValidationFrame288.convert_matrix_to_frame288(
-                [
-                    [results["discharge_threshold"].get(month, 0)] * 24
-                    for month in range(1, 13)
-                ]
-            ),
+    @classmethod
+    def _optimize_month_with_exports(
+        cls,
+        battery,
+        load_intervalframe,
+        month,
+        tolerance=4,
+        warmup=timedelta(0),
+        multiprocess=False,
+        verbose=False,
+    ):
+        """
+        Return the charge and discharge thresholds that shave the peak load of
+        a single month charging on meter energy exports only.
+
+        :return: (charge threshold, discharge threshold)
+        """
+        discharge_threshold, _ = cls._find_discharge_threshold(
+            battery=battery,
+            load_intervalframe=load_intervalframe,
+            month=month,
+            charge_threshold=0,
+            tolerance=tolerance,
+            multiprocess=multiprocess,
+            warmup=warmup,
         )
 
+        return (0, discharge_threshold)
+
     @classmethod
-    def optimize_schedules_with_grid(
-        cls, battery, load_intervalframe, multiprocess=False, verbose=False
+    def _optimize_month_with_grid(
+        cls,
+        battery,
+        load_intervalframe,
+        month,
+        tolerance=4,
+        warmup=timedelta(0),
+        multiprocess=False,
+        verbose=False,
     ):
         """
-        Creates optimal monthly charge and discharge schedules to shave peak
-        loads based on charging using energy exports and grid energy.
+        Return the charge and discharge thresholds that shave the peak load of
+        a single month charging on energy exports and grid energy.
+
+        :return: (charge threshold, discharge threshold)
+        """
+        if verbose:
+            print("Month: {}".format(month))
+        month_intervalframe = load_intervalframe.filter_by_months({month})
+        peak_load = np.max(month_intervalframe.dataframe).kw
+
+        # OPTIMIZE: Is there a bettery starting list of charge thresholds?
+        # create list of charge thresholds to simulate
+        increment = ceil(min(peak_load, battery.rating) / 5)
+        if peak_load < battery.rating:
+            charge_thresholds = range(1, int(peak_load), increment)
+        else:
+            charge_thresholds = range(
+                max(1, int(peak_load - battery.rating)),
+                int(peak_load),
+                increment,
+            )
+
+        result = (0, 0)
+        lowest_peak = float("inf")
+        for charge_threshold in charge_thresholds:
+            discharge_threshold, peak = cls._find_discharge_threshold(
+                battery=battery,
+                load_intervalframe=load_intervalframe,
+                month=month,
+                charge_threshold=charge_threshold,
+                tolerance=tolerance,
+                multiprocess=multiprocess,
+                warmup=warmup,
+            )
+            if verbose:
+                print(
+                    "Charge Threshold: {}, Discharge Threshold: {}, "
+                    "Net Load: {}, Peak Load: {}".format(
+                        charge_threshold, discharge_threshold, peak, peak_load
+                    )
+                )
+
+            if peak < lowest_peak:
+                result = (charge_threshold, discharge_threshold)
+                lowest_peak = peak
+            elif peak == peak_load:
+                continue
+            else:
+                break
+
+        return result
 
+    @classmethod
+    def _optimize_months(
+        cls,
+        month_optimizer,
+        battery,
+        load_intervalframe,
+        multiprocess=False,
+        verbose=False,
+        tolerance=4,
+        warmup=timedelta(0),
+    ):
+        """
+        Run month_optimizer on each month of load_intervalframe and return the
+        resulting charge and discharge schedules. Each month is optimized
+        against its own slice of load_intervalframe (plus warmup). Optimized
+        schedules are cached per load_intervalframe and optimization
+        parameters.
+
+        :param month_optimizer: _optimize_month_with_exports or
+            _optimize_month_with_grid
         :param battery: Battery
         :param load_intervalframe: PowerIntervalFrame
-        :param multiprocess: True to multiprocess
+        :param multiprocess: True to optimize months in parallel
         :param verbose: if True, print optimization steps
+        :param tolerance: discharge threshold search tolerance in kw, None to
+            brute force discharge thresholds at 1kw increments
+        :param warmup: time to simulate before each month begins
         :return: (charge schedule, discharge schedule)
             (ValidationFrame288, ValidationFrame288)
         """
+        cache_key = (
+            month_optimizer.__name__,
+            hash(load_intervalframe),
+            battery,
+            tolerance,
+            warmup,
+        )
+        if cache_key in _optimized_schedule_cache:
+            _optimized_schedule_cache.move_to_end(cache_key)
+            return _optimized_schedule_cache[cache_key]
+
         # run optimization on smaller dataset for speed
         load_intervalframe = load_intervalframe.downsample_intervalframe(
             timedelta(hours=1), np.mean
         )
+        months = sorted(set(load_intervalframe.dataframe.index.month))
+        month_intervalframes = [
+            cls._get_month_intervalframe(load_intervalframe, month, warmup)
+            for month in months
+        ]
+        optimize_month = partial(
+            month_optimizer,
+            battery,
+            tolerance=tolerance,
+            warmup=warmup,
+            verbose=verbose,
+        )
 
-        results = {"charge_threshold": {}, "discharge_threshold": {}}
-        for month in set(load_intervalframe.dataframe.index.month):
-            if verbose:
-                print("Month: {}".format(month))
-            month_intervalframe = load_intervalframe.filter_by_months({month})
-            peak_load = np.max(month_intervalframe.dataframe).kw
-
-            # OPTIMIZE: Is there a bettery starting list of charge thresholds?
-            # create list of charge thresholds to simulate
-            increment = ceil(min(peak_load, battery.rating) / 5)
-            if peak_load < battery.rating:
-                charge_thresholds = range(1, int(peak_load), increment)
-            else:
-                charge_thresholds = range(
-                    max(1, int(peak_load - battery.rating)),
-                    int(peak_load),
-                    increment,
+        if multiprocess:
+            with Pool(processes=min(len(months), cpu_count()) or 1) as pool:
+                thresholds = pool.starmap(
+                    optimize_month, zip(month_intervalframes, months)
                 )
-
-            lowest_peak = float("inf")
-            for charge_threshold in charge_thresholds:
-                discharge_threshold, peak = cls._optimize_discharge_threshold(
-                    battery=battery,
-                    load_intervalframe=load_intervalframe,
-                    month=month,
-                    charge_threshold=charge_threshold,
-                    multiprocess=multiprocess,
+        else:
+            thresholds = [
+                optimize_month(month_intervalframe, month)
+                for month_intervalframe, month in zip(
+                    month_intervalframes, months
                 )
-                if verbose:
-                    print(
-                        "Charge Threshold: {}, Discharge Threshold: {}, "
-                        "Net Load: {}, Peak Load: {}".format(
-                            charge_threshold,
-                            discharge_threshold,
-                            peak,
-                            peak_load,
-                        )
-                    )
-
-                if peak < lowest_peak:
-                    results["charge_threshold"][month] = charge_threshold
-                    results["discharge_threshold"][month] = discharge_threshold
-                    lowest_peak = peak
-                elif peak == peak_load:
-                    continue
-                else:
-                    break
+            ]
+        thresholds = dict(zip(months, thresholds))
 
-        return (
+        schedules = (
             ValidationFrame288.convert_matrix_to_frame288(
                 [
-                    [results["charge_threshold"].get(month, 0)] * 24
+                    [thresholds.get(month, (0, 0))[0]] * 24
                     for month in range(1, 13)
                 ]
             ),
             ValidationFrame288.convert_matrix_to_frame288(
                 [
-                    [results["discharge_threshold"].get(month, 0)] * 24
+                    [thresholds.get(month, (0, 0))[1]] * 24
                     for month in range(1, 13)
                 ]
             ),
         )
+
+        _optimized_schedule_cache[cache_key] = schedules
+        while len(_optimized_schedule_cache) > OPTIMIZED_SCHEDULE_CACHE_SIZE:
+            _optimized_schedule_cache.popitem(last=False)
+
+        return schedules
+
+    @classmethod
+    def optimize_schedules_with_exports(
+        cls,
+        battery,
+        load_intervalframe,
+        multiprocess=False,
+        tolerance=4,
+        warmup=timedelta(0),
+    ):
+        """
+        Creates optimal monthly charge and discharge schedules to shave peak
+        loads based on charging using meter energy exports only.
+
+        :param battery: Battery
+        :param load_intervalframe: PowerIntervalFrame
+        :param multiprocess: True to optimize months in parallel
+        :param tolerance: discharge threshold search tolerance in kw, None to
+            brute force discharge thresholds at 1kw increments
+        :param warmup: time to simulate before each month begins
+        :return: (charge schedule, discharge schedule)
+            (ValidationFrame288, ValidationFrame288)
+        """
+        return cls._optimize_months(
+            month_optimizer=cls._optimize_month_with_exports,
+            battery=battery,
+            load_intervalframe=load_intervalframe,
+            multiprocess=multiprocess,
+            tolerance=tolerance,
+            warmup=warmup,
+        )
+
+    @classmethod
+    def optimize_schedules_with_grid(
+        cls,
+        battery,
+        load_intervalframe,
+        multiprocess=False,
+        verbose=False,
+        tolerance=4,
+        warmup=timedelta(0),
+    ):
+        """
+        Creates optimal monthly charge and discharge schedules to shave peak
+        loads based on charging using energy exports and grid energy.
+
+        :param battery: Battery
+        :param load_intervalframe: PowerIntervalFrame
+        :param multiprocess: True to optimize months in parallel
+        :param verbose: if True, print optimization steps
+        :param tolerance: discharge threshold search tolerance in kw, None to
+            brute force discharge thresholds at 1kw increments
+        :param warmup: time to simulate before each month begins
+        :return: (charge schedule, discharge schedule)
+            (ValidationFrame288, ValidationFrame288)
+        """
+        return cls._optimize_months(
+            month_optimizer=cls._optimize_month_with_grid,
+            battery=battery,
+            load_intervalframe=load_intervalframe,
+            multiprocess=multiprocess,
+            verbose=verbose,
+            tolerance=tolerance,
+            warmup=warmup,
+        )
@@ -1,9 +1,15 @@
 import attr
 from cached_property import cached_property
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from functools import reduce
+import hashlib
+import json
+import numpy as np
+import os
 import pandas as pd
 import requests
+import tempfile
+from typing import Iterator, Tuple
 
 from navigader_core.load.dataframe import resample_dataframe
 from navigader_core.der.builder import (
@@ -16,6 +22,146 @@ from navigader_core.load.intervalframe import PowerIntervalFrame
 
 
 PVWATTS_URL = "https://developer.nrel.gov/api/pvwatts/v6.json"
+PVWATTS_DEFAULT_PARAMS = {"losses": 14.08, "system_capacity": 1}
+
+# per-kW solar profiles keyed on (profile_key, year, period)
+SOLAR_PROFILE_CACHE_SIZE = 256
+_solar_profile_cache = OrderedDict()
+
+
+def request_pvwatts_response(params: dict) -> dict:
+    """
+    Request PVWatts API response.
+
+    :param params: PVWatts API request params
+    :return: dict
+    """
+    return requests.get(PVWATTS_URL, params=params, timeout=7).json()
+
+
+@attr.s(frozen=True)
+class PVWattsResponseStore(object):
+    """
+    A content-addressed store of PVWatts API responses on local disk. Responses
+    are keyed by a hash of normalized request params, so equivalent requests
+    (ex. same coordinates to within rounding, 180 vs. 180.0 azimuth) share a
+    response. Files are written atomically, so a store directory can be shared
+    by many processes.
+
+    In replay mode, responses are only read from the store and a LookupError
+    is raised rather than making an API request.
+    """
+
+    directory = attr.ib(type=str)
+    replay = attr.ib(type=bool, default=False)
+
+    # decimal places used to round coordinates and numeric params
+    coordinate_precision = 3
+    numeric_precision = 2
+
+    @classmethod
+    def normalize_address(cls, address) -> str:
+        """
+        Normalize an address by case and whitespace. Addresses in the format
+        "lat, lon" are rounded to cls.coordinate_precision.
+        """
+        address = " ".join(str(address).lower().split())
+        try:
+            lat, lon = [float(x) for x in address.split(",")]
+        except ValueError:
+            return address
+
+        return "{lat:.{precision}f},{lon:.{precision}f}".format(
+            lat=lat, lon=lon, precision=cls.coordinate_precision
+        )
+
+    @classmethod
+    def normalize_params(cls, params: dict) -> dict:
+        """
+        Return PVWatts request params in a normalized form without API key.
+
+        :param params: PVWatts API request params
+        :return: dict
+        """
+        normalized_params = {}
+        for key, value in params.items():
+            if key == "api_key":
+                continue
+            elif key == "address":
+                value = cls.normalize_address(value)
+            elif isinstance(value, (int, float)):
+                value = round(float(value), cls.numeric_precision)
+            elif isinstance(value, str):
+                value = value.strip().lower()
+            normalized_params[key] = value
+
+        return normalized_params
+
+    def get_file_path(self, params: dict) -> str:
+        """
+        Return location of stored response for params.
+
+        :param params: PVWatts API request params
+        :return: file path
+        """
+        key = hashlib.sha256(
+            json.dumps(self.normalize_params(params), sort_keys=True).encode()
+        ).hexdigest()
+
+        return os.path.join(self.directory, key[:2], "{}.json".format(key))
+
+    def load(self, params: dict) -> dict:
+        """
+        Return stored response for params or None if not stored.
+
+        :param params: PVWatts API request params
+        :return: dict
+        """
+        try:
+            with open(self.get_file_path(params)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, params: dict, response: dict) -> None:
+        """
+        Store response for params.
+
+        :param params: PVWatts API request params
+        :param response: PVWatts API response
+        """
+        file_path = self.get_file_path(params)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w", dir=os.path.dirname(file_path), delete=False
+        ) as f:
+            json.dump(response, f)
+        os.replace(f.name, file_path)
+
+    def get_response(self, params: dict) -> dict:
+        """
+        Return stored response for params. If not stored, request response
+        from PVWatts API and store successful responses.
+
+        :param params: PVWatts API request params
+        :return: dict
+        """
+        response = self.load(params)
+        if response is not None:
+            return response
+
+        if self.replay:
+            raise LookupError(
+                "PVWatts response not found in {} for {}.".format(
+                    self.directory, self.normalize_params(params)
+                )
+            )
+
+        response = request_pvwatts_response(params)
+        if response.get("outputs"):
+            self.save(params, response)
+
+        return response
 
 
 @attr.s(frozen=True)
@@ -34,11 +180,15 @@ class SolarPV(DER):
     array_type = attr.ib(type=int)
     azimuth = attr.ib(type=float)
     tilt = attr.ib(type=float)
-    api_key = attr.ib(type=str, default="")
+    api_key = attr.ib(type=str, default="", eq=False)
     module_type = attr.ib(type=int, default=0)
     timeframe = attr.ib(type=str, default="hourly")
     # non-parameter: pass stored response to avoid API call
     stored_response = attr.ib(type=dict, default={}, repr=False)
+    # non-parameter: pass response store to cache API calls
+    response_store = attr.ib(
+        type=PVWattsResponseStore, default=None, repr=False, eq=False
+    )
 
     @array_type.validator
     def _validate_array_type(self, attribute, value):
@@ -79,6 +229,7 @@ class SolarPV(DER):
         """
         request_params = attr.asdict(self)
         request_params.pop("stored_response")
+        request_params.pop("response_store")
 
         return request_params
 
@@ -90,36 +241,93 @@ class SolarPV(DER):
         if self.stored_response:
             return self.stored_response
 
-        params = {"losses": 14.08, "system_capacity": 1}
+        params = dict(PVWATTS_DEFAULT_PARAMS)
         params.update(self.request_params)
-        return requests.get(PVWATTS_URL, params=params, timeout=7).json()
+        if self.response_store is not None:
+            return self.response_store.get_response(params)
+        else:
+            return request_pvwatts_response(params)
 
-    def get_annual_solar_intervalframe(
+    @cached_property
+    def profile_key(self) -> str:
+        """
+        Key identifying the production profile of self. SolarPV objects with
+        the same PVWatts output share a key regardless of other attributes.
+        """
+        return hashlib.sha256(
+            np.asarray(
+                self.pvwatts_response["outputs"]["ac"], dtype=float
+            ).tobytes()
+        ).hexdigest()
+
+    def get_annual_solar_profile(
         self, year: int, target_period: timedelta = timedelta(hours=1)
-    ) -> PowerIntervalFrame:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Get solar production intervals provided by PVWatts with timestamps from
-        provided year.
+        provided year as read-only arrays of index nanoseconds and kW values.
+        Profiles are cached per (profile, year, period) so that meters sharing
+        a SolarPV configuration only build each year once.
         """
+        cache_key = (self.profile_key, year, target_period)
+        if cache_key in _solar_profile_cache:
+            _solar_profile_cache.move_to_end(cache_key)
+            return _solar_profile_cache[cache_key]
+
         datetime_index = pd.date_range(
             "{}-01-01".format(year), periods=8760, freq="H"
         )
         solar_readings = self.pvwatts_response["outputs"]["ac"]
-        dataframe = pd.DataFrame(zip(datetime_index, solar_readings)).set_index(
-            0
+        dataframe = pd.DataFrame(
+            # convert W to kW and reverse polarity of readings
+            {"kw": np.asarray(solar_readings, dtype=float) / -1000},
+            index=datetime_index,
+        )
+        dataframe = resample_dataframe(
+            dataframe=dataframe, target_period=target_period
         )
-        # convert W to kW and reverse polarity of readings
-        dataframe = dataframe / -1000
-        dataframe = dataframe.rename(columns={1: "kw"})
-        # rename index
-        dataframe.index.rename("index", inplace=True)
 
+        index = dataframe.index.asi8.copy()
+        values = dataframe["kw"].to_numpy(dtype=float, copy=True)
+        index.setflags(write=False)
+        values.setflags(write=False)
+
+        profile = (index, values)
+        _solar_profile_cache[cache_key] = profile
+        while len(_solar_profile_cache) > SOLAR_PROFILE_CACHE_SIZE:
+            _solar_profile_cache.popitem(last=False)
+
+        return profile
+
+    @staticmethod
+    def _get_profile_intervalframe(
+        index: np.ndarray, values: np.ndarray
+    ) -> PowerIntervalFrame:
+        """
+        Create a PowerIntervalFrame from index nanoseconds and kW values.
+        """
         return PowerIntervalFrame(
-            dataframe=resample_dataframe(
-                dataframe=dataframe, target_period=target_period
+            dataframe=pd.DataFrame(
+                {"kw": values},
+                index=pd.DatetimeIndex(
+                    index.astype("datetime64[ns]"), name="index"
+                ),
             )
         )
 
+    def get_annual_solar_intervalframe(
+        self, year: int, target_period: timedelta = timedelta(hours=1)
+    ) -> PowerIntervalFrame:
+        """
+        Get solar production intervals provided by PVWatts with timestamps from
+        provided year.
+        """
+        index, values = self.get_annual_solar_profile(
+            year=year, target_period=target_period
+        )
+
+        return self._get_profile_intervalframe(index, values.copy())
+
     def get_solar_intervalframe(
         self,
         start: datetime,
@@ -130,20 +338,25 @@ class SolarPV(DER):
         Get solar production intervals provided by PVWatts with timestamps from
         provided date range.
         """
-        # DataFrame with all years from start.year to end_limit.year
-        dataframe = reduce(
-            lambda x, y: x.append(y),
-            [
-                self.get_annual_solar_intervalframe(
-                    year=year, target_period=target_period
-                ).dataframe
-                for year in range(start.year, end_limit.year + 1)
-            ],
-            pd.DataFrame(),
+        # tile cached annual profiles from start.year to end_limit.year
+        profiles = [
+            self.get_annual_solar_profile(
+                year=year, target_period=target_period
+            )
+            for year in range(start.year, end_limit.year + 1)
+        ]
+        index = np.concatenate([x[0] for x in profiles])
+        values = np.concatenate([x[1] for x in profiles])
+
+        # beginning on and including start and ending on but excluding
+        # end_limit
+        start_position, end_position = np.searchsorted(
+            index, [pd.Timestamp(start).value, pd.Timestamp(end_limit).value]
         )
 
-        return PowerIntervalFrame(dataframe=dataframe).filter_by_datetime(
-            start=start, end_limit=end_limit
+        return self._get_profile_intervalframe(
+            index[start_position:end_position],
+            values[start_position:end_position],
         )
 
     def get_system_capacity(self, intervalframe: PowerIntervalFrame) -> float:
@@ -208,6 +421,19 @@ class SolarPVStrategy(DERStrategy):
 
         return max(system_ratio, 0)  # ignore net exporters
 
+    def get_target_system_size_ratios(
+        self, annual_loads: np.ndarray, solar_yield: float
+    ) -> np.ndarray:
+        """
+        Vectorized get_target_system_size_ratio() for many annual loads.
+        """
+        target_offsets = np.asarray(annual_loads, dtype=float) * (
+            self.serviceable_load_ratio
+        )
+        system_ratios = target_offsets / abs(solar_yield)
+
+        return np.maximum(system_ratios, 0)  # ignore net exporters
+
     def resize_solar_intervalframe(
         self,
         intervalframe: PowerIntervalFrame,
@@ -255,3 +481,76 @@ class SolarPVSimulationBuilder(DERSimulationBuilder):
             der_intervalframe=solar_intervalframe,
             post_der_intervalframe=(intervalframe + solar_intervalframe),
         )
+
+    def run_batch_simulations(
+        self, intervalframe_dict: dict, totals: dict = None
+    ) -> Iterator[Tuple[object, float, float, PowerIntervalFrame]]:
+        """
+        Lazily yield (id, pre-DER total, post-DER total, DER intervalframe)
+        for many intervalframes without running run_simulation() per
+        intervalframe. Since each SolarPV simulation is the same per-kW solar
+        profile scaled by a per-meter system size, intervalframes covering the
+        same timeframe at the same period share one solar profile and are
+        sized in a single vector operation.
+
+        :param intervalframe_dict: dict with {id: PowerIntervalFrame} pairs
+        :param totals: optional dict with {id: total} pairs of pre-computed
+            intervalframe totals, ex. from stored metadata
+        """
+        if totals is None:
+            totals = {}
+
+        groups = OrderedDict()
+        for key, intervalframe in intervalframe_dict.items():
+            groups.setdefault(
+                (
+                    intervalframe.start_datetime,
+                    intervalframe.end_limit_datetime,
+                    intervalframe.period,
+                ),
+                [],
+            ).append(key)
+
+        for (start, end_limit, period), keys in groups.items():
+            solar_intervalframe = self.der.get_solar_intervalframe(
+                start=start, end_limit=end_limit, target_period=period
+            )
+            solar_total = solar_intervalframe.total
+            solar_yield = self.der_strategy.get_annual_load(
+                solar_intervalframe
+            )
+
+            pre_der_totals = np.array(
+                [
+                    totals[key]
+                    if totals.get(key) is not None
+                    else intervalframe_dict[key].total
+                    for key in keys
+                ],
+                dtype=float,
+            )
+            days = (end_limit - start).days
+            system_size_ratios = (
+                self.der_strategy.get_target_system_size_ratios(
+                    annual_loads=(pre_der_totals / days) * 365,
+                    solar_yield=solar_yield,
+                )
+            )
+            der_totals = system_size_ratios * solar_total
+            der_values = np.outer(
+                system_size_ratios, solar_intervalframe.dataframe["kw"]
+            )
+
+            for i, key in enumerate(keys):
+                der_intervalframe = PowerIntervalFrame(
+                    dataframe=pd.DataFrame(
+                        {"kw": der_values[i]},
+                        index=solar_intervalframe.dataframe.index,
+                    )
+                )
+                yield (
+                    key,
+                    pre_der_totals[i],
+                    pre_der_totals[i] + der_totals[i],
+                    der_intervalframe,
+                )
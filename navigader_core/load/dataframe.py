@@ -1,5 +1,6 @@
-import io
 from datetime import timedelta
+import hashlib
+import io
 
 import numpy as np
 import pandas as pd
@@ -289,3 +290,32 @@ def set_dataframe_year(
 
     dataframe.index = new_index
     return dataframe
+
+
+def get_calendar_codes(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Return an array of month-hour codes for each timestamp in index. Codes are
+    ordered the same way as ValidationFrame288.flattened_array so that a
+    schedule's 288 values can be gathered for an entire time grid at once.
+
+    Ex. Jan hour 0 -> 0, Jan hour 23 -> 23, Dec hour 23 -> 287
+
+    :param index: pandas DatetimeIndex
+    :return: numpy array of ints (0 to 287)
+    """
+    index = pd.DatetimeIndex(index)
+    return (index.month.values - 1) * 24 + index.hour.values
+
+
+def get_time_grid_key(index: pd.DatetimeIndex) -> tuple:
+    """
+    Return a hashable key that identifies a time grid. Used to memoize
+    computations that only depend on the timestamps of an intervalframe.
+    Time grids are keyed on a digest of their timestamps, so that distinct
+    time grids never share a key.
+
+    :param index: pandas DatetimeIndex
+    :return: tuple
+    """
+    values = pd.DatetimeIndex(index).asi8
+    return (len(values), hashlib.sha1(values.tobytes()).digest())
@@ -13,6 +13,7 @@ from navigader_core.load.dataframe import (
     filter_dataframe_by_datetime,
     filter_dataframe_by_weekday,
     filter_dataframe_by_weekend,
+    get_calendar_codes,
     get_dataframe_period,
     merge_dataframe,
     set_dataframe_index,
@@ -523,6 +524,26 @@ class ValidationIntervalFrame(ValidationDataFrame):
             )
         )
 
+    def get_resampled_intervalframe(self: T, target_period) -> T:
+        """
+        Return resample_intervalframe() at target_period with the default
+        aggregation. The result is computed once per target_period and cached
+        on self, so that calculations sharing a ValidationIntervalFrame (ex.
+        pre-DER and post-DER costs of a DERSimulation) resample it once.
+
+        :param target_period: timedelta object
+        :return: ValidationIntervalFrame
+        """
+        resampled_intervalframes = self.__dict__.setdefault(
+            "_resampled_intervalframes", {}
+        )
+        if target_period not in resampled_intervalframes:
+            resampled_intervalframes[
+                target_period
+            ] = self.resample_intervalframe(target_period)
+
+        return resampled_intervalframes[target_period]
+
     def compute_frame288(self, aggfunc, convert_to_kwh=False, default_value=0):
         """
         Return a 12-month by 24-hour (12 x 24 = 288) ValidationFrame288 where
@@ -582,7 +603,7 @@ class ValidationIntervalFrame(ValidationDataFrame):
     def reset_cached_properties(self):
         """
         Resets values of cached properties such as ValidationFrame288
-        calculations.
+        calculations and resampled ValidationIntervalFrames.
         """
         for key in [
             k
@@ -590,6 +611,7 @@ class ValidationIntervalFrame(ValidationDataFrame):
             if isinstance(v, ValidationFrame288)
         ]:
             self.__dict__.pop(key, None)
+        self.__dict__.pop("_resampled_intervalframes", None)
 
 
 class PowerIntervalFrame(ValidationIntervalFrame):
@@ -819,6 +841,27 @@ class ValidationFrame288(ValidationDataFrame):
             [list(self.dataframe[x]) for x in self.dataframe],
         )
 
+    @cached_property
+    def flattened_values(self) -> np.ndarray:
+        """
+        Return all 288 values as a numpy array ordered by month-hour. See
+        flattened_array.
+        """
+        return (
+            self.dataframe.reindex(index=range(0, 24), columns=range(1, 13))
+            .to_numpy(dtype=float)
+            .T.ravel()
+        )
+
+    def get_calendar_values(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Return the 288 value at each timestamp of index as a numpy array.
+
+        :param index: pandas DatetimeIndex
+        :return: numpy array of floats
+        """
+        return self.flattened_values[get_calendar_codes(index)]
+
     @classmethod
     def validate_dataframe_index(cls, dataframe):
         """
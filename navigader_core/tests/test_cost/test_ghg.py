@@ -0,0 +1,75 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from unittest import TestCase
+
+from navigader_core.cost.controller import AggregateGHGCalculation
+from navigader_core.der.builder import AggregateDERProduct, DERProduct
+from navigader_core.load.intervalframe import (
+    PowerIntervalFrame,
+    ValidationFrame288,
+)
+
+
+class TestGHG(TestCase):
+    def setUp(self):
+        """
+        Create the following PowerIntervalFrames for 2020/01/01 - 2020/01/03:
+            - 1-hour intervals: 1kW constant
+            - 15-minute intervals: 2kW constant
+
+        Create the following GHG ValidationFrame288s:
+            - 1 ton/kWh constant
+            - ton/kWh incrementing by month and hour
+        """
+        self.intervalframes = []
+        for freq, kw in [("1H", 1), ("15min", 2)]:
+            index = pd.date_range(
+                start=datetime(2020, 1, 1),
+                end=datetime(2020, 1, 3, 23, 59),
+                freq=freq,
+            )
+            self.intervalframes.append(
+                PowerIntervalFrame(
+                    dataframe=pd.DataFrame(kw, columns=["kw"], index=index)
+                )
+            )
+
+        self.ghg_frame288s = [
+            ValidationFrame288.convert_matrix_to_frame288(np.ones((12, 24))),
+            ValidationFrame288.convert_matrix_to_frame288(
+                np.arange(288, dtype=float).reshape(12, 24)
+            ),
+        ]
+
+    def test_ghg_totals(self):
+        """
+        Test that GHG totals of many PowerIntervalFrames and GHG
+        ValidationFrame288s match individual calculations.
+        """
+        totals = AggregateGHGCalculation.get_totals(
+            intervalframes=self.intervalframes,
+            ghg_frame288s=self.ghg_frame288s,
+        )
+
+        self.assertEqual(totals.shape, (2, 2))
+        # 72 hours at 1kW and 2kW
+        self.assertEqual(list(totals[:, 0]), [72, 144])
+        for i, intervalframe in enumerate(self.intervalframes):
+            der_product = DERProduct(
+                der=None,
+                der_strategy=None,
+                pre_der_intervalframe=intervalframe,
+                der_intervalframe=PowerIntervalFrame(),
+                post_der_intervalframe=intervalframe,
+            )
+            for j, ghg_frame288 in enumerate(self.ghg_frame288s):
+                ghg_calculation = AggregateGHGCalculation(
+                    agg_simulation=AggregateDERProduct(
+                        der_products={1: der_product}
+                    ),
+                    rate_data=ghg_frame288,
+                )
+                self.assertAlmostEqual(
+                    totals[i, j], ghg_calculation.pre_DER_total
+                )
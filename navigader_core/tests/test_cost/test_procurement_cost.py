@@ -81,6 +81,24 @@ class TestProcurementCost(TestCase):
                 procurement_cost.dataframe["$"].sum(), self.procurement_cost
             )
 
+    def test_procurement_costs(self):
+        """
+        Test that the same procurement cost is calculated for each of the four
+        PowerIntervalFrame(s)/EnergyIntervalFrame(s) at once.
+        """
+        procurement_costs = self.procurement_rate_15.get_procurement_costs(
+            [
+                self.power_60,
+                self.power_15,
+                self.energy_60,
+                self.energy_15,
+                PowerIntervalFrame(),
+            ]
+        )
+        self.assertEqual(
+            list(procurement_costs), [self.procurement_cost] * 4 + [0]
+        )
+
     def test_aggregate_procurement_cost_calculation(self):
         """
         Test that the same AggregateProcurementCostCalculation is instantiated
@@ -0,0 +1,109 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from unittest import TestCase
+
+from navigader_core.cost.controller import (
+    AggregateResourceAdequacyCalculation,
+    SystemProfilePeaks,
+)
+from navigader_core.der.builder import AggregateDERProduct, DERProduct
+from navigader_core.load.intervalframe import PowerIntervalFrame
+
+
+class TestResourceAdequacy(TestCase):
+    def setUp(self):
+        """
+        Create the following PowerIntervalFrames:
+            - 2019 system profile, 1-hour intervals: 1,000kW constant with a
+              2,000kW peak at 2019/06/01 17:00
+            - 2018 DERs, 15-minute intervals: 1,500kW at 2018/06/01 12:00 and
+              -500kW at 2018/06/01 17:00
+            - 2018 DERs, 1-hour intervals: same readings as above
+        """
+        system_index = pd.date_range(
+            start=datetime(2019, 1, 1),
+            end=datetime(2019, 12, 31, 23),
+            freq="1H",
+        )
+        system_dataframe = pd.DataFrame(
+            1000.0, columns=["kw"], index=system_index
+        )
+        system_dataframe.loc[datetime(2019, 6, 1, 17)] = 2000.0
+        self.system_profile = PowerIntervalFrame(dataframe=system_dataframe)
+
+        self.der_intervalframes = []
+        for freq in ["15min", "1H"]:
+            der_index = pd.date_range(
+                start=datetime(2018, 6, 1),
+                end=datetime(2018, 6, 1, 23, 59),
+                freq=freq,
+            )
+            der_dataframe = pd.DataFrame(0.0, columns=["kw"], index=der_index)
+            der_dataframe.loc[datetime(2018, 6, 1, 12)] = 1500.0
+            der_dataframe.loc[datetime(2018, 6, 1, 17)] = -500.0
+            self.der_intervalframes.append(
+                PowerIntervalFrame(dataframe=der_dataframe)
+            )
+
+    def get_ra_calculation(self, der_intervalframe):
+        der_product = DERProduct(
+            der=None,
+            der_strategy=None,
+            pre_der_intervalframe=PowerIntervalFrame(),
+            der_intervalframe=der_intervalframe,
+            post_der_intervalframe=PowerIntervalFrame(),
+        )
+        return AggregateResourceAdequacyCalculation(
+            agg_simulation=AggregateDERProduct(der_products={1: der_product}),
+            rate_data=self.system_profile,
+        )
+
+    def test_resource_adequacy_calculation(self):
+        """
+        Test that the June peak moves to the DER's peak and that the DER
+        PowerIntervalFrame is not modified.
+        """
+        for der_intervalframe in self.der_intervalframes:
+            original_index = der_intervalframe.dataframe.index.copy()
+            ra_calculation = self.get_ra_calculation(der_intervalframe)
+
+            # 11 months at 1,000kW and June at 2,000kW
+            self.assertEqual(ra_calculation.pre_DER_total, 13000)
+            # June peak moves from 2,000kW to 2,500kW
+            self.assertEqual(ra_calculation.post_DER_total, 13500)
+            self.assertEqual(ra_calculation.net_impact, 500)
+            self.assertTrue(
+                der_intervalframe.dataframe.index.equals(original_index)
+            )
+            post_der_system_peaks = (
+                ra_calculation.post_DER_system_intervalframe.maximum_frame288
+            )
+            self.assertEqual(
+                post_der_system_peaks.dataframe.max().sum(),
+                ra_calculation.post_DER_total,
+            )
+
+    def test_post_der_monthly_peaks(self):
+        """
+        Test that monthly peaks of many DERs match individual calculations.
+        """
+        system_profile_peaks = SystemProfilePeaks(
+            intervalframe=self.system_profile
+        )
+        monthly_peaks = system_profile_peaks.get_post_DER_monthly_peaks(
+            self.der_intervalframes + [PowerIntervalFrame()]
+        )
+
+        self.assertEqual(monthly_peaks.shape, (3, 12))
+        for der_intervalframe, peaks in zip(
+            self.der_intervalframes, monthly_peaks
+        ):
+            self.assertEqual(
+                peaks.sum(),
+                self.get_ra_calculation(der_intervalframe).post_DER_total,
+            )
+        # empty DER leaves system peaks unchanged
+        np.testing.assert_array_equal(
+            monthly_peaks[2], system_profile_peaks.monthly_peaks
+        )
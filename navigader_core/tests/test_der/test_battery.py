@@ -1,3 +1,4 @@
+import attr
 from datetime import datetime, timedelta
 import pandas as pd
 from unittest import TestCase
@@ -8,7 +9,12 @@ from navigader_core.der.battery import (
     BatterySimulationBuilder,
     BatteryStrategy,
 )
-from navigader_core.der.builder import DERSimulationDirector
+from navigader_core.der.builder import (
+    DERSimulationDirector,
+    DERSimulationExecutor,
+    close_simulation_executor,
+    get_simulation_executor,
+)
 from navigader_core.load.intervalframe import PowerIntervalFrame
 
 
@@ -158,3 +164,118 @@ class TestBattery(TestCase):
         )
 
         self.director.run_single_simulation(intervalframe=single_intervalframe)
+
+    def test_compile_strategy(self):
+        """
+        Compiled thresholds match month-hour lookups and are memoized per
+        time grid.
+        """
+        strategy = self.director.builder.der_strategy
+        time_grid = pd.date_range("2018-01-01", "2018-12-31 23:00", freq="H")
+        compiled = strategy.compile(time_grid)
+
+        for i in [0, 1000, 5000, len(time_grid) - 1]:
+            timestamp = time_grid[i]
+            self.assertEqual(
+                compiled["charge_threshold"][i],
+                strategy.get_charge_threshold(timestamp.month, timestamp.hour),
+            )
+            self.assertEqual(
+                compiled["discharge_threshold"][i],
+                strategy.get_discharge_threshold(
+                    timestamp.month, timestamp.hour
+                ),
+            )
+
+        self.assertIs(strategy.compile(time_grid.copy()), compiled)
+
+    def test_gap_simulation(self):
+        """
+        Intervals missing from the pre-DER intervalframe are filled with
+        no-ops.
+        """
+        gap_intervalframe = PowerIntervalFrame(
+            self.intervalframe.dataframe.drop(
+                [datetime(2018, 1, 1, 7), datetime(2018, 1, 1, 8)]
+            )
+        )
+        simulation = self.director.run_single_simulation(
+            intervalframe=gap_intervalframe
+        )
+
+        self.assertEqual(
+            list(simulation.der_intervalframe.dataframe.index),
+            list(self.intervalframe.dataframe.index),
+        )
+        self.assertEqual(
+            list(simulation.der_intervalframe.dataframe.kw.values),
+            [6.25, 6.25, 0.0, 0.0, 0.0, 0.0, -3.75, 0.0, 0.0, -3.75, 0.0, 0.0],
+        )
+
+    def test_executor_simulations(self):
+        """
+        Simulations run by a DERSimulationExecutor match simulations run in
+        process.
+        """
+        intervalframe_dict = {
+            "original": self.intervalframe,
+            "inverse": self.intervalframe.inverse_intervalframe,
+        }
+        expected = self.director.run_many_simulations(intervalframe_dict)
+
+        with DERSimulationExecutor(
+            builder=self.director.builder, processes=2, chunksize=1
+        ) as executor:
+            aggregate_simulation = self.director.run_many_simulations(
+                intervalframe_dict, executor=executor
+            )
+
+        for key, simulation in expected.der_products.items():
+            result = aggregate_simulation.der_products[key]
+            self.assertIsInstance(
+                result.der_intervalframe,
+                simulation.der_intervalframe.__class__,
+            )
+            self.assertTrue(
+                result.der_intervalframe.dataframe.equals(
+                    simulation.der_intervalframe.dataframe
+                )
+            )
+            self.assertTrue(
+                result.post_der_intervalframe.dataframe.equals(
+                    simulation.post_der_intervalframe.dataframe
+                )
+            )
+
+    def test_shared_executor(self):
+        """
+        The shared DERSimulationExecutor is reused for builders with the same
+        fingerprint and replaced otherwise.
+        """
+        builder = self.director.builder
+        executor = get_simulation_executor(builder=builder, processes=1)
+        try:
+            self.assertIs(
+                get_simulation_executor(
+                    builder=attr.evolve(builder), processes=1
+                ),
+                executor,
+            )
+
+            other_builder = attr.evolve(
+                builder,
+                der=Battery(
+                    rating=10,
+                    discharge_duration=timedelta(hours=2),
+                    efficiency=0.5,
+                ),
+            )
+            other_executor = get_simulation_executor(
+                builder=other_builder, processes=1
+            )
+            self.assertIsNot(other_executor, executor)
+            self.assertEqual(
+                other_executor.fingerprint, other_builder.fingerprint
+            )
+        finally:
+            close_simulation_executor()
@@ -291,6 +291,44 @@ class TestFuelSwitching(NavigaderTestCase):
                 der_frame[der_frame.index.dayofyear == day.dayofyear].kw.sum(),
             )
 
+    def test_run_batch_simulations(self):
+        """
+        Tests that the FuelSwitchingSimulationBuilder's run_batch_simulations
+        method matches run_simulation across meters and years
+        """
+        gas_index = self.gas_frame.dataframe.index
+        kw_index = pd.date_range(start=gas_index[0], periods=8760, freq="H")
+        kw_frame = PowerIntervalFrame(
+            pd.DataFrame(range(len(kw_index)), index=kw_index, columns=["kw"])
+        )
+        shifted_gas_frame = GasIntervalFrame(
+            self.gas_frame.dataframe.set_index(
+                gas_index + pd.DateOffset(years=1)
+            )
+            * 2
+        )
+        energy_containers = {
+            1: EnergyContainer(kw=kw_frame, gas=self.gas_frame),
+            2: EnergyContainer(kw=kw_frame, gas=shifted_gas_frame),
+        }
+
+        batch_simulations = self.builder.run_batch_simulations(
+            energy_containers
+        )
+        for batch_simulation in batch_simulations:
+            key, pre_total, post_total, der_frame = batch_simulation
+            der_product = self.builder.run_simulation(energy_containers[key])
+            self.assertAlmostEqual(
+                pre_total, der_product.pre_der_intervalframe.total
+            )
+            self.assertAlmostEqual(
+                post_total, der_product.post_der_intervalframe.total
+            )
+            pd.testing.assert_frame_equal(
+                der_frame.dataframe,
+                der_product.der_intervalframe.dataframe,
+            )
+
 
 class TestTMY3Parser(NavigaderTestCase):
     """
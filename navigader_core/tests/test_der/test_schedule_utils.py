@@ -0,0 +1,186 @@
+from datetime import timedelta
+import numpy as np
+from unittest import TestCase
+from unittest.mock import patch
+
+from navigader_core.der.battery import Battery
+from navigader_core.der.schedule_utils import (
+    PeakShavingScheduleOptimizer,
+    _optimized_schedule_cache,
+)
+from navigader_core.load.intervalframe import PowerIntervalFrame
+
+
+# meter data
+RESIDENTIAL_METER = "navigader_core/tests/test_cost/data/residential_meter.csv"
+COMMERCIAL_METER = "navigader_core/tests/test_cost/data/commercial_meter.csv"
+
+
+def read_hourly_meter(csv_location):
+    """
+    Return hourly PowerIntervalFrame from csv_location.
+    """
+    return PowerIntervalFrame.read_csv(
+        csv_location=csv_location,
+        index_column="start",
+        convert_to_datetime=True,
+    ).downsample_intervalframe(timedelta(hours=1), np.mean)
+
+
+class TestPeakShavingScheduleOptimizer(TestCase):
+    """
+    Tests that searching for discharge thresholds finds the same peak
+    reduction as checking every discharge threshold.
+    """
+
+    def assertSearchMatchesBruteForce(
+        self, battery, load_intervalframe, months, charge_threshold
+    ):
+        optimizer = PeakShavingScheduleOptimizer
+        for month in months:
+            _, brute_force_peak = optimizer._optimize_discharge_threshold(
+                battery=battery,
+                load_intervalframe=load_intervalframe,
+                month=month,
+                charge_threshold=charge_threshold,
+            )
+            _, search_peak = optimizer._search_discharge_threshold(
+                battery=battery,
+                load_intervalframe=load_intervalframe,
+                month=month,
+                charge_threshold=charge_threshold,
+            )
+            self.assertEqual(search_peak, brute_force_peak)
+
+    def test_residential_search(self):
+        """
+        Test discharge threshold search on a residential meter.
+        """
+        self.assertSearchMatchesBruteForce(
+            battery=Battery(
+                rating=3, discharge_duration=timedelta(hours=2), efficiency=0.9
+            ),
+            load_intervalframe=read_hourly_meter(RESIDENTIAL_METER),
+            months=range(1, 13),
+            charge_threshold=2,
+        )
+
+    def test_commercial_search(self):
+        """
+        Test discharge threshold search on a commercial meter.
+        """
+        self.assertSearchMatchesBruteForce(
+            battery=Battery(
+                rating=100,
+                discharge_duration=timedelta(hours=2),
+                efficiency=0.9,
+            ),
+            load_intervalframe=read_hourly_meter(COMMERCIAL_METER),
+            months=[10],
+            charge_threshold=450,
+        )
+
+    def test_non_unimodal_search(self):
+        """
+        Test discharge threshold search when the lowest resulting peak is at
+        the end of the searched interval, away from a local minimum.
+        """
+        battery = Battery(
+            rating=10, discharge_duration=timedelta(hours=2), efficiency=0.9
+        )
+        load_intervalframe = read_hourly_meter(RESIDENTIAL_METER)
+        max_load = load_intervalframe.maximum_frame288.dataframe[1].max()
+        lowest_threshold = int(max_load - 10)
+
+        def get_peak_power(
+            battery,
+            load_intervalframe,
+            month,
+            charge_threshold,
+            discharge_threshold,
+            warmup=timedelta(0),
+        ):
+            if discharge_threshold == lowest_threshold:
+                return (discharge_threshold, 0)
+            local_minimum = lowest_threshold + 7
+            return (
+                discharge_threshold,
+                abs(discharge_threshold - local_minimum) + 10,
+            )
+
+        with patch.object(
+            PeakShavingScheduleOptimizer, "_get_peak_power", get_peak_power
+        ):
+            self.assertSearchMatchesBruteForce(
+                battery=battery,
+                load_intervalframe=load_intervalframe,
+                months=[1],
+                charge_threshold=2,
+            )
+
+    def test_invalid_tolerance(self):
+        """
+        Tolerance must be at least 1kw.
+        """
+        with self.assertRaises(ValueError):
+            PeakShavingScheduleOptimizer._search_discharge_threshold(
+                battery=Battery(
+                    rating=3,
+                    discharge_duration=timedelta(hours=2),
+                    efficiency=0.9,
+                ),
+                load_intervalframe=read_hourly_meter(RESIDENTIAL_METER),
+                month=1,
+                charge_threshold=2,
+                tolerance=0,
+            )
+
+    def test_month_intervalframe_warmup(self):
+        """
+        Month slices include the warmup period leading into the month.
+        """
+        load_intervalframe = read_hourly_meter(RESIDENTIAL_METER)
+        month_intervalframe = (
+            PeakShavingScheduleOptimizer._get_month_intervalframe(
+                load_intervalframe, month=4, warmup=timedelta(days=1)
+            )
+        )
+        index = month_intervalframe.dataframe.index
+
+        self.assertEqual(set(index.month), {3, 4})
+        self.assertEqual(
+            len(index[index.month == 4]),
+            len(load_intervalframe.filter_by_months({4}).dataframe),
+        )
+        self.assertEqual(len(index[index.month == 3]), 24)
+
+    def test_optimized_schedule_cache(self):
+        """
+        Optimizing months in parallel matches optimizing months sequentially
+        and repeated optimizations are served from cache.
+        """
+        battery = Battery(
+            rating=3, discharge_duration=timedelta(hours=2), efficiency=0.9
+        )
+        load_intervalframe = read_hourly_meter(RESIDENTIAL_METER)
+
+        def optimize(multiprocess):
+            return PeakShavingScheduleOptimizer.optimize_schedules_with_grid(
+                battery=battery,
+                load_intervalframe=load_intervalframe,
+                warmup=timedelta(days=1),
+                multiprocess=multiprocess,
+            )
+
+        _optimized_schedule_cache.clear()
+        schedules = optimize(multiprocess=False)
+        _optimized_schedule_cache.clear()
+        schedules_multiprocess = optimize(multiprocess=True)
+
+        for schedule, schedule_multiprocess in zip(
+            schedules, schedules_multiprocess
+        ):
+            self.assertTrue(
+                schedule.dataframe.equals(schedule_multiprocess.dataframe)
+            )
+        self.assertIs(optimize(multiprocess=False), schedules_multiprocess)
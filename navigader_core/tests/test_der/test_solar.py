@@ -1,11 +1,14 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 import itertools
 import pandas as pd
+import tempfile
 
 from unittest import mock, TestCase
 
 from navigader_core.load.intervalframe import PowerIntervalFrame
 from navigader_core.der.solar import (
+    _solar_profile_cache,
+    PVWattsResponseStore,
     SolarPV,
     SolarPVSimulationBuilder,
     SolarPVStrategy,
@@ -122,3 +125,160 @@ class TestSolarPV(TestCase):
             self.intervalframe_2.period,
             self.der_product_2.post_der_intervalframe.period,
         )
+
+    def test_solar_profile_cache(self):
+        """
+        Annual profiles are built once per (profile, year, period) and tiled
+        across multi-year date ranges.
+        """
+        _solar_profile_cache.clear()
+        solar_pv = SolarPV(
+            array_type=ARRAY_TYPE,
+            azimuth=AZIMUTH,
+            address=ADDRESS,
+            tilt=TILT,
+            stored_response=self.solar_pv.pvwatts_response,
+        )
+        solar_intervalframe = solar_pv.get_solar_intervalframe(
+            start=datetime(2019, 7, 1),
+            end_limit=datetime(2021, 7, 1),
+            target_period=timedelta(minutes=15),
+        )
+        self.assertEqual(len(_solar_profile_cache), 3)
+        self.assertEqual(
+            solar_intervalframe.start_datetime, datetime(2019, 7, 1)
+        )
+        self.assertLess(
+            solar_intervalframe.end_limit_datetime, datetime(2021, 7, 1, 0, 1)
+        )
+
+        # an equivalent SolarPV reuses cached profiles
+        self.builder.der.get_solar_intervalframe(
+            start=datetime(2020, 1, 1),
+            end_limit=datetime(2021, 1, 1),
+            target_period=timedelta(minutes=15),
+        )
+        self.assertEqual(len(_solar_profile_cache), 3)
+        self.assertEqual(
+            solar_pv.get_annual_solar_intervalframe(2020).total,
+            self.solar_pv.get_annual_solar_intervalframe(2020).total,
+        )
+
+    def test_batch_simulations(self):
+        """
+        Batched simulations match individual simulations.
+        """
+        der_products = {1: self.der_product_1, 2: self.der_product_2}
+        batch_simulations = self.builder.run_batch_simulations(
+            {1: self.intervalframe_1, 2: self.intervalframe_2}
+        )
+        for batch_simulation in batch_simulations:
+            key, pre_total, post_total, der_frame = batch_simulation
+            der_product = der_products[key]
+            self.assertAlmostEqual(
+                pre_total, der_product.pre_der_intervalframe.total
+            )
+            self.assertAlmostEqual(
+                post_total, der_product.post_der_intervalframe.total
+            )
+            pd.testing.assert_frame_equal(
+                der_frame.dataframe,
+                der_product.der_intervalframe.dataframe,
+            )
+
+    def test_fingerprint(self):
+        """
+        Builders with the same parameters share fingerprints regardless of
+        API key and response store.
+        """
+        builder = SolarPVSimulationBuilder(
+            der=SolarPV(
+                array_type=ARRAY_TYPE,
+                azimuth=AZIMUTH,
+                address=ADDRESS,
+                tilt=TILT,
+                response_store=PVWattsResponseStore(directory="pvwatts"),
+            ),
+            der_strategy=self.solar_pv_strategy,
+        )
+        self.assertEqual(
+            builder.get_fingerprint(hash(self.intervalframe_1)),
+            self.builder.get_fingerprint(hash(self.intervalframe_1)),
+        )
+        self.assertNotEqual(
+            builder.get_fingerprint(hash(self.intervalframe_1)),
+            builder.get_fingerprint(hash(self.intervalframe_2)),
+        )
+        self.assertNotEqual(
+            SolarPVSimulationBuilder(
+                der=self.solar_pv,
+                der_strategy=SolarPVStrategy(serviceable_load_ratio=0.5),
+            ).get_fingerprint(hash(self.intervalframe_1)),
+            self.builder.get_fingerprint(hash(self.intervalframe_1)),
+        )
+
+
+class TestPVWattsResponseStore(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.response_store = PVWattsResponseStore(
+            directory=self.directory.name
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_solar_pv(self, response_store, **kwargs):
+        parameters = {
+            "api_key": "ABCDEFG",
+            "array_type": ARRAY_TYPE,
+            "azimuth": AZIMUTH,
+            "address": ADDRESS,
+            "tilt": TILT,
+        }
+        parameters.update(kwargs)
+        return SolarPV(response_store=response_store, **parameters)
+
+    @mock.patch("requests.get", side_effect=mocked_pvwatts_requests_get)
+    def test_response_store(self, mock_get):
+        """
+        Equivalent requests are only made to the PVWatts API once.
+        """
+        response = self.get_solar_pv(self.response_store).pvwatts_response
+        equivalent_response = self.get_solar_pv(
+            self.response_store, azimuth=float(AZIMUTH), api_key="HIJKLMN"
+        ).pvwatts_response
+
+        self.assertEqual(response, equivalent_response)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @mock.patch("requests.get", side_effect=mocked_pvwatts_requests_get)
+    def test_replay(self, mock_get):
+        """
+        Recorded responses are replayed without calling the PVWatts API and
+        unrecorded responses raise a LookupError.
+        """
+        response = self.get_solar_pv(self.response_store).pvwatts_response
+        replay_store = PVWattsResponseStore(
+            directory=self.directory.name, replay=True
+        )
+
+        self.assertEqual(
+            self.get_solar_pv(replay_store).pvwatts_response, response
+        )
+        with self.assertRaises(LookupError):
+            self.get_solar_pv(replay_store, tilt=TILT + 1).pvwatts_response
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_normalize_coordinates(self):
+        """
+        Coordinates are rounded and whitespace is ignored.
+        """
+        self.assertEqual(
+            self.response_store.get_file_path(
+                {"address": "37.87123, -122.27"}
+            ),
+            self.response_store.get_file_path(
+                {"address": "37.8714,-122.2700001"}
+            ),
+        )
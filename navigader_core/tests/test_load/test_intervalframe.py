@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 
 from unittest import TestCase
@@ -95,3 +95,26 @@ class Test288Computation(TestCase):
         self.assertEqual({4}, set(self.power_15.count_frame288.dataframe[1]))
         self.assertEqual({1}, set(self.energy_60.count_frame288.dataframe[1]))
         self.assertEqual({4}, set(self.energy_15.count_frame288.dataframe[1]))
+
+    def test_resampled_intervalframe(self):
+        """
+        Resampled ValidationIntervalFrames are computed once per period.
+        """
+        resampled = self.power_15.get_resampled_intervalframe(
+            timedelta(hours=1)
+        )
+        self.assertEqual(
+            list(resampled.dataframe.index),
+            list(self.power_60.dataframe.index),
+        )
+        self.assertEqual(set(resampled.dataframe.kw), {1})
+        self.assertIs(
+            self.power_15.get_resampled_intervalframe(timedelta(hours=1)),
+            resampled,
+        )
+
+        self.power_15.reset_cached_properties()
+        self.assertIsNot(
+            self.power_15.get_resampled_intervalframe(timedelta(hours=1)),
+            resampled,
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.7 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reference_model", "0012_auto_20201221_0314"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dersimulation",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True, db_index=True, max_length=64, null=True
+            ),
+        ),
+    ]
@@ -1,9 +1,10 @@
 import attr
+from collections import defaultdict, OrderedDict
 from datetime import datetime
 from enum import Enum
-from functools import reduce
+import os
 import pandas as pd
-from typing import List, Set
+from typing import Iterator, List, Set, Tuple
 import uuid
 
 from django.contrib.auth.models import User
@@ -17,6 +18,7 @@ from navigader_core.der.builder import (
     DERProduct,
     DERSimulationBuilder,
     DERSimulationDirector,
+    DERSimulationExecutor,
     DERStrategy as pyDERStrategy,
 )
 from navigader_core.load.intervalframe import (
@@ -26,16 +28,24 @@ from navigader_core.load.intervalframe import (
     ValidationIntervalFrame,
 )
 
+from beo_datastore.libs.dataframe import delete_file, get_file_paths
+from beo_datastore.libs.intervalframe_file import (
+    MeterMatrixFrameFile,
+    PowerIntervalFrameFile,
+)
 from beo_datastore.libs.models import (
     IntervalFrameFileMixin,
     PolymorphicValidationModel,
     TaskStatusModelMixin,
     ValidationModel,
+    prefetch_frames,
 )
 from beo_datastore.libs.plot_intervalframe import (
     plot_intervalframe,
     plot_frame288_monthly_comparison,
 )
+from beo_datastore.libs.utils import chunks
+from beo_datastore.settings import MEDIA_ROOT, METER_GROUP_MATRIX_STORAGE
 from reference.auth_user.models import LoadServingEntity
 
 
@@ -160,22 +170,35 @@ class MeterDataMixin(object):
         """
         return self.meter_intervalframe.count_frame288.dataframe
 
-    def build_aggregate_metrics(self):
+    def build_aggregate_metrics(self, overwrite=False):
         """
         Computes aggregate metrics on the model only if they have not already
         been computed. The model is expected to have `total_kwh` and
         `max_monthly_demand` fields.
+
+        :param overwrite: True to recompute metrics that have already been
+            computed, ex. after readings are ingested again
         """
         intervalframe = self.meter_intervalframe
-        if self.total_kwh is None:
+        if self.total_kwh is None or overwrite:
             self.total_kwh = intervalframe.total
 
-        if self.max_monthly_demand is None:
+        if self.max_monthly_demand is None or overwrite:
             self.max_monthly_demand = intervalframe.maximum
 
         self.save(update_fields=["total_kwh", "max_monthly_demand"])
 
 
+class MeterGroupMatrixFrame(MeterMatrixFrameFile):
+    """
+    Model for handling the consolidated readings of all Meters in a
+    MeterGroup, one column of kW readings per Meter id.
+    """
+
+    # directory for parquet file storage
+    file_directory = os.path.join(MEDIA_ROOT, "meter_groups")
+
+
 class MeterGroup(
     PolymorphicValidationModel, MeterDataMixin, TaskStatusModelMixin
 ):
@@ -234,8 +257,8 @@ class MeterGroup(
         First timestamp in all contained Meters' readings.
         """
         return min(
-            meter.intervalframe.dataframe.index[0]
-            for meter in self.meters.all()
+            x.dataframe.index[0]
+            for x in self.get_meter_intervalframes().values()
         )
 
     @cached_property
@@ -244,8 +267,8 @@ class MeterGroup(
         Last timestamp in all contained Meters' reading.
         """
         return max(
-            meter.intervalframe.dataframe.index[-1]
-            for meter in self.meters.all()
+            x.dataframe.index[-1]
+            for x in self.get_meter_intervalframes().values()
         )
 
     @property
@@ -255,6 +278,101 @@ class MeterGroup(
         """
         return self.intervalframe.years
 
+    @property
+    def meters_ingested(self):
+        """
+        True if all contained Meters have been created.
+        """
+        return True
+
+    def build_meter_matrix(self, overwrite=False):
+        """
+        Store the meter_intervalframes of all contained Meters in a single
+        MeterGroupMatrixFrame, one column per Meter id on a shared
+        DatetimeIndex, so that group-level operations read one file rather
+        than one file per Meter. Nothing is stored until all Meters have been
+        ingested.
+
+        Meters with missing (NaN) readings are left out and read from their
+        own files, since gaps between the readings of different Meters on the
+        shared DatetimeIndex are also stored as NaN.
+
+        :param overwrite: True to rebuild an existing MeterGroupMatrixFrame
+        """
+        with self.lock():
+            if not self.meters_ingested:
+                return
+            if not overwrite and MeterGroupMatrixFrame.exists(self):
+                return
+
+            columns = {}
+            for meter in self.meters.all():
+                readings = meter.meter_intervalframe.dataframe["kw"]
+                if not readings.isna().any():
+                    columns[str(meter.id)] = readings
+            if not columns:
+                return
+
+            dataframe = pd.concat(columns, axis=1).sort_index()
+            MeterGroupMatrixFrame(
+                reference_object=self, dataframe=dataframe
+            ).save()
+
+    def delete_meter_matrix(self):
+        """
+        Delete the MeterGroupMatrixFrame, ex. once readings of a contained
+        Meter have been re-ingested.
+        """
+        MeterGroupMatrixFrame(
+            reference_object=self, dataframe=pd.DataFrame()
+        ).delete()
+
+    def get_meter_intervalframes(self, meters=None) -> OrderedDict:
+        """
+        Return Meters mapped to their meter_intervalframes. If
+        METER_GROUP_MATRIX_STORAGE is set, readings are read from the
+        MeterGroupMatrixFrame when one has been built, see
+        build_meter_matrix(), and attached to each Meter. Meters missing from
+        the MeterGroupMatrixFrame read their own files concurrently.
+
+        :param meters: QuerySet or list of contained Meters, defaults to all
+            contained Meters
+        :return: OrderedDict of Meters to PowerIntervalFrames
+        """
+        if meters is None:
+            meters = self.meters.all()
+        meters = list(meters)
+
+        if METER_GROUP_MATRIX_STORAGE:
+            dataframe = MeterGroupMatrixFrame.get_columns_from_file(
+                reference_object=self, columns=[str(x.id) for x in meters]
+            )
+        else:
+            dataframe = pd.DataFrame()
+        Meter.prefetch_meter_frames(
+            [x for x in meters if str(x.id) not in dataframe.columns]
+        )
+        meter_intervalframes = OrderedDict()
+        for meter in meters:
+            column = str(meter.id)
+            if column in dataframe.columns:
+                # NaNs are gaps between Meters' readings, stored Meters have
+                # no missing readings of their own
+                meter.attach_meter_intervalframe(
+                    PowerIntervalFrame(
+                        dataframe=dataframe[[column]]
+                        .dropna()
+                        .rename(columns={column: "kw"})
+                    )
+                )
+            meter_intervalframes[meter] = meter.meter_intervalframe
+
+        return meter_intervalframes
+
+    def delete(self, *args, **kwargs):
+        self.delete_meter_matrix()
+        super().delete(*args, **kwargs)
+
 
 class Meter(PolymorphicValidationModel, MeterDataMixin):
     """
@@ -270,6 +388,13 @@ class Meter(PolymorphicValidationModel, MeterDataMixin):
     )
     total_kwh = models.FloatField(blank=True, null=True)
 
+    # meter_intervalframe read from a MeterGroupMatrixFrame
+    _attached_meter_intervalframe = None
+
+    # related manager whose objects' frames make up meter_intervalframe, see
+    # prefetch_meter_frames()
+    frame_relation = None
+
     class Meta:
         ordering = ["-created_at"]
 
@@ -282,6 +407,69 @@ class Meter(PolymorphicValidationModel, MeterDataMixin):
             "meter_intervalframe must be set in {}".format(self.__class__)
         )
 
+    def get_meter_intervalframe(
+        self, start=None, end_limit=None
+    ) -> PowerIntervalFrame:
+        """
+        Return meter_intervalframe filtered by index beginning on and
+        including start and ending on but excluding end_limit. Child classes
+        can override this to read only the readings in range from file.
+
+        :param start: datetime object, None for no lower bound
+        :param end_limit: datetime object, None for no upper bound
+        :return: PowerIntervalFrame
+        """
+        if start is None and end_limit is None:
+            return self.meter_intervalframe
+
+        return self.meter_intervalframe.filter_by_datetime(
+            start=pd.Timestamp.min if start is None else start,
+            end_limit=pd.Timestamp.max if end_limit is None else end_limit,
+        )
+
+    def attach_meter_intervalframe(self, intervalframe: PowerIntervalFrame):
+        """
+        Use intervalframe as meter_intervalframe rather than reading the
+        Meter's own files, see MeterGroup.get_meter_intervalframes().
+
+        :param intervalframe: PowerIntervalFrame
+        """
+        self._attached_meter_intervalframe = intervalframe
+
+    def release_meter_frames(self):
+        """
+        Drop readings cached on self so that their memory can be freed, ex.
+        once a batch of Meters has been simulated. Readings are read from
+        file again on next access.
+        """
+        self._attached_meter_intervalframe = None
+        if isinstance(self, IntervalFrameFileMixin):
+            self.release_frame()
+        if self.frame_relation:
+            getattr(self, "_prefetched_objects_cache", {}).pop(
+                self.frame_relation, None
+            )
+
+    @staticmethod
+    def prefetch_meter_frames(meters):
+        """
+        Read the frame files making up the meter_intervalframes of many
+        Meters concurrently, see prefetch_frames().
+
+        :param meters: QuerySet or list of Meters
+        """
+        meters_by_class = defaultdict(list)
+        for meter in meters:
+            meters_by_class[meter.__class__].append(meter)
+
+        for meter_class, class_meters in meters_by_class.items():
+            if meter_class.frame_relation:
+                prefetch_frames(
+                    class_meters, related=meter_class.frame_relation
+                )
+            elif issubclass(meter_class, IntervalFrameFileMixin):
+                prefetch_frames(class_meters)
+
     @property
     def gas_intervalframe(self) -> GasIntervalFrame:
         """
@@ -291,6 +479,22 @@ class Meter(PolymorphicValidationModel, MeterDataMixin):
             "gas_intervalframe must be set in {}".format(self.__class__)
         )
 
+    @property
+    def frame_hash(self) -> str:
+        """
+        Hash of meter_intervalframe, used to identify meters with identical
+        readings.
+        """
+        return str(hash(self.meter_intervalframe))
+
+    @property
+    def gas_hash(self) -> str:
+        """
+        Hash of gas_intervalframe, used to identify meters with identical gas
+        usage.
+        """
+        return str(hash(self.gas_intervalframe))
+
     @property
     def energy_container(self) -> EnergyContainer:
         """
@@ -475,6 +679,10 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
     )
     pre_DER_total = models.FloatField()
     post_DER_total = models.FloatField()
+    # simulations with identical inputs share a fingerprint and frame file
+    fingerprint = models.CharField(
+        max_length=64, blank=True, null=True, db_index=True
+    )
 
     class Meta:
         ordering = ["-created_at"]
@@ -499,6 +707,32 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
             )
         super().clean(*args, **kwargs)
 
+    @property
+    def frame_key(self):
+        """
+        Frame files are shared by DERSimulations with the same fingerprint.
+        """
+        return self.fingerprint or self.id
+
+    def delete_frame(self):
+        """
+        Deletes the attached frame file unless it is shared with another
+        DERSimulation.
+        """
+        if (
+            self.fingerprint
+            and DERSimulation.objects.filter(fingerprint=self.fingerprint)
+            .exclude(id=self.id)
+            .exists()
+        ):
+            return
+        super().delete_frame()
+
+    def delete(self, *args, **kwargs):
+        StackedDERSimulationFrame.delete_stacks(self)
+        StackedDERSimulationNetFrame.delete_stacks(self)
+        super().delete(*args, **kwargs)
+
     @property
     def is_stacked(self) -> bool:
         """
@@ -542,10 +776,19 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
         """
         PowerIntervalFrame before running a DERSimulation.
         """
-        return self.meter.meter_intervalframe.filter_by_datetime(
+        return self.meter.get_meter_intervalframe(
             start=self.start, end_limit=self.end_limit
         )
 
+    @property
+    def pre_der_source(self) -> Tuple[Meter, datetime, datetime]:
+        """
+        (Meter, start, end_limit) from which pre_der_intervalframe is read.
+        DERSimulations with the same pre_der_source have the same pre-DER
+        costs.
+        """
+        return (self.meter, self.start, self.end_limit)
+
     @property
     def der_intervalframe(self) -> ValidationIntervalFrame:
         """
@@ -573,12 +816,39 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
         PowerIntervalFrame representing building load after DER has been
         introduced.
         """
+        if self._attached_meter_intervalframe is not None:
+            return self._attached_meter_intervalframe
         return self.post_der_intervalframe
 
+    def release_meter_frames(self):
+        """
+        Also drop readings derived from the source Meter.
+        """
+        super().release_meter_frames()
+        for attribute in [
+            "pre_der_intervalframe",
+            "post_der_intervalframe",
+            "meter_intervalframe",
+            "simulation",
+            "agg_simulation",
+        ]:
+            self.__dict__.pop(attribute, None)
+
+    @property
+    def frame_hash(self) -> str:
+        """
+        The fingerprint of a DERSimulation identifies its post-DER readings.
+        """
+        return self.fingerprint or super().frame_hash
+
     @property
     def gas_intervalframe(self) -> GasIntervalFrame:
         return self.meter.gas_intervalframe
 
+    @property
+    def gas_hash(self) -> str:
+        return self.meter.gas_hash
+
     @property
     def has_gas(self):
         return False
@@ -697,6 +967,7 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
         der_strategy: DERStrategy,
         start=None,
         end_limit=None,
+        fingerprint=None,
     ):
         """
         Get existing or create new DERSimulation from a Meter and DERProduct.
@@ -708,6 +979,8 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
         :param der_strategy: DERStrategy
         :param start: datetime
         :param end_limit: datetime
+        :param fingerprint: fingerprint of simulation inputs, see
+            get_fingerprint()
         :return: (
             DERSimulation,
             DERSimulation created (True/False)
@@ -727,9 +1000,51 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
                 der_strategy=der_strategy,
                 pre_DER_total=der_product.pre_der_intervalframe.total,
                 post_DER_total=der_product.post_der_intervalframe.total,
+                fingerprint=fingerprint,
                 dataframe=der_product.der_intervalframe.dataframe,
             )
 
+    @classmethod
+    def create_from_batch_simulations(
+        cls,
+        der_configuration: DERConfiguration,
+        der_strategy: DERStrategy,
+        start,
+        end_limit,
+        batch_simulations: Iterator[
+            Tuple[Meter, float, float, PowerIntervalFrame]
+        ],
+        fingerprints: dict = None,
+    ) -> None:
+        """
+        Store DERSimulations from (Meter, pre-DER total, post-DER total, DER
+        intervalframe) tuples as generated by a builder's
+        run_batch_simulations() without creating DERProducts.
+
+        :param der_configuration: DERConfiguration
+        :param der_strategy: DERStrategy
+        :param start: datetime
+        :param end_limit: datetime
+        :param batch_simulations: iterator of tuples
+        :param fingerprints: dict with {Meter: fingerprint} pairs
+        """
+        if fingerprints is None:
+            fingerprints = {}
+
+        for meter, pre_total, post_total, der_frame in batch_simulations:
+            with transaction.atomic():
+                cls.get_or_create(
+                    start=start,
+                    end_limit=end_limit,
+                    meter=meter,
+                    der_configuration=der_configuration,
+                    der_strategy=der_strategy,
+                    pre_DER_total=pre_total,
+                    post_DER_total=post_total,
+                    fingerprint=fingerprints.get(meter),
+                    dataframe=der_frame.dataframe,
+                )
+
     @classmethod
     def get_simulation_builder(
         cls, der: pyDER, der_strategy: pyDERStrategy
@@ -745,6 +1060,130 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
     def get_intervalframes(cls, meters: Set[Meter]):
         return {meter: meter.meter_intervalframe for meter in meters}
 
+    @classmethod
+    def get_meter_hash(cls, meter: Meter) -> str:
+        """
+        Hash of the meter readings used as simulation input.
+        """
+        return meter.frame_hash
+
+    @classmethod
+    def get_fingerprint(
+        cls, builder: DERSimulationBuilder, meter: Meter, start, end_limit
+    ) -> str:
+        """
+        Fingerprint of a simulation's inputs: meter readings, DER and
+        DERStrategy parameters, simulation code version, and timeframe.
+        DERSimulations with equal fingerprints share a frame file.
+
+        :param builder: DERSimulationBuilder
+        :param meter: Meter
+        :param start: datetime
+        :param end_limit: datetime
+        :return: fingerprint
+        """
+        return builder.get_fingerprint(
+            cls.get_meter_hash(meter), start, end_limit
+        )
+
+    @classmethod
+    def iter_der_products(
+        cls,
+        director: DERSimulationDirector,
+        meters: List[Meter],
+        start,
+        end_limit,
+        multiprocess=False,
+        batch_size=32,
+    ) -> Iterator[Tuple[Meter, DERProduct]]:
+        """
+        Lazily yield (Meter, DERProduct) pairs. Meter intervalframes are
+        loaded and simulated batch_size meters at a time and the next batch
+        is not loaded until the previous batch has been consumed. Readings
+        cached on a batch's Meters are released once the batch is consumed,
+        so memory use is bounded by batch_size rather than by the number of
+        meters.
+
+        :param director: DERSimulationDirector
+        :param meters: list of Meters
+        :param start: datetime
+        :param end_limit: datetime
+        :param multiprocess: True to run all batches on one process pool,
+            which is shut down once the batches are consumed
+        :param batch_size: number of meters to load and simulate at once
+        """
+        executor = None
+        if multiprocess:
+            executor = DERSimulationExecutor(builder=director.builder)
+
+        try:
+            for batch in chunks(meters, batch_size):
+                aggregate_simulation = director.run_many_simulations(
+                    intervalframe_dict=cls.get_intervalframes(
+                        meters=set(batch)
+                    ),
+                    start=start,
+                    end_limit=end_limit,
+                    executor=executor,
+                )
+                yield from aggregate_simulation.der_products.items()
+                for meter in batch:
+                    meter.release_meter_frames()
+        finally:
+            if executor is not None:
+                executor.close()
+
+    @classmethod
+    def create_simulations(
+        cls,
+        der_configuration: DERConfiguration,
+        der_strategy: DERStrategy,
+        meters: List[Meter],
+        start,
+        end_limit,
+        multiprocess=False,
+        batch_size=32,
+        fingerprints: dict = None,
+    ) -> None:
+        """
+        Run and store DERSimulations for meters. New simulations are streamed
+        to storage as they are generated, see iter_der_products().
+
+        :param der_configuration: DERConfiguration
+        :param der_strategy: DERStrategy
+        :param meters: list of Meters without stored simulations
+        :param start: datetime
+        :param end_limit: datetime
+        :param multiprocess: True or False
+        :param batch_size: number of meters to load and simulate at once
+        :param fingerprints: dict with {Meter: fingerprint} pairs
+        """
+        if fingerprints is None:
+            fingerprints = {}
+
+        builder = cls.get_simulation_builder(
+            der=der_configuration.der, der_strategy=der_strategy.der_strategy
+        )
+        director = DERSimulationDirector(builder=builder)
+
+        for (meter, der_simulation) in cls.iter_der_products(
+            director=director,
+            meters=meters,
+            start=start,
+            end_limit=end_limit,
+            multiprocess=multiprocess,
+            batch_size=batch_size,
+        ):
+            cls.get_or_create_from_objects(
+                meter=meter,
+                der_configuration=der_configuration,
+                der_product=der_simulation,
+                der_strategy=der_strategy,
+                start=start,
+                end_limit=end_limit,
+                fingerprint=fingerprints.get(meter),
+            )
+
     @classmethod
     def generate(
         cls,
@@ -754,10 +1193,17 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
         end_limit,
         meter_set,
         multiprocess=False,
+        batch_size=32,
     ):
         """
         Get or create many DERSimulations at once. Pre-existing simulations are
-        retrieved and non-existing simulations are created.
+        retrieved and non-existing simulations are created, see
+        create_simulations(). Meters are fingerprinted and simulated
+        batch_size meters at a time and their readings are released after
+        each batch. Only one meter is simulated per fingerprint, see
+        get_fingerprint(), and the remaining meters are linked to the stored
+        simulation with the same fingerprint. Meters whose fingerprint has no
+        stored simulation to link to are simulated themselves.
 
         :param der_configuration: DERConfiguration
         :param der_strategy: DERStrategy
@@ -765,6 +1211,7 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
         :param end_limit: datetime
         :param meter_set: QuerySet or set of Meters
         :param multiprocess: True or False
+        :param batch_size: number of meters to load and simulate at once
         :return: simulation QuerySet
         """
         with transaction.atomic():
@@ -778,30 +1225,90 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
             )
 
             # generate new simulations for remaining meters
-            new_meters = set(meter_set) - {x.meter for x in stored_simulations}
+            new_meters = sorted(
+                set(meter_set) - {x.meter for x in stored_simulations},
+                key=lambda x: str(x.id),
+            )
             builder = cls.get_simulation_builder(
                 der=der_configuration.der,
                 der_strategy=der_strategy.der_strategy,
             )
-            director = DERSimulationDirector(builder=builder)
-            new_simulation = director.run_many_simulations(
-                intervalframe_dict=cls.get_intervalframes(meters=new_meters),
-                start=start,
-                end_limit=end_limit,
-                multiprocess=multiprocess,
-            )
+            for batch in chunks(new_meters, batch_size):
+                fingerprints = {
+                    meter: cls.get_fingerprint(
+                        builder, meter, start, end_limit
+                    )
+                    for meter in batch
+                }
 
-            # store new simulations
-            for (meter, der_simulation) in new_simulation.der_products.items():
-                cls.get_or_create_from_objects(
-                    meter=meter,
+                # simulate one meter per fingerprint without a stored
+                # simulation
+                stored_fingerprints = set(
+                    cls.objects.filter(
+                        fingerprint__in=set(fingerprints.values())
+                    ).values_list("fingerprint", flat=True)
+                )
+                simulated_meters = {}
+                for meter in batch:
+                    fingerprint = fingerprints[meter]
+                    if fingerprint not in stored_fingerprints:
+                        simulated_meters.setdefault(fingerprint, meter)
+                cls.create_simulations(
                     der_configuration=der_configuration,
-                    der_product=der_simulation,
                     der_strategy=der_strategy,
+                    meters=list(simulated_meters.values()),
                     start=start,
                     end_limit=end_limit,
+                    multiprocess=multiprocess,
+                    batch_size=batch_size,
+                    fingerprints=fingerprints,
                 )
 
+                # link remaining meters to simulations with the same
+                # fingerprint
+                source_simulations = {
+                    x.fingerprint: x
+                    for x in cls.objects.filter(
+                        fingerprint__in=set(fingerprints.values())
+                    )
+                }
+                unlinked_meters = []
+                for meter in batch:
+                    if meter in simulated_meters.values():
+                        continue
+                    source_simulation = source_simulations.get(
+                        fingerprints[meter]
+                    )
+                    if source_simulation is None:
+                        unlinked_meters.append(meter)
+                        continue
+                    cls.objects.create(
+                        start=start,
+                        end_limit=end_limit,
+                        meter=meter,
+                        der_configuration=der_configuration,
+                        der_strategy=der_strategy,
+                        pre_DER_total=source_simulation.pre_DER_total,
+                        post_DER_total=source_simulation.post_DER_total,
+                        fingerprint=source_simulation.fingerprint,
+                    )
+
+                # no simulation was stored for these fingerprints
+                if unlinked_meters:
+                    cls.create_simulations(
+                        der_configuration=der_configuration,
+                        der_strategy=der_strategy,
+                        meters=unlinked_meters,
+                        start=start,
+                        end_limit=end_limit,
+                        multiprocess=multiprocess,
+                        batch_size=batch_size,
+                        fingerprints=fingerprints,
+                    )
+
+                for meter in batch:
+                    meter.release_meter_frames()
+
             return cls.objects.filter(
                 meter__in=meter_set,
                 der_configuration=der_configuration,
@@ -811,6 +1318,47 @@ class DERSimulation(IntervalFrameFileMixin, Meter):
             )
 
 
+class StackedDERSimulationFrame(PowerIntervalFrameFile):
+    """
+    Model for handling the combined DER PowerIntervalFrameFile of a
+    StackedDERSimulation. Files are named by StackedDERSimulation.frame_key
+    rather than by id.
+    """
+
+    # directory for file storage
+    file_directory = os.path.join(MEDIA_ROOT, "stacked_der_simulations")
+
+    # stacks are read by every cost calculation of a stacked Scenario
+    file_format = "arrow"
+
+    @classmethod
+    def delete_stacks(cls, der_simulation):
+        """
+        Deletes stored files of all stacks including der_simulation.
+
+        :param der_simulation: DERSimulation
+        """
+        prefix = "{}_".format(cls.__name__)
+        extension = ".{}".format(cls.file_format)
+        for file_path in get_file_paths(cls.file_directory, prefix, extension):
+            frame_key = os.path.basename(file_path)[
+                len(prefix) : -len(extension)
+            ]
+            if str(der_simulation.id) in frame_key.split(
+                StackedDERSimulation.frame_key_delimiter
+            ):
+                delete_file(file_path)
+
+
+class StackedDERSimulationNetFrame(StackedDERSimulationFrame):
+    """
+    Model for handling the net (post-DER) PowerIntervalFrameFile of a
+    StackedDERSimulation.
+    """
+
+    pass
+
+
 @attr.s(frozen=True)
 class StackedDERSimulation(object):
     """
@@ -820,6 +1368,9 @@ class StackedDERSimulation(object):
     der_simulations = attr.ib(type=List[DERSimulation])
     is_stacked = True
 
+    # separates DERSimulation ids in frame_key, cannot appear in a UUID
+    frame_key_delimiter = "_"
+
     @der_simulations.validator
     def _validate_der_simulations(self, attribute, value):
         """
@@ -879,25 +1430,101 @@ class StackedDERSimulation(object):
     def net_impact(self) -> float:
         return self.post_DER_total - self.pre_DER_total
 
-    @property
+    @cached_property
     def pre_der_intervalframe(self) -> PowerIntervalFrame:
         return self.first_simulation.pre_der_intervalframe.filter_by_datetime(
             start=self.start, end_limit=self.end_limit
         )
 
     @property
-    def der_intervalframe(self) -> PowerIntervalFrame:
-        return reduce(
-            lambda x, y: x + y,
-            [sim.der_intervalframe for sim in self.der_simulations],
-            PowerIntervalFrame(),
+    def pre_der_source(self) -> Tuple[Meter, datetime, datetime]:
+        meter, start, end_limit = self.first_simulation.pre_der_source
+        return (
+            meter,
+            max(start, self.start),
+            min(end_limit, self.end_limit),
         )
 
     @property
-    def post_der_intervalframe(self) -> PowerIntervalFrame:
-        return self.last_simulation.post_der_intervalframe
+    def frame_key(self) -> str:
+        """
+        Key of the ordered ids of all component DERSimulations, which is used
+        to find stored stacks including a deleted DERSimulation.
+        """
+        return self.frame_key_delimiter.join(
+            str(x.id) for x in self.der_simulations
+        )
+
+    @cached_property
+    def stacked_intervalframes(
+        self,
+    ) -> Tuple[PowerIntervalFrame, PowerIntervalFrame]:
+        """
+        Return (combined DER intervalframe, post-DER intervalframe).
+
+        Stacks of more than one DERSimulation are stored under frame_key once
+        materialized. The longest stored prefix of a stack is used as a
+        starting point, so that a stack of A+B+C only adds C to a stored A+B.
+        """
+        stacks = [
+            StackedDERSimulation(der_simulations=self.der_simulations[:i])
+            for i in range(len(self.der_simulations), 1, -1)
+        ]
+        for stack in stacks:
+            if StackedDERSimulationFrame.exists(
+                stack
+            ) and StackedDERSimulationNetFrame.exists(stack):
+                der_intervalframe = PowerIntervalFrame(
+                    StackedDERSimulationFrame.get_frame_from_file(
+                        reference_object=stack
+                    ).dataframe
+                )
+                post_der_intervalframe = PowerIntervalFrame(
+                    StackedDERSimulationNetFrame.get_frame_from_file(
+                        reference_object=stack
+                    ).dataframe
+                )
+                remaining_simulations = self.der_simulations[
+                    len(stack.der_simulations) :
+                ]
+                break
+        else:
+            der_intervalframe = PowerIntervalFrame()
+            post_der_intervalframe = (
+                self.first_simulation.meter.meter_intervalframe
+            )
+            remaining_simulations = self.der_simulations
+
+        for der_simulation in remaining_simulations:
+            der_intervalframe += der_simulation.der_intervalframe
+            post_der_intervalframe = (
+                post_der_intervalframe.filter_by_datetime(
+                    start=der_simulation.start,
+                    end_limit=der_simulation.end_limit,
+                )
+                + der_simulation.der_intervalframe
+            )
+
+        if remaining_simulations and len(self.der_simulations) > 1:
+            StackedDERSimulationFrame(
+                dataframe=der_intervalframe.dataframe, reference_object=self
+            ).save()
+            StackedDERSimulationNetFrame(
+                dataframe=post_der_intervalframe.dataframe,
+                reference_object=self,
+            ).save()
+
+        return der_intervalframe, post_der_intervalframe
 
     @property
+    def der_intervalframe(self) -> PowerIntervalFrame:
+        return self.stacked_intervalframes[0]
+
+    @property
+    def post_der_intervalframe(self) -> PowerIntervalFrame:
+        return self.stacked_intervalframes[1]
+
+    @cached_property
     def simulation(self):
         """
         Return DERProduct equivalent of a StackedDERSimulation using the
@@ -0,0 +1,70 @@
+import os
+
+from django.utils.module_loading import import_string
+
+from beo_datastore.libs.dataframe import (
+    delete_file,
+    get_file_paths,
+    read_arrow,
+    read_parquet,
+)
+
+FILE_FORMAT_READERS = {"arrow": read_arrow, "parquet": read_parquet}
+
+
+def convert_frame_files(frame_file_class):
+    """
+    Rewrite all files of frame_file_class stored in another format in
+    frame_file_class.file_format.
+
+    :param frame_file_class: DataFrameFile class
+    """
+    for file_format, read_fn in FILE_FORMAT_READERS.items():
+        if file_format == frame_file_class.file_format:
+            continue
+
+        file_paths = get_file_paths(
+            directory=frame_file_class.file_directory,
+            prefix="{}_".format(frame_file_class.__name__),
+            extension=".{}".format(file_format),
+        )
+        print(
+            "Converting {} {} files from {} to {}...".format(
+                len(file_paths),
+                frame_file_class.__name__,
+                file_format,
+                frame_file_class.file_format,
+            )
+        )
+        for file_path in file_paths:
+            frame_file_class.write_frame_file(
+                dataframe=read_fn(file_path),
+                file_path="{}.{}".format(
+                    os.path.splitext(file_path)[0],
+                    frame_file_class.file_format,
+                ),
+            )
+            delete_file(file_path)
+
+
+def run(*args):
+    """
+    Converts stored files of DataFrameFile classes to each class's
+    file_format, e.g. after setting file_format = "arrow" on a class.
+
+    Usage:
+        - python manage.py runscript scripts.convert_frame_files --script-args DATAFRAMEFILE_CLASS [DATAFRAMEFILE_CLASS ...]
+
+    Example:
+        - python manage.py runscript scripts.convert_frame_files --script-args reference.reference_model.models.StackedDERSimulationFrame
+    """
+    if not args:
+        print(
+            "USAGE `python manage.py runscript "
+            "scripts.convert_frame_files "
+            "--script-args DATAFRAMEFILE_CLASS [DATAFRAMEFILE_CLASS ...]`"
+        )
+        return
+
+    for class_path in args:
+        convert_frame_files(import_string(class_path))